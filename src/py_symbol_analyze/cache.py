@@ -6,14 +6,54 @@ SQLite3 缓存管理模块
 
 import hashlib
 import json
+import logging
 import os
 import sqlite3
+import threading
 from contextlib import contextmanager
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from typing import Any, Dict, Generator, List, Optional, Tuple
+from typing import (
+    Any,
+    Dict,
+    Generator,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 from .logger import get_logger
 
+try:
+    # 可选依赖：blake3 使用 SIMD 实现，速度远高于 md5
+    from blake3 import blake3 as _blake3
+except ImportError:  # pragma: no cover
+    _blake3 = None
+
+try:
+    # 可选依赖：msgpack 用于序列化 callees/imports/base_classes 字段
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+try:
+    # 可选依赖：没有 msgpack 时使用 orjson，仍比标准库 json 快
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+# 当前使用的字段编码方式，记录在 metadata 表中
+if msgpack is not None:
+    _VALUE_CODEC = "msgpack"
+elif orjson is not None:
+    _VALUE_CODEC = "orjson"
+else:
+    _VALUE_CODEC = "json"
+
 
 def _normalize_path(path: str) -> str:
     """
@@ -35,6 +75,103 @@ def _get_logger():
     return get_logger("py_symbol_analyze.cache")
 
 
+def _pack_value(value: Any) -> bytes:
+    """将 callees/imports/base_classes 字段编码为 BLOB"""
+    if _VALUE_CODEC == "msgpack":
+        return msgpack.packb(value, use_bin_type=True)
+    if _VALUE_CODEC == "orjson":
+        return orjson.dumps(value)
+    return json.dumps(value).encode("utf-8")
+
+
+def _unpack_value(raw: Union[str, bytes, None], default: Any) -> Any:
+    """
+    解码 callees/imports/base_classes 字段
+
+    旧版数据库中以 JSON 文本存储（str），新版本以 BLOB 存储（bytes）。
+    """
+    if not raw:
+        return default
+    if isinstance(raw, str):
+        return json.loads(raw)
+    if _VALUE_CODEC == "msgpack":
+        return msgpack.unpackb(raw, raw=False)
+    if _VALUE_CODEC == "orjson":
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+# 位置信息按 (行号 << 20) | 列号 打包为一个整数存储，列号最多占 20 位
+_POS_SHIFT = 20
+_POS_MASK = (1 << _POS_SHIFT) - 1
+
+
+def _pack_position(line: int, col: int) -> int:
+    """将行号和列号打包为一个整数"""
+    return (line << _POS_SHIFT) | col
+
+
+def _symbol_row_factory(cursor: sqlite3.Cursor, row: Tuple[Any, ...]) -> Dict[str, Any]:
+    """
+    将 symbol_index 查询结果直接转换为符号字典的 row_factory
+
+    由 sqlite3 在取行时调用，跳过中间的 sqlite3.Row 对象。
+    列顺序与 SymbolCache._SYMBOL_COLUMNS 一致。content 为 None 时表示
+    未单独存储，由 SymbolCache 按字节范围从文件缓存中切出；imports 按文件
+    存储在 file_imports 表中，同样由 SymbolCache 补全。
+    """
+    (
+        name,
+        node_type,
+        pos_start,
+        pos_end,
+        content,
+        file_path,
+        host_class,
+        callees,
+        base_classes,
+        calls_super,
+        byte_start,
+        byte_end,
+    ) = row
+    return {
+        "name": name,
+        "node_type": node_type,
+        "start_line": pos_start >> _POS_SHIFT,
+        "end_line": pos_end >> _POS_SHIFT,
+        "start_col": pos_start & _POS_MASK,
+        "end_col": pos_end & _POS_MASK,
+        "content": content,
+        "file_path": file_path,
+        "host_class": host_class,
+        "callees": _unpack_value(callees, []),
+        "imports": None,
+        "base_classes": _unpack_value(base_classes, []),
+        "calls_super": bool(calls_super),
+        "start_byte": byte_start or 0,
+        "end_byte": byte_end or 0,
+    }
+
+
+def _content_hash(content: Union[str, bytes]) -> str:
+    """
+    计算源代码内容的哈希值
+
+    优先使用 blake3，未安装时回退到 md5。已有字节串时直接传入可避免重复编码。
+
+    Args:
+        content: 源代码字符串或 UTF-8 字节串
+
+    Returns:
+        32 位十六进制哈希字符串
+    """
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    if _blake3 is not None:
+        return _blake3(content).hexdigest(16)
+    return hashlib.md5(content).hexdigest()
+
+
 # 全局缓存目录配置
 _cache_dir: Optional[str] = None
 
@@ -75,19 +212,19 @@ def get_cache_dir() -> str:
     return _cache_dir
 
 
-def generate_cache_filename(project_root: str) -> str:
+@lru_cache(maxsize=None)
+def generate_cache_filename(project_path: Path) -> str:
     """
     根据项目路径生成缓存文件名
 
     格式: {项目名}_{项目绝对路径的md5值}.db
 
     Args:
-        project_root: 项目根目录
+        project_path: 已解析（resolve）的项目根目录绝对路径
 
     Returns:
         缓存文件名
     """
-    project_path = Path(project_root).resolve()
     project_name = project_path.name
     path_hash = hashlib.md5(str(project_path).encode("utf-8")).hexdigest()[:12]
     return f"{project_name}_{path_hash}.db"
@@ -96,6 +233,139 @@ def generate_cache_filename(project_root: str) -> str:
 class SymbolCache:
     """符号缓存管理器 - 使用 SQLite3 进行持久化存储"""
 
+    # 流式读取时每批获取的行数
+    _FETCH_SIZE = 1000
+    # 按多个文件查询/删除时，超过该数量改用临时表
+    _MAX_INLINE_PATHS = 500
+
+    # symbol_index 表的二级索引：(索引名, 列)
+    _SYMBOL_INDEXES = (
+        ("idx_symbol_name_type", "name, node_type"),
+        ("idx_symbol_file", "file_path"),
+        ("idx_symbol_type", "node_type"),
+    )
+
+    # 预定义的 SQL 语句：保持语句文本固定，使 sqlite3 的语句缓存能够复用
+    # 已编译的语句，避免每次调用都重新解析
+    _SQL_CREATE_SYMBOL_INDEX = """
+        CREATE TABLE IF NOT EXISTS symbol_index (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            node_type TEXT NOT NULL,
+            pos_start INTEGER NOT NULL,
+            pos_end INTEGER NOT NULL,
+            content TEXT,
+            file_path TEXT NOT NULL,
+            host_class TEXT,
+            callees BLOB,
+            base_classes BLOB,
+            calls_super INTEGER DEFAULT 0,
+            byte_start INTEGER,
+            byte_end INTEGER,
+            UNIQUE(name, file_path, pos_start, node_type)
+        )
+    """
+
+    # symbol_index 的数据列（顺序与 _symbol_row_factory 的解包顺序一致）
+    _SYMBOL_COLUMNS = (
+        "name, node_type, pos_start, pos_end, content, file_path, "
+        "host_class, callees, base_classes, calls_super, "
+        "byte_start, byte_end"
+    )
+    _SQL_SELECT_SYMBOLS = "SELECT " + _SYMBOL_COLUMNS + " FROM symbol_index"
+
+    # 使用 UPSERT 原地更新冲突行，避免 INSERT OR REPLACE 的 DELETE + INSERT
+    _SQL_INSERT_SYMBOL = """
+        INSERT INTO symbol_index
+        (name, node_type, pos_start, pos_end, content, file_path,
+         host_class, callees, base_classes, calls_super,
+         byte_start, byte_end)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(name, file_path, pos_start, node_type) DO UPDATE SET
+            pos_end = excluded.pos_end,
+            content = excluded.content,
+            host_class = excluded.host_class,
+            callees = excluded.callees,
+            base_classes = excluded.base_classes,
+            calls_super = excluded.calls_super,
+            byte_start = excluded.byte_start,
+            byte_end = excluded.byte_end
+    """
+    _SQL_SELECT_BY_NAME = _SQL_SELECT_SYMBOLS + " WHERE name = ?"
+    _SQL_SELECT_BY_NAME_TYPE = _SQL_SELECT_SYMBOLS + " WHERE name = ? AND node_type = ?"
+    _SQL_SELECT_BY_NAME_FUNC = (
+        _SQL_SELECT_SYMBOLS + " WHERE name = ? AND node_type IN ('function', 'method')"
+    )
+    # 排序与数量限制；LIMIT -1 表示不限制
+    _SQL_ORDER_DEFAULT = " ORDER BY id LIMIT ?"
+    _SQL_ORDER_BY_HINT = " ORDER BY instr(file_path, ?) > 0 DESC, id LIMIT ?"
+    # find_symbols_by_name 的语句：键为 (类型过滤, 是否有文件提示)
+    _SQL_FIND_BY_NAME = {
+        (None, False): _SQL_SELECT_BY_NAME + _SQL_ORDER_DEFAULT,
+        (None, True): _SQL_SELECT_BY_NAME + _SQL_ORDER_BY_HINT,
+        ("function", False): _SQL_SELECT_BY_NAME_FUNC + _SQL_ORDER_DEFAULT,
+        ("function", True): _SQL_SELECT_BY_NAME_FUNC + _SQL_ORDER_BY_HINT,
+        ("type", False): _SQL_SELECT_BY_NAME_TYPE + _SQL_ORDER_DEFAULT,
+        ("type", True): _SQL_SELECT_BY_NAME_TYPE + _SQL_ORDER_BY_HINT,
+    }
+    _SQL_SELECT_ALL = _SQL_SELECT_SYMBOLS
+    _SQL_SELECT_ALL_TYPE = _SQL_SELECT_SYMBOLS + " WHERE node_type = ?"
+    _SQL_SELECT_ALL_FUNC = (
+        _SQL_SELECT_SYMBOLS + " WHERE node_type IN ('function', 'method')"
+    )
+    _SQL_SELECT_BY_FILE = _SQL_SELECT_SYMBOLS + " WHERE file_path = ?"
+    # 列出符号时只需要的列，行号在 SQL 中从打包的位置直接取出
+    _SQL_SELECT_OUTLINE = (
+        f"SELECT name, file_path, pos_start >> {_POS_SHIFT}, host_class "
+        "FROM symbol_index"
+    )
+    # 文件内同名符号类优先，其次按文件中的顺序
+    _SQL_SELECT_IN_FILE = (
+        _SQL_SELECT_SYMBOLS
+        + " WHERE name = ? AND file_path = ? ORDER BY node_type != 'class', id LIMIT 1"
+    )
+    _SQL_HAS_FILE_SYMBOLS = "SELECT 1 FROM symbol_index WHERE file_path = ? LIMIT 1"
+    _SQL_SELECT_FILE_CACHE = (
+        "SELECT mtime, content_hash, source_code FROM file_cache WHERE file_path = ?"
+    )
+    _SQL_SELECT_FILE_MTIME = "SELECT mtime FROM file_cache WHERE file_path = ?"
+    _SQL_SELECT_FILE_SOURCE = (
+        "SELECT mtime, source_code FROM file_cache WHERE file_path = ?"
+    )
+    _SQL_SELECT_FILE_STAMP = (
+        "SELECT mtime, content_hash FROM file_cache WHERE file_path = ?"
+    )
+    # 导入信息按文件存储一份，同一文件的所有符号共享
+    _SQL_CREATE_FILE_IMPORTS = """
+        CREATE TABLE IF NOT EXISTS file_imports (
+            file_path TEXT PRIMARY KEY,
+            imports BLOB
+        )
+    """
+    _SQL_UPSERT_FILE_IMPORTS = """
+        INSERT INTO file_imports (file_path, imports) VALUES (?, ?)
+        ON CONFLICT(file_path) DO UPDATE SET imports = excluded.imports
+    """
+    _SQL_SELECT_FILE_IMPORTS = (
+        "SELECT file_path, imports FROM file_imports WHERE file_path IN ({})"
+    )
+    _SQL_SELECT_SOURCES = (
+        "SELECT file_path, source_code FROM file_cache WHERE file_path IN ({})"
+    )
+    _SQL_SET_INDEXED = (
+        "INSERT OR REPLACE INTO metadata (key, value) VALUES ('indexed', ?)"
+    )
+    _SQL_UPDATE_FILE_MTIME = "UPDATE file_cache SET mtime = ? WHERE file_path = ?"
+    _SQL_UPSERT_FILE_CACHE = """
+        INSERT INTO file_cache
+        (file_path, mtime, content_hash, source_code)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT(file_path) DO UPDATE SET
+            mtime = excluded.mtime,
+            content_hash = excluded.content_hash,
+            source_code = excluded.source_code
+    """
+
     def __init__(
         self,
         project_root: str,
@@ -126,11 +396,21 @@ class SymbolCache:
             cache_directory.mkdir(parents=True, exist_ok=True)
 
             # 生成缓存文件名
-            cache_filename = generate_cache_filename(project_root)
+            cache_filename = generate_cache_filename(self.project_root)
             self.db_path = cache_directory / cache_filename
 
+        # 持久化连接（延迟创建），所有方法共享，避免每次调用都重新打开数据库
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+        # 是否处于 bulk_write 显式事务中（此时各方法不单独提交）
+        self._in_bulk = False
+
+        # 缓存 logger 引用，避免每次记录日志都查找
+        self._log = _get_logger()
+
         self._init_db()
-        _get_logger().debug(f"初始化 SQLite 缓存: {self.db_path}")
+        if self._log.isEnabledFor(logging.DEBUG):
+            self._log.debug(f"初始化 SQLite 缓存: {self.db_path}")
 
     def _init_db(self):
         """初始化数据库表结构"""
@@ -147,53 +427,15 @@ class SymbolCache:
                 )
             """)
 
-            # 创建符号索引表
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS symbol_index (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT NOT NULL,
-                    node_type TEXT NOT NULL,
-                    start_line INTEGER NOT NULL,
-                    end_line INTEGER NOT NULL,
-                    start_col INTEGER NOT NULL,
-                    end_col INTEGER NOT NULL,
-                    content TEXT NOT NULL,
-                    file_path TEXT NOT NULL,
-                    host_class TEXT,
-                    callees TEXT,
-                    imports TEXT,
-                    base_classes TEXT,
-                    calls_super INTEGER DEFAULT 0,
-                    UNIQUE(name, file_path, start_line, node_type)
-                )
-            """)
-
-            # 尝试添加新列（用于升级旧数据库）
-            try:
-                cursor.execute("ALTER TABLE symbol_index ADD COLUMN base_classes TEXT")
-            except sqlite3.OperationalError:
-                pass  # 列已存在
-
-            try:
-                cursor.execute(
-                    "ALTER TABLE symbol_index ADD COLUMN calls_super INTEGER DEFAULT 0"
-                )
-            except sqlite3.OperationalError:
-                pass  # 列已存在
+            # 创建符号索引表及按文件存储的导入信息表
+            cursor.execute(self._SQL_CREATE_FILE_IMPORTS)
+            cursor.execute(self._SQL_CREATE_SYMBOL_INDEX)
+            self._migrate_symbol_table(cursor)
 
             # 创建索引以加速查询
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_symbol_name 
-                ON symbol_index(name)
-            """)
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_symbol_file 
-                ON symbol_index(file_path)
-            """)
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_symbol_type 
-                ON symbol_index(node_type)
-            """)
+            # idx_symbol_name 已被 (name, node_type) 复合索引覆盖
+            cursor.execute("DROP INDEX IF EXISTS idx_symbol_name")
+            self._create_indexes(cursor)
 
             # 创建元数据表，记录索引状态
             cursor.execute("""
@@ -203,21 +445,220 @@ class SymbolCache:
                 )
             """)
 
+            self._migrate_value_codec(cursor)
+
             conn.commit()
 
+    def _migrate_symbol_table(self, cursor: sqlite3.Cursor):
+        """
+        升级旧版 symbol_index 表
+
+        旧版表结构的差异：
+        - 使用 start_line/end_line/start_col/end_col 四列存储位置，
+          新表打包为 pos_start/pos_end 两列
+        - content 不允许为空，且没有 byte_start/byte_end 列
+        - 每个符号单独存储 imports，新表移到按文件存储的 file_imports 表
+
+        旧表都带有 imports 列，需要重建表并复制数据。
+        """
+        cursor.execute("PRAGMA table_info(symbol_index)")
+        columns = {row["name"] for row in cursor.fetchall()}
+        if "imports" not in columns:
+            return
+
+        def column_or(name: str, default: str) -> str:
+            return name if name in columns else default
+
+        if "start_line" in columns:
+            pos_start = f"(start_line << {_POS_SHIFT}) | start_col"
+            pos_end = f"(end_line << {_POS_SHIFT}) | end_col"
+        else:
+            pos_start, pos_end = "pos_start", "pos_end"
+
+        cursor.execute("ALTER TABLE symbol_index RENAME TO symbol_index_old")
+        cursor.execute(self._SQL_CREATE_SYMBOL_INDEX)
+        cursor.execute(
+            f"""
+            INSERT OR IGNORE INTO symbol_index ({self._SYMBOL_COLUMNS})
+            SELECT name, node_type, {pos_start}, {pos_end}, content, file_path,
+                   host_class, callees, {column_or("base_classes", "NULL")},
+                   {column_or("calls_super", "0")},
+                   {column_or("byte_start", "NULL")}, {column_or("byte_end", "NULL")}
+            FROM symbol_index_old
+            """
+        )
+        # 同一文件的符号导入信息相同，每个文件保留一份
+        cursor.execute(
+            """
+            INSERT OR IGNORE INTO file_imports (file_path, imports)
+            SELECT file_path, imports FROM symbol_index_old
+            WHERE imports IS NOT NULL
+            ORDER BY id
+            """
+        )
+        cursor.execute("DROP TABLE symbol_index_old")
+        self._log.info("已升级符号索引表结构")
+
+    def _create_indexes(self, cursor: Union[sqlite3.Connection, sqlite3.Cursor]):
+        """创建 symbol_index 表的二级索引"""
+        for index_name, columns in self._SYMBOL_INDEXES:
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS {index_name} ON symbol_index({columns})"
+            )
+
+    def _migrate_value_codec(self, cursor: sqlite3.Cursor):
+        """
+        迁移 callees/imports/base_classes 字段的编码
+
+        - 旧版数据库（未记录编码）：将 JSON 文本重新编码为当前格式
+        - 编码方式发生变化（如卸载了 msgpack）：清空符号索引，下次查询时重建
+        """
+        cursor.execute("SELECT value FROM metadata WHERE key = 'value_codec'")
+        row = cursor.fetchone()
+        stored_codec = row["value"] if row else None
+
+        if stored_codec == _VALUE_CODEC:
+            return
+
+        if stored_codec is None:
+            cursor.execute(
+                """
+                SELECT id, callees, base_classes FROM symbol_index
+                WHERE typeof(callees) = 'text' OR typeof(base_classes) = 'text'
+                """
+            )
+            legacy_rows = cursor.fetchall()
+            if legacy_rows:
+                cursor.executemany(
+                    "UPDATE symbol_index SET callees = ?, base_classes = ? WHERE id = ?",
+                    [
+                        (
+                            _pack_value(_unpack_value(r["callees"], [])),
+                            _pack_value(_unpack_value(r["base_classes"], [])),
+                            r["id"],
+                        )
+                        for r in legacy_rows
+                    ],
+                )
+                self._log.info(f"已迁移 {len(legacy_rows)} 条旧格式符号记录")
+            cursor.execute(
+                "SELECT file_path, imports FROM file_imports "
+                "WHERE typeof(imports) = 'text'"
+            )
+            cursor.executemany(
+                "UPDATE file_imports SET imports = ? WHERE file_path = ?",
+                [
+                    (_pack_value(_unpack_value(r["imports"], {})), r["file_path"])
+                    for r in cursor.fetchall()
+                ],
+            )
+        else:
+            cursor.execute("DELETE FROM symbol_index")
+            cursor.execute("DELETE FROM file_imports")
+            cursor.execute("DELETE FROM metadata WHERE key = 'indexed'")
+            self._log.info(
+                f"符号字段编码由 {stored_codec} 变为 {_VALUE_CODEC}，已清空符号索引"
+            )
+
+        cursor.execute(
+            "INSERT OR REPLACE INTO metadata (key, value) VALUES ('value_codec', ?)",
+            (_VALUE_CODEC,),
+        )
+
+    def _configure_connection(self, conn: sqlite3.Connection):
+        """
+        为新连接设置 PRAGMA
+
+        使用 WAL 日志模式，使读操作不会被写操作阻塞，并配合
+        synchronous=NORMAL 减少每次提交的 fsync 次数；
+        通过 mmap 读取数据库文件，减少查询时的页拷贝。
+        """
+        # 页大小只对尚未建表的新数据库生效，必须在切换到 WAL 之前设置
+        conn.execute("PRAGMA page_size=8192")
+        if str(self.db_path) != ":memory:":
+            conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-64000")  # 约 64MB 页缓存
+        row = conn.execute("PRAGMA mmap_size=1073741824").fetchone()  # 1GB
+        if not row or not row[0]:
+            # SQLite 编译时未启用 mmap，该设置不生效
+            self._log.debug("SQLite 不支持 mmap，使用常规读取")
+
     @contextmanager
     def _get_connection(self) -> Generator[sqlite3.Connection, None, None]:
-        """获取数据库连接的上下文管理器"""
-        conn = sqlite3.connect(str(self.db_path), timeout=10.0)
-        conn.row_factory = sqlite3.Row
+        """
+        获取数据库连接的上下文管理器
+
+        返回共享的持久化连接，退出时不关闭连接。连接允许跨线程使用，
+        由内部锁保证同一时刻只有一个线程访问。
+        """
+        with self._lock:
+            if self._conn is None:
+                conn = sqlite3.connect(
+                    str(self.db_path),
+                    timeout=10.0,
+                    check_same_thread=False,
+                    cached_statements=256,
+                )
+                conn.row_factory = sqlite3.Row
+                self._configure_connection(conn)
+                self._conn = conn
+            yield self._conn
+
+    def _commit(self, conn: sqlite3.Connection):
+        """提交事务；处于 bulk_write 中时由外层统一提交"""
+        if not self._in_bulk:
+            conn.commit()
+
+    @contextmanager
+    def bulk_write(self) -> Generator[sqlite3.Connection, None, None]:
+        """
+        批量写入的事务上下文管理器
+
+        在一个 BEGIN IMMEDIATE ... COMMIT 事务中执行所有写操作，
+        出现异常时回滚。可以嵌套使用，只有最外层负责提交。
+
+        示例:
+            with cache.bulk_write():
+                cache.remove_symbols_by_file(path)
+                cache.add_symbols_batch(symbols)
+        """
+        with self._get_connection() as conn:
+            if self._in_bulk:
+                yield conn
+                return
+
+            if conn.in_transaction:
+                conn.commit()
+            conn.execute("BEGIN IMMEDIATE")
+            self._in_bulk = True
+            try:
+                yield conn
+            except BaseException:
+                conn.rollback()
+                raise
+            else:
+                conn.commit()
+            finally:
+                self._in_bulk = False
+
+    def close(self):
+        """关闭数据库连接"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def __del__(self):
         try:
-            yield conn
-        finally:
-            conn.close()
+            self.close()
+        except Exception:
+            pass
 
-    def _compute_hash(self, content: str) -> str:
+    def _compute_hash(self, content: Union[str, bytes]) -> str:
         """计算内容的哈希值"""
-        return hashlib.md5(content.encode("utf-8")).hexdigest()
+        return _content_hash(content)
 
     # ==================== 文件缓存操作 ====================
 
@@ -231,41 +672,109 @@ class SymbolCache:
         normalized_path = _normalize_path(file_path)
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute(
-                """
-                SELECT mtime, content_hash, source_code 
-                FROM file_cache 
-                WHERE file_path = ?
-                """,
-                (normalized_path,),
-            )
+            cursor.execute(self._SQL_SELECT_FILE_CACHE, (normalized_path,))
             row = cursor.fetchone()
             if row:
                 return (row["mtime"], row["content_hash"], row["source_code"])
             return None
 
-    def set_file_cache(self, file_path: str, mtime: float, source_code: str):
-        """设置文件缓存"""
+    def get_source_bytes(
+        self, file_path: str, mtime: Optional[float] = None
+    ) -> Optional[bytes]:
+        """
+        获取缓存的源代码（UTF-8 字节串）
+
+        Args:
+            file_path: 文件路径
+            mtime: 可选，给出时仅在缓存的 mtime 与之相同时返回
+
+        Returns:
+            源代码字节串，未缓存或 mtime 不一致时返回 None
+        """
         normalized_path = _normalize_path(file_path)
-        content_hash = self._compute_hash(source_code)
         with self._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                INSERT OR REPLACE INTO file_cache 
-                (file_path, mtime, content_hash, source_code)
-                VALUES (?, ?, ?, ?)
-                """,
-                (normalized_path, mtime, content_hash, source_code),
-            )
-            conn.commit()
+            row = conn.execute(
+                self._SQL_SELECT_FILE_SOURCE, (normalized_path,)
+            ).fetchone()
+        if row is None or (mtime is not None and row["mtime"] != mtime):
+            return None
+        return row["source_code"].encode("utf-8")
+
+    def get_file_mtime(self, file_path: str) -> Optional[float]:
+        """
+        获取文件缓存记录的 mtime（不读取源代码）
+
+        Returns:
+            缓存的 mtime，未缓存时返回 None
+        """
+        normalized_path = _normalize_path(file_path)
+        with self._get_connection() as conn:
+            row = conn.execute(
+                self._SQL_SELECT_FILE_MTIME, (normalized_path,)
+            ).fetchone()
+            return row["mtime"] if row else None
+
+    def find_stale_files(
+        self, file_mtimes: Dict[str, float]
+    ) -> Tuple[List[str], List[str]]:
+        """
+        对比文件当前的 mtime 与文件缓存记录，找出需要重新索引的文件
+
+        一次查询读出全部缓存的 mtime，不读取源代码。
+
+        Args:
+            file_mtimes: {文件路径: 当前 mtime}
+
+        Returns:
+            (mtime 变化或尚未缓存的文件, 已缓存但不在 file_mtimes 中的文件)
+        """
+        with self._get_connection() as conn:
+            cached = {
+                row["file_path"]: row["mtime"]
+                for row in conn.execute("SELECT file_path, mtime FROM file_cache")
+            }
+
+        changed = [
+            path
+            for path, mtime in file_mtimes.items()
+            if cached.pop(_normalize_path(path), None) != mtime
+        ]
+        return changed, list(cached)
+
+    def set_file_cache(
+        self, file_path: str, mtime: float, source_code: Union[str, bytes]
+    ):
+        """
+        设置文件缓存
+
+        如果缓存的内容哈希与新内容一致（文件仅被 touch），只更新 mtime，
+        不重写源代码。传入 UTF-8 字节串时仅在需要写入源代码时才解码。
+        """
+        normalized_path = _normalize_path(file_path)
+        with self._get_connection() as conn:
+            row = conn.execute(
+                self._SQL_SELECT_FILE_STAMP, (normalized_path,)
+            ).fetchone()
+            if row is not None and row["mtime"] == mtime:
+                return
+
+            content_hash = self._compute_hash(source_code)
+            if row is not None and row["content_hash"] == content_hash:
+                conn.execute(self._SQL_UPDATE_FILE_MTIME, (mtime, normalized_path))
+            else:
+                if isinstance(source_code, bytes):
+                    source_code = source_code.decode("utf-8")
+                conn.execute(
+                    self._SQL_UPSERT_FILE_CACHE,
+                    (normalized_path, mtime, content_hash, source_code),
+                )
+            self._commit(conn)
 
     def is_file_cache_valid(self, file_path: str, current_mtime: float) -> bool:
         """检查文件缓存是否有效"""
-        cache = self.get_file_cache(file_path)
-        if cache is None:
+        cached_mtime = self.get_file_mtime(file_path)
+        if cached_mtime is None:
             return False
-        cached_mtime, _, _ = cache
         return cached_mtime == current_mtime
 
     def remove_file_cache(self, file_path: str):
@@ -277,89 +786,166 @@ class SymbolCache:
                 "DELETE FROM file_cache WHERE file_path = ?",
                 (normalized_path,),
             )
-            conn.commit()
+            self._commit(conn)
 
     # ==================== 符号索引操作 ====================
 
+    @staticmethod
+    def _symbol_to_row(symbol_data: Dict[str, Any]) -> Tuple[Any, ...]:
+        """
+        将符号字典转换为 symbol_index 表的一行
+
+        content 为 None 时不存储源代码，读取时根据 start_byte/end_byte
+        从同一文件的文件缓存中切出，避免与 file_cache 重复存储。
+        """
+        return (
+            symbol_data["name"],
+            symbol_data["node_type"],
+            _pack_position(symbol_data["start_line"], symbol_data["start_col"]),
+            _pack_position(symbol_data["end_line"], symbol_data["end_col"]),
+            symbol_data.get("content"),
+            _normalize_path(symbol_data["file_path"]),
+            symbol_data.get("host_class"),
+            _pack_value(symbol_data.get("callees", [])),
+            _pack_value(symbol_data.get("base_classes", [])),
+            1 if symbol_data.get("calls_super", False) else 0,
+            symbol_data.get("start_byte"),
+            symbol_data.get("end_byte"),
+        )
+
     def add_symbol(self, symbol_data: Dict[str, Any]):
         """
         添加符号到索引
 
+        逐条添加会为每个符号单独提交一次事务，批量添加时请使用
+        add_symbols_batch 或在 bulk_write 中调用。
+
         Args:
             symbol_data: 符号数据字典，包含以下字段：
                 - name, node_type, start_line, end_line, start_col, end_col
                 - content, file_path, host_class, callees, imports
-                - base_classes, calls_super
+                - base_classes, calls_super, start_byte, end_byte
+                content 为 None 时需要先通过 set_file_cache 缓存该文件；
+                imports 按文件存储，同一文件以最后写入的符号为准
         """
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                INSERT OR REPLACE INTO symbol_index 
-                (name, node_type, start_line, end_line, start_col, end_col, 
-                 content, file_path, host_class, callees, imports,
-                 base_classes, calls_super)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    symbol_data["name"],
-                    symbol_data["node_type"],
-                    symbol_data["start_line"],
-                    symbol_data["end_line"],
-                    symbol_data["start_col"],
-                    symbol_data["end_col"],
-                    symbol_data["content"],
-                    _normalize_path(symbol_data["file_path"]),
-                    symbol_data.get("host_class"),
-                    json.dumps(symbol_data.get("callees", [])),
-                    json.dumps(symbol_data.get("imports", {})),
-                    json.dumps(symbol_data.get("base_classes", [])),
-                    1 if symbol_data.get("calls_super", False) else 0,
-                ),
-            )
-            conn.commit()
+        self.add_symbols_batch([symbol_data])
 
-    def add_symbols_batch(self, symbols: List[Dict[str, Any]]):
-        """批量添加符号到索引"""
-        if not symbols:
+    def add_symbols_batch(
+        self, symbols: Iterable[Dict[str, Any]], chunk_size: int = 10000
+    ):
+        """
+        批量添加符号到索引（在单个事务中完成）
+
+        Args:
+            symbols: 符号数据字典的可迭代对象，按 chunk_size 分块写入，
+                不会一次性构造全部行
+            chunk_size: 每次 executemany 写入的行数
+        """
+        if isinstance(symbols, (list, tuple)) and not symbols:
             return
 
+        with self.bulk_write() as conn:
+            self._insert_symbols_chunked(conn, symbols, chunk_size)
+
+    def bulk_initial_load(
+        self,
+        symbols: Iterable[Dict[str, Any]],
+        chunk_size: int = 10000,
+        replace: bool = False,
+    ) -> int:
+        """
+        首次建立索引时的批量导入
+
+        导入期间关闭同步（synchronous=OFF），先删除二级索引，全部写入后再重建。
+        仍保留 WAL 日志：数据库中还有文件缓存等数据，导入中途进程退出时
+        未提交的事务会被回滚，保留之前的索引，数据库文件不会损坏。
+
+        Args:
+            symbols: 符号数据字典的可迭代对象（可以是生成器）
+            chunk_size: 每次 executemany 写入的行数
+            replace: 为 True 时导入的是完整索引：在同一事务中先清空旧符号，
+                导入完成后标记为已建立索引。导入失败时保留旧索引，
+                其他连接在提交前也始终读到旧索引
+
+        Returns:
+            写入的符号数量
+        """
         with self._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.executemany(
-                """
-                INSERT OR REPLACE INTO symbol_index 
-                (name, node_type, start_line, end_line, start_col, end_col, 
-                 content, file_path, host_class, callees, imports,
-                 base_classes, calls_super)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
+            if self._in_bulk:
+                # 已处于外层事务中，无法修改同步模式，直接写入
+                return self._load_symbols(conn, symbols, chunk_size, replace)
+
+            if conn.in_transaction:
+                conn.commit()
+            conn.execute("PRAGMA synchronous=OFF")
+            try:
+                with self.bulk_write():
+                    for index_name, _ in self._SYMBOL_INDEXES:
+                        conn.execute(f"DROP INDEX IF EXISTS {index_name}")
+                    count = self._load_symbols(conn, symbols, chunk_size, replace)
+                    self._create_indexes(conn)
+            finally:
+                conn.execute("PRAGMA synchronous=NORMAL")
+            return count
+
+    def _load_symbols(
+        self,
+        conn: sqlite3.Connection,
+        symbols: Iterable[Dict[str, Any]],
+        chunk_size: int,
+        replace: bool,
+    ) -> int:
+        """bulk_initial_load 的写入部分，调用方负责事务"""
+        if replace:
+            conn.execute("DELETE FROM symbol_index")
+            conn.execute("DELETE FROM file_imports")
+        count = self._insert_symbols_chunked(conn, symbols, chunk_size)
+        if replace:
+            conn.execute(self._SQL_SET_INDEXED, ("true",))
+        return count
+
+    def _insert_symbols_chunked(
+        self,
+        conn: sqlite3.Connection,
+        symbols: Iterable[Dict[str, Any]],
+        chunk_size: int,
+    ) -> int:
+        """
+        分块写入符号，返回写入的行数
+
+        每个分块内先按唯一键 (name, file_path, pos_start, node_type) 去重，
+        重复的符号只保留最后一个，与 UPSERT 的覆盖语义一致。
+        导入信息每个文件只写入一行 file_imports。
+        """
+        count = 0
+        iterator = iter(symbols)
+        while True:
+            chunk = list(islice(iterator, chunk_size))
+            if not chunk:
+                break
+            unique_rows: Dict[Tuple[Any, ...], Tuple[Any, ...]] = {}
+            file_imports: Dict[str, Any] = {}
+            for symbol_data in chunk:
+                row = self._symbol_to_row(symbol_data)
+                unique_rows[(row[0], row[5], row[2], row[1])] = row
+                file_imports[row[5]] = symbol_data.get("imports")
+            conn.executemany(self._SQL_INSERT_SYMBOL, unique_rows.values())
+            conn.executemany(
+                self._SQL_UPSERT_FILE_IMPORTS,
                 [
-                    (
-                        s["name"],
-                        s["node_type"],
-                        s["start_line"],
-                        s["end_line"],
-                        s["start_col"],
-                        s["end_col"],
-                        s["content"],
-                        _normalize_path(s["file_path"]),
-                        s.get("host_class"),
-                        json.dumps(s.get("callees", [])),
-                        json.dumps(s.get("imports", {})),
-                        json.dumps(s.get("base_classes", [])),
-                        1 if s.get("calls_super", False) else 0,
-                    )
-                    for s in symbols
+                    (file_path, _pack_value(imports or {}))
+                    for file_path, imports in file_imports.items()
                 ],
             )
-            conn.commit()
+            count += len(unique_rows)
+        return count
 
     def find_symbols_by_name(
         self,
         name: str,
         symbol_type: Optional[str] = None,
         file_hint: Optional[str] = None,
+        limit: Optional[int] = None,
     ) -> List[Dict[str, Any]]:
         """
         根据名称查找符号
@@ -368,53 +954,198 @@ class SymbolCache:
             name: 符号名称
             symbol_type: 可选，"class"、"function" 或 "method"
             file_hint: 可选，优先返回匹配此文件的符号
+            limit: 可选，最多返回的符号数量
 
         Returns:
             符号数据列表
         """
+        params: List[Any] = [name]
+        if not symbol_type:
+            type_key = None
+        elif symbol_type == "function":
+            type_key = "function"
+        else:
+            type_key = "type"
+            params.append(symbol_type)
+
+        # 如果有文件提示，在 SQL 中优先排序
+        # 标准化路径以确保跨平台兼容性
+        if file_hint:
+            params.append(_normalize_path(file_hint))
+        params.append(limit if limit is not None else -1)
+
+        query = self._SQL_FIND_BY_NAME[(type_key, bool(file_hint))]
         with self._get_connection() as conn:
-            cursor = conn.cursor()
+            rows = self._execute_symbol_query(conn, query, params).fetchall()
+            return self._fill_symbol_rows(conn, rows)
+
+    @staticmethod
+    def _execute_symbol_query(
+        conn: sqlite3.Connection, query: str, params: Sequence[Any]
+    ) -> sqlite3.Cursor:
+        """执行符号查询，返回直接产出符号字典的游标"""
+        cursor = conn.cursor()
+        cursor.row_factory = _symbol_row_factory
+        return cursor.execute(query, params)
+
+    def _fill_symbol_rows(
+        self, conn: sqlite3.Connection, rows: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        补全符号字典中按文件存储的字段
 
-            query = "SELECT * FROM symbol_index WHERE name = ?"
-            params: List[Any] = [name]
-
-            if symbol_type:
-                if symbol_type == "function":
-                    query += " AND node_type IN ('function', 'method')"
-                else:
-                    query += " AND node_type = ?"
-                    params.append(symbol_type)
-
-            cursor.execute(query, params)
-            rows = cursor.fetchall()
-
-            results = []
-            for row in rows:
-                results.append(self._row_to_symbol_dict(row))
-
-            # 如果有文件提示，优先排序
-            # 标准化路径以确保跨平台兼容性
-            if file_hint and results:
-                normalized_hint = _normalize_path(file_hint)
-                results.sort(
-                    key=lambda x: 0
-                    if normalized_hint in _normalize_path(x["file_path"])
-                    else 1
+        - imports：从 file_imports 读取，同一文件的符号共享同一个字典
+        - content：未单独存储时，按字节范围从文件缓存中切出源代码
+
+        同一批符号涉及的每个文件只查询、解码一次。
+        """
+        if not rows:
+            return rows
+
+        paths = list({row["file_path"] for row in rows})
+        imports: Dict[str, Dict[str, str]] = {}
+        for file_path, raw in self._select_by_paths(
+            conn, self._SQL_SELECT_FILE_IMPORTS, paths
+        ):
+            imports[file_path] = _unpack_value(raw, {})
+
+        source_paths = list(
+            {row["file_path"] for row in rows if row["content"] is None}
+        )
+        sources: Dict[str, bytes] = {}
+        for file_path, source_code in self._select_by_paths(
+            conn, self._SQL_SELECT_SOURCES, source_paths
+        ):
+            sources[file_path] = source_code.encode("utf-8")
+
+        for row in rows:
+            file_imports = imports.get(row["file_path"])
+            if file_imports is None:
+                file_imports = imports[row["file_path"]] = {}
+            row["imports"] = file_imports
+            if row["content"] is None:
+                source = sources.get(row["file_path"], b"")
+                row["content"] = source[row["start_byte"] : row["end_byte"]].decode(
+                    "utf-8", errors="replace"
                 )
+        return rows
+
+    def _select_by_paths(
+        self, conn: sqlite3.Connection, query: str, paths: List[str]
+    ) -> Generator[Tuple[Any, ...], None, None]:
+        """按文件路径分批执行 IN 查询，避免超出参数数量限制"""
+        for i in range(0, len(paths), self._MAX_INLINE_PATHS):
+            chunk = paths[i : i + self._MAX_INLINE_PATHS]
+            yield from conn.execute(
+                query.format(", ".join("?" * len(chunk))), chunk
+            ).fetchall()
+
+    def _iter_symbol_rows(
+        self, query: str, params: Tuple[Any, ...] = ()
+    ) -> Generator[Dict[str, Any], None, None]:
+        """
+        分批读取查询结果并逐行产出符号字典
 
-            return results
+        只在每次 fetchmany 时持有连接锁，迭代过程中不会阻塞其他线程。
+        """
+        with self._get_connection() as conn:
+            cursor = self._execute_symbol_query(conn, query, params)
+        while True:
+            with self._get_connection() as conn:
+                rows = cursor.fetchmany(self._FETCH_SIZE)
+                if not rows:
+                    break
+                self._fill_symbol_rows(conn, rows)
+            yield from rows
+
+    def iter_symbols_by_file(
+        self, file_path: str
+    ) -> Generator[Dict[str, Any], None, None]:
+        """逐个产出文件中的所有符号"""
+        normalized_path = _normalize_path(file_path)
+        return self._iter_symbol_rows(self._SQL_SELECT_BY_FILE, (normalized_path,))
 
     def find_symbols_by_file(self, file_path: str) -> List[Dict[str, Any]]:
         """获取文件中的所有符号"""
-        normalized_path = _normalize_path(file_path)
+        return list(self.iter_symbols_by_file(file_path))
+
+    def find_symbol_in_file(
+        self, name: str, file_path: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        在指定文件中查找符号（类优先于函数），只读取命中的一行
+
+        Returns:
+            符号数据，文件中没有该符号时返回 None
+        """
+        params = (name, _normalize_path(file_path))
+        with self._get_connection() as conn:
+            rows = self._execute_symbol_query(
+                conn, self._SQL_SELECT_IN_FILE, params
+            ).fetchall()
+            rows = self._fill_symbol_rows(conn, rows)
+        return rows[0] if rows else None
+
+    def has_symbols_in_file(self, file_path: str) -> bool:
+        """文件是否已有符号写入索引"""
+        with self._get_connection() as conn:
+            row = conn.execute(
+                self._SQL_HAS_FILE_SYMBOLS, (_normalize_path(file_path),)
+            ).fetchone()
+        return row is not None
+
+    def find_symbols_by_files(self, file_paths: Iterable[str]) -> List[Dict[str, Any]]:
+        """获取多个文件中的所有符号（单次查询）"""
+        with self._get_connection() as conn:
+            condition, params = self._file_path_condition(conn, file_paths)
+            if condition is None:
+                return []
+            query = self._SQL_SELECT_SYMBOLS + " WHERE " + condition
+            rows = self._execute_symbol_query(conn, query, params).fetchall()
+            return self._fill_symbol_rows(conn, rows)
+
+    def iter_all_symbols(
+        self, symbol_type: Optional[str] = None
+    ) -> Generator[Dict[str, Any], None, None]:
+        """
+        逐个产出所有符号
+
+        Args:
+            symbol_type: 可选，"class"、"function" 或 "method"
+        """
+        if not symbol_type:
+            return self._iter_symbol_rows(self._SQL_SELECT_ALL)
+        if symbol_type == "function":
+            return self._iter_symbol_rows(self._SQL_SELECT_ALL_FUNC)
+        return self._iter_symbol_rows(self._SQL_SELECT_ALL_TYPE, (symbol_type,))
+
+    def get_symbol_outline(
+        self, symbol_type: Optional[str] = None
+    ) -> List[Tuple[str, str, int, Optional[str]]]:
+        """
+        获取所有符号的概要，顺序与 iter_all_symbols 一致
+
+        只读取列出符号所需的列，不解码 callees 等字段，也不从文件缓存中切出
+        源代码，行直接以元组返回。
+
+        Args:
+            symbol_type: 可选，"class"、"function" 或 "method"
+
+        Returns:
+            (name, file_path, start_line, host_class) 列表
+        """
+        query = self._SQL_SELECT_OUTLINE
+        params: Tuple[Any, ...] = ()
+        if symbol_type == "function":
+            query += " WHERE node_type IN ('function', 'method')"
+        elif symbol_type:
+            query += " WHERE node_type = ?"
+            params = (symbol_type,)
+
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute(
-                "SELECT * FROM symbol_index WHERE file_path = ?",
-                (normalized_path,),
-            )
-            rows = cursor.fetchall()
-            return [self._row_to_symbol_dict(row) for row in rows]
+            cursor.row_factory = None
+            return cursor.execute(query, params).fetchall()
 
     def get_all_symbols(
         self, symbol_type: Optional[str] = None
@@ -428,24 +1159,7 @@ class SymbolCache:
         Returns:
             符号数据列表
         """
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-
-            if symbol_type:
-                if symbol_type == "function":
-                    cursor.execute(
-                        "SELECT * FROM symbol_index WHERE node_type IN ('function', 'method')"
-                    )
-                else:
-                    cursor.execute(
-                        "SELECT * FROM symbol_index WHERE node_type = ?",
-                        (symbol_type,),
-                    )
-            else:
-                cursor.execute("SELECT * FROM symbol_index")
-
-            rows = cursor.fetchall()
-            return [self._row_to_symbol_dict(row) for row in rows]
+        return list(self.iter_all_symbols(symbol_type))
 
     def remove_symbols_by_file(self, file_path: str):
         """移除文件的所有符号"""
@@ -456,29 +1170,47 @@ class SymbolCache:
                 "DELETE FROM symbol_index WHERE file_path = ?",
                 (normalized_path,),
             )
-            conn.commit()
+            cursor.execute(
+                "DELETE FROM file_imports WHERE file_path = ?",
+                (normalized_path,),
+            )
+            self._commit(conn)
+
+    def remove_symbols_by_files(self, file_paths: Iterable[str]):
+        """移除多个文件的所有符号（单条 DELETE，在一个事务中完成）"""
+        with self.bulk_write() as conn:
+            condition, params = self._file_path_condition(conn, file_paths)
+            if condition is not None:
+                conn.execute("DELETE FROM symbol_index WHERE " + condition, params)
+                conn.execute("DELETE FROM file_imports WHERE " + condition, params)
+
+    def _file_path_condition(
+        self, conn: sqlite3.Connection, file_paths: Iterable[str]
+    ) -> Tuple[Optional[str], List[str]]:
+        """
+        构造按多个文件路径过滤的 WHERE 条件
+
+        路径较少时使用 IN (?, ?, ...)；路径较多时写入临时表，
+        避免超出 SQLite 的参数数量限制。
 
-    def _row_to_symbol_dict(self, row: sqlite3.Row) -> Dict[str, Any]:
-        """将数据库行转换为符号字典"""
-        # 安全获取可能不存在的列（兼容旧数据库）
-        base_classes_raw = row["base_classes"] if "base_classes" in row.keys() else None
-        calls_super_raw = row["calls_super"] if "calls_super" in row.keys() else 0
-
-        return {
-            "name": row["name"],
-            "node_type": row["node_type"],
-            "start_line": row["start_line"],
-            "end_line": row["end_line"],
-            "start_col": row["start_col"],
-            "end_col": row["end_col"],
-            "content": row["content"],
-            "file_path": row["file_path"],
-            "host_class": row["host_class"],
-            "callees": json.loads(row["callees"]) if row["callees"] else [],
-            "imports": json.loads(row["imports"]) if row["imports"] else {},
-            "base_classes": json.loads(base_classes_raw) if base_classes_raw else [],
-            "calls_super": bool(calls_super_raw),
-        }
+        Returns:
+            (条件语句, 参数列表)，没有路径时条件为 None
+        """
+        normalized = list(dict.fromkeys(_normalize_path(p) for p in file_paths))
+        if not normalized:
+            return None, []
+
+        if len(normalized) <= self._MAX_INLINE_PATHS:
+            placeholders = ", ".join("?" * len(normalized))
+            return f"file_path IN ({placeholders})", normalized
+
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS _file_paths (p TEXT PRIMARY KEY)")
+        conn.execute("DELETE FROM temp._file_paths")
+        conn.executemany(
+            "INSERT INTO temp._file_paths (p) VALUES (?)",
+            ((p,) for p in normalized),
+        )
+        return "file_path IN (SELECT p FROM temp._file_paths)", []
 
     # ==================== 元数据操作 ====================
 
@@ -494,14 +1226,8 @@ class SymbolCache:
         """设置索引状态"""
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute(
-                """
-                INSERT OR REPLACE INTO metadata (key, value) 
-                VALUES ('indexed', ?)
-                """,
-                ("true" if value else "false",),
-            )
-            conn.commit()
+            cursor.execute(self._SQL_SET_INDEXED, ("true" if value else "false",))
+            self._commit(conn)
 
     def get_indexed_file_count(self) -> int:
         """获取已索引的文件数量"""
@@ -521,15 +1247,16 @@ class SymbolCache:
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
-                "SELECT COUNT(*) FROM symbol_index WHERE node_type = 'class'"
-            )
-            class_count = cursor.fetchone()[0]
-
-            cursor.execute(
-                "SELECT COUNT(*) FROM symbol_index WHERE node_type IN ('function', 'method')"
+                """
+                SELECT node_type, COUNT(*) FROM symbol_index
+                WHERE node_type IN ('class', 'function', 'method')
+                GROUP BY node_type
+                """
             )
-            func_count = cursor.fetchone()[0]
+            counts = {row[0]: row[1] for row in cursor.fetchall()}
 
+            class_count = counts.get("class", 0)
+            func_count = counts.get("function", 0) + counts.get("method", 0)
             return class_count, func_count
 
     # ==================== 清理操作 ====================
@@ -540,21 +1267,23 @@ class SymbolCache:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM file_cache")
             cursor.execute("DELETE FROM symbol_index")
-            cursor.execute("DELETE FROM metadata")
-            conn.commit()
-        _get_logger().info("已清空所有缓存数据")
+            cursor.execute("DELETE FROM file_imports")
+            cursor.execute("DELETE FROM metadata WHERE key != 'value_codec'")
+            self._commit(conn)
+        self._log.info("已清空所有缓存数据")
 
     def clear_symbols(self):
         """清空符号索引"""
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM symbol_index")
+            cursor.execute("DELETE FROM file_imports")
             cursor.execute("DELETE FROM metadata WHERE key = 'indexed'")
-            conn.commit()
-        _get_logger().debug("已清空符号索引")
+            self._commit(conn)
+        self._log.debug("已清空符号索引")
 
     def vacuum(self):
         """压缩数据库文件"""
         with self._get_connection() as conn:
             conn.execute("VACUUM")
-        _get_logger().debug("数据库已压缩")
+        self._log.debug("数据库已压缩")
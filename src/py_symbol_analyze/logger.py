@@ -4,15 +4,28 @@
 提供统一的日志记录功能，支持控制台输出和文件保存。
 """
 
+import atexit
+import functools
 import logging
+import queue
 import sys
 from datetime import datetime
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
+
+
+@functools.cache
+def _default_log_dir() -> Path:
+    """默认日志目录（当前工作目录下的 logs 文件夹），首次使用时才确定"""
+    return Path.cwd() / "logs"
+
+
+@functools.cache
+def _log_date() -> str:
+    """日志文件名中的日期，进程内所有日志记录器共用"""
+    return datetime.now().strftime("%Y%m%d")
 
-# 默认日志目录（当前工作目录下的 logs 文件夹）
-DEFAULT_LOG_DIR = Path.cwd() / "logs"
 
 # 全局日志目录配置（可通过 set_log_dir 修改）
 _configured_log_dir: Optional[Path] = None
@@ -24,6 +37,18 @@ FILE_FORMAT = (
 )
 DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
 
+# 后台写日志文件的监听器（进程退出时停止，确保队列中的日志写完）
+_queue_listeners: List[QueueListener] = []
+
+
+def _stop_queue_listeners():
+    """停止所有后台日志监听器"""
+    while _queue_listeners:
+        _queue_listeners.pop().stop()
+
+
+atexit.register(_stop_queue_listeners)
+
 
 def set_log_dir(log_dir: Optional[str | Path]) -> Path:
     """
@@ -38,7 +63,7 @@ def set_log_dir(log_dir: Optional[str | Path]) -> Path:
     global _configured_log_dir
     if log_dir is None:
         _configured_log_dir = None
-        return DEFAULT_LOG_DIR
+        return _default_log_dir()
     _configured_log_dir = Path(log_dir).resolve()
     return _configured_log_dir
 
@@ -50,7 +75,7 @@ def get_log_dir() -> Path:
     Returns:
         当前配置的日志目录路径
     """
-    return _configured_log_dir or DEFAULT_LOG_DIR
+    return _configured_log_dir or _default_log_dir()
 
 
 def setup_logger(
@@ -100,7 +125,7 @@ def setup_logger(
         actual_log_dir.mkdir(parents=True, exist_ok=True)
 
         # 按日期命名日志文件
-        log_file = actual_log_dir / f"{name}_{datetime.now().strftime('%Y%m%d')}.log"
+        log_file = actual_log_dir / f"{name}_{_log_date()}.log"
 
         file_handler = RotatingFileHandler(
             log_file,
@@ -111,7 +136,16 @@ def setup_logger(
         file_handler.setLevel(level)
         file_formatter = logging.Formatter(FILE_FORMAT, datefmt=DATE_FORMAT)
         file_handler.setFormatter(file_formatter)
-        logger.addHandler(file_handler)
+
+        # 文件写入交给后台线程，调用方只需把日志记录放入队列
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+        listener.start()
+        _queue_listeners.append(listener)
+
+        queue_handler = QueueHandler(log_queue)
+        queue_handler.setLevel(level)
+        logger.addHandler(queue_handler)
 
         # 记录日志文件位置
         logger.info(f"日志文件保存位置: {log_file}")
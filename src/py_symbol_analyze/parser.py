@@ -2,10 +2,31 @@
 使用 tree-sitter 解析 Python 代码
 """
 
+import mmap
+import multiprocessing
 import os
-from dataclasses import asdict, dataclass, field
+import sys
+import threading
+from bisect import bisect_left
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from itertools import chain
+from operator import itemgetter
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import (
+    Any,
+    Deque,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
 import tree_sitter_python as tspython
 from tree_sitter import Language, Node, Parser, Tree
@@ -13,15 +34,136 @@ from tree_sitter import Language, Node, Parser, Tree
 from .cache import SymbolCache
 from .logger import get_logger
 
+try:
+    # tree-sitter >= 0.24：查询通过 QueryCursor 执行
+    from tree_sitter import QueryCursor
+except ImportError:  # pragma: no cover
+    QueryCursor = None
+
 
 def _get_logger():
     """获取 logger（延迟初始化）"""
     return get_logger("py_symbol_analyze.parser")
 
 
-@dataclass
+# 不小于该大小的文件通过 mmap 交给 tree-sitter，更小的文件直接读取更快
+_MMAP_THRESHOLD = 4096
+
+
+def _normalize_newlines(data: bytes) -> bytes:
+    """与文本模式读取保持一致，将 \r\n 和 \r 统一转换为 \n"""
+    if b"\r" in data:
+        data = data.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+    return data
+
+
+def _read_source_bytes(file_path) -> bytes:
+    """
+    以二进制方式读取源文件，省去 UTF-8 解码后再编码的两次复制
+
+    整个文件一次读完，不经过缓冲层（buffering=0 直接使用 FileIO.readall）。
+    """
+    with open(file_path, "rb", buffering=0) as f:
+        return _normalize_newlines(f.read())
+
+
+# 以下 tree-sitter 查询在 C 层完成遍历，避免在 Python 中递归访问每个节点
+
+IMPORT_QUERY = "[(import_statement) (import_from_statement)] @import"
+
+CLASS_QUERY = "(class_definition name: (identifier)) @class"
+
+FUNCTION_QUERY = "(function_definition name: (identifier)) @function"
+
+# 一次查询同时捕获类和函数定义，构建索引时只需遍历一次
+SYMBOL_QUERY = CLASS_QUERY + "\n" + FUNCTION_QUERY
+
+# 作为引用计入 callees 的属性访问（如 ddd.xxx 作为参数或赋值值）的父节点类型
+# （dictionary 的直接子节点只能是键值对，不会是 attribute，因此不在列表中）
+_ATTRIBUTE_REF_PARENTS = (
+    "argument_list",
+    "assignment",
+    "expression_statement",
+    "return_statement",
+    "yield",
+    "comparison_operator",
+    "binary_operator",
+    "boolean_operator",
+    "conditional_expression",
+    "tuple",
+    "list",
+    "set",
+    "subscript",
+)
+
+# 作为类引用计入 callees 的标识符的父节点类型
+_IDENTIFIER_REF_PARENTS = ("argument_list", "assignment", "expression_statement")
+
+CALLEE_QUERY = "\n".join(
+    [
+        "(call function: (identifier) @call.identifier)",
+        "(call function: (attribute) @call.attribute)",
+    ]
+    + [f"({parent} (attribute) @attribute)" for parent in _ATTRIBUTE_REF_PARENTS]
+    + [f"({parent} (identifier) @identifier)" for parent in _IDENTIFIER_REF_PARENTS]
+)
+
+
+# collect_callee_captures 的返回类型：
+# (按起始字节排序的起始字节列表, 对应的被调用符号名称列表, super 调用的起始字节列表)
+CalleeCaptures = Tuple[List[int], List[str], List[int]]
+
+
+def _compile_query(language: Language, source: str):
+    """编译 tree-sitter 查询（兼容不同版本的 py-tree-sitter）"""
+    try:
+        from tree_sitter import Query
+
+        return Query(language, source)
+    except ImportError:  # pragma: no cover
+        return language.query(source)
+
+
+def _query_captures(query, node: Node) -> Dict[str, List[Node]]:
+    """
+    在节点子树内执行查询，返回 {捕获名: 节点列表}
+
+    节点按在源代码中出现的顺序排列（与先序遍历的顺序一致）。
+    """
+    if QueryCursor is not None:
+        captures = QueryCursor(query).captures(node)
+    else:  # pragma: no cover
+        captures = query.captures(node)
+
+    if not isinstance(captures, dict):  # pragma: no cover
+        grouped: Dict[str, List[Node]] = {}
+        for captured_node, name in captures:
+            grouped.setdefault(name, []).append(captured_node)
+        captures = grouped
+
+    for nodes in captures.values():
+        nodes.sort(key=lambda n: n.start_byte)
+    return captures
+
+
+# 语言对象与编译后的查询不可变，在进程内所有 PythonParser 之间共享，
+# 只编译一次；Parser 本身有状态，仍由每个实例各自创建
+_LANGUAGE = Language(tspython.language())
+_COMPILED_IMPORT_QUERY = _compile_query(_LANGUAGE, IMPORT_QUERY)
+_COMPILED_CLASS_QUERY = _compile_query(_LANGUAGE, CLASS_QUERY)
+_COMPILED_FUNCTION_QUERY = _compile_query(_LANGUAGE, FUNCTION_QUERY)
+_COMPILED_SYMBOL_QUERY = _compile_query(_LANGUAGE, SYMBOL_QUERY)
+_COMPILED_CALLEE_QUERY = _compile_query(_LANGUAGE, CALLEE_QUERY)
+
+
+@dataclass(slots=True, init=False)
 class ParsedSymbol:
-    """解析后的符号信息"""
+    """
+    解析后的符号信息（使用 __slots__，不为每个实例创建 __dict__）
+
+    解析得到的符号只保存所在文件源代码的引用和字节范围，
+    content 在首次访问时才解码，写入索引或未被查看的符号不产生额外的字符串。
+    """
 
     name: str
     node_type: str  # "class", "function", "method"
@@ -29,10 +171,11 @@ class ParsedSymbol:
     end_line: int
     start_col: int
     end_col: int
-    content: str
-    file_path: str
+    # 已解码的源代码；为 None 时由 _source 按字节范围延迟解码
+    _content: Optional[str] = field(default=None, repr=False, compare=False)
+    file_path: str = ""
     host_class: Optional[str] = None
-    # 符号内调用的其他符号（名称列表）
+    # 符号内调用的其他符号（名称列表，解析时已去重）
     callees: List[str] = field(default_factory=list)
     # 导入信息
     imports: Dict[str, str] = field(default_factory=dict)  # alias -> module.name
@@ -40,22 +183,108 @@ class ParsedSymbol:
     base_classes: List[str] = field(default_factory=list)
     # 是否调用了 super()（仅对 method 类型有效）
     calls_super: bool = False
+    # 符号在源文件中的字节范围，索引中据此从文件缓存切出 content
+    start_byte: int = 0
+    end_byte: int = 0
+    # 所在文件的源代码字节（同一文件的符号共享同一个对象）
+    _source: Optional[bytes] = field(default=None, repr=False, compare=False)
+
+    def __init__(
+        self,
+        name: str,
+        node_type: str,
+        start_line: int,
+        end_line: int,
+        start_col: int,
+        end_col: int,
+        content: Optional[str],
+        file_path: str,
+        host_class: Optional[str] = None,
+        callees: Optional[List[str]] = None,
+        imports: Optional[Dict[str, str]] = None,
+        base_classes: Optional[List[str]] = None,
+        calls_super: bool = False,
+        start_byte: int = 0,
+        end_byte: int = 0,
+        source: Optional[bytes] = None,
+    ):
+        """
+        content 为 None 且给出 source 时，content 在首次访问时
+        按 [start_byte, end_byte) 从 source 中切出并解码
+        """
+        self.name = name
+        self.node_type = node_type
+        self.start_line = start_line
+        self.end_line = end_line
+        self.start_col = start_col
+        self.end_col = end_col
+        self._content = content
+        self.file_path = file_path
+        self.host_class = host_class
+        self.callees = [] if callees is None else callees
+        self.imports = {} if imports is None else imports
+        self.base_classes = [] if base_classes is None else base_classes
+        self.calls_super = calls_super
+        self.start_byte = start_byte
+        self.end_byte = end_byte
+        self._source = source
+
+    @property
+    def content(self) -> Optional[str]:
+        """符号的源代码，首次访问时从文件源代码中切出并解码"""
+        if self._content is None and self._source is not None:
+            self._content = self._source[self.start_byte : self.end_byte].decode()
+        return self._content
+
+    @content.setter
+    def content(self, value: Optional[str]):
+        self._content = value
 
 
 class PythonParser:
     """Python 代码解析器"""
 
     def __init__(self):
-        self.language = Language(tspython.language())
+        self.language = _LANGUAGE
         self.parser = Parser(self.language)
+        # 共享模块级预编译查询
+        self._import_query = _COMPILED_IMPORT_QUERY
+        self._class_query = _COMPILED_CLASS_QUERY
+        self._function_query = _COMPILED_FUNCTION_QUERY
+        self._symbol_query = _COMPILED_SYMBOL_QUERY
+        self._callee_query = _COMPILED_CALLEE_QUERY
+        # 预先取得节点类型的整数 ID，热路径中用 kind_id 整数比较代替字符串比较
+        kind_id = self.language.id_for_node_kind
+        self._K_ALIASED_IMPORT = kind_id("aliased_import", True)
+        self._K_ATTRIBUTE = kind_id("attribute", True)
+        self._K_CALL = kind_id("call", True)
+        self._K_CLASS_DEF = kind_id("class_definition", True)
+        self._K_DOTTED_NAME = kind_id("dotted_name", True)
+        self._K_IDENTIFIER = kind_id("identifier", True)
+        self._K_IMPORT_STMT = kind_id("import_statement", True)
+        # 同理预先取得字段 ID，用 child_by_field_id 代替按字段名查找
+        field_id = self.language.field_id_for_name
+        self._F_ALIAS = field_id("alias")
+        self._F_FUNCTION = field_id("function")
+        self._F_MODULE_NAME = field_id("module_name")
+        self._F_NAME = field_id("name")
+        self._F_OBJECT = field_id("object")
+        self._F_SUPERCLASSES = field_id("superclasses")
 
     def parse_file(self, file_path: str) -> Optional[Tree]:
         """解析单个文件"""
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                source_code = f.read()
+            with open(file_path, "rb", buffering=0) as f:
+                if os.fstat(f.fileno()).st_size < _MMAP_THRESHOLD:
+                    source = _normalize_newlines(f.read())
+                else:
+                    # Tree 会持有 mmap 的引用，映射随 Tree 一起释放
+                    source = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                    if source.find(b"\r") != -1:
+                        source = _normalize_newlines(source[:])
+            tree = self.parser.parse(source)
             _get_logger().debug(f"成功解析文件: {file_path}")
-            return self.parser.parse(bytes(source_code, "utf-8"))
+            return tree
         except Exception as e:
             _get_logger().error(f"解析文件失败 {file_path}: {e}")
             return None
@@ -65,8 +294,13 @@ class PythonParser:
         return self.parser.parse(bytes(source_code, "utf-8"))
 
     def get_node_text(self, node: Node, source_bytes: bytes) -> str:
-        """获取节点对应的源代码文本"""
-        return source_bytes[node.start_byte : node.end_byte].decode("utf-8")
+        """
+        获取节点对应的源代码文本
+
+        不指定编码参数调用 decode()：默认即 UTF-8，省去按名称查找编解码器，
+        纯 ASCII 的标识符由 CPython 的 ASCII 快速路径解码。
+        """
+        return source_bytes[node.start_byte : node.end_byte].decode()
 
     def extract_imports(self, tree: Tree, source_bytes: bytes) -> Dict[str, str]:
         """
@@ -74,185 +308,173 @@ class PythonParser:
         返回: {别名或名称: 完整模块路径}
         """
         imports = {}
-        root = tree.root_node
-
-        def process_import(node: Node):
-            if node.type == "import_statement":
+        captures = _query_captures(self._import_query, tree.root_node)
+        for node in captures.get("import", []):
+            if node.kind_id == self._K_IMPORT_STMT:
                 # import foo, bar as b
-                for child in node.children:
-                    if child.type == "dotted_name":
-                        name = self.get_node_text(child, source_bytes)
-                        imports[name.split(".")[-1]] = name
-                    elif child.type == "aliased_import":
-                        dotted = None
-                        alias = None
-                        for c in child.children:
-                            if c.type == "dotted_name":
-                                dotted = self.get_node_text(c, source_bytes)
-                            elif c.type == "identifier":
-                                alias = self.get_node_text(c, source_bytes)
-                        if dotted and alias:
-                            imports[alias] = dotted
-
-            elif node.type == "import_from_statement":
+                self._collect_imported_names(node, None, source_bytes, imports)
+            else:
                 # from foo import bar, baz as z
-                # 首先找到模块名（在 'import' 关键字之前的 dotted_name 或 relative_import）
-                module = None
-                import_keyword_found = False
-
-                for child in node.children:
-                    if child.type == "import":
-                        import_keyword_found = True
-                        continue
-
-                    if not import_keyword_found:
-                        # import 关键字之前的是模块名
-                        if child.type == "dotted_name":
-                            module = self.get_node_text(child, source_bytes)
-                        elif child.type == "relative_import":
-                            module = self.get_node_text(child, source_bytes)
-                    else:
-                        # import 关键字之后的是导入的名称
-                        if child.type == "dotted_name":
-                            name = self.get_node_text(child, source_bytes)
-                            full_path = f"{module}.{name}" if module else name
-                            imports[name.split(".")[-1]] = full_path
-                        elif child.type == "aliased_import":
-                            original = None
-                            alias = None
-                            for c in child.children:
-                                if (
-                                    c.type in ("dotted_name", "identifier")
-                                    and original is None
-                                ):
-                                    original = self.get_node_text(c, source_bytes)
-                                elif c.type == "identifier":
-                                    alias = self.get_node_text(c, source_bytes)
-                            if original:
-                                full_path = (
-                                    f"{module}.{original}" if module else original
-                                )
-                                imports[alias or original] = full_path
-                        elif child.type == "identifier":
-                            name = self.get_node_text(child, source_bytes)
-                            if name not in ("from", "import", "as"):
-                                full_path = f"{module}.{name}" if module else name
-                                imports[name] = full_path
-
-        def traverse(node: Node):
-            process_import(node)
-            for child in node.children:
-                traverse(child)
-
-        traverse(root)
-        return imports
+                module_node = node.child_by_field_id(self._F_MODULE_NAME)
+                module = (
+                    self.get_node_text(module_node, source_bytes)
+                    if module_node is not None
+                    else None
+                )
+                self._collect_imported_names(node, module, source_bytes, imports)
+
+        # 驻留字符串：同一模块名在整个项目中大量重复，共享同一个对象
+        return {sys.intern(k): sys.intern(v) for k, v in imports.items()}
+
+    def _collect_imported_names(
+        self,
+        node: Node,
+        module: Optional[str],
+        source_bytes: bytes,
+        imports: Dict[str, str],
+    ):
+        """
+        将导入语句中 name 字段的各个名称写入 imports
+
+        通过语法字段直接取得被导入的名称，不再逐个检查关键字、逗号等子节点。
+        module 为 from 语句的模块名，import 语句传入 None。
+        """
+        for child in node.children_by_field_id(self._F_NAME):
+            if child.kind_id == self._K_DOTTED_NAME:
+                name = self.get_node_text(child, source_bytes)
+                full_path = f"{module}.{name}" if module else name
+                imports[name.split(".")[-1]] = full_path
+            elif child.kind_id == self._K_ALIASED_IMPORT:
+                original_node = child.child_by_field_id(self._F_NAME)
+                alias_node = child.child_by_field_id(self._F_ALIAS)
+                if original_node is None or alias_node is None:
+                    continue
+                original = self.get_node_text(original_node, source_bytes)
+                full_path = f"{module}.{original}" if module else original
+                imports[self.get_node_text(alias_node, source_bytes)] = full_path
+
+    def collect_callee_captures(
+        self, root: Node, source_bytes: bytes
+    ) -> CalleeCaptures:
+        """
+        对整个文件执行一次调用查询，并解析出每个捕获节点对应的符号名称
+
+        类体包含其中的方法，按符号逐个处理时同一个捕获节点会被类和方法各解析一次；
+        这里每个捕获节点只解析一次，每个符号再按字节范围取出自己的名称。
+
+        Returns:
+            (按起始字节排序的起始字节列表, 对应的名称列表, super 调用的起始字节列表)
+        """
+        entries: List[Tuple[int, str]] = []
+        super_starts: List[int] = []
+        captures = _query_captures(self._callee_query, root)
+
+        for func_node in captures.get("call.identifier", []):
+            # 直接调用: foo()
+            text = source_bytes[func_node.start_byte : func_node.end_byte]
+            entries.append((func_node.start_byte, text.decode()))
+            # 检测 super() 调用（按字节比较，无需解码）
+            if text == b"super":
+                super_starts.append(func_node.start_byte)
+
+        for func_node in captures.get("call.attribute", []):
+            # 属性调用: obj.method() 或 Class.method()
+            root_name = self._extract_attribute_root(func_node, source_bytes)
+            if root_name:
+                entries.append((func_node.start_byte, root_name))
+                if root_name == "super":
+                    super_starts.append(func_node.start_byte)
+
+        for attr_node in captures.get("attribute", []):
+            # 处理属性访问: ddd.xxx 作为参数或赋值值
+            root_name = self._extract_attribute_root(attr_node, source_bytes)
+            if root_name and root_name != "super":
+                entries.append((attr_node.start_byte, root_name))
+
+        for ident_node in captures.get("identifier", []):
+            # 检查是否是类实例化或引用
+            text = source_bytes[ident_node.start_byte : ident_node.end_byte]
+            if not text:
+                continue
+            # 首字母大写通常是类名；ASCII 首字母直接按字节判断，无需解码
+            if text[0] < 0x80:
+                if text[:1].isupper():
+                    entries.append((ident_node.start_byte, text.decode()))
+            else:
+                name = text.decode()
+                if name[0].isupper():
+                    entries.append((ident_node.start_byte, name))
+
+        entries.sort(key=itemgetter(0))
+        super_starts.sort()
+        # 驻留字符串：名称在每个捕获节点上只驻留一次，各符号共享
+        return (
+            [start for start, _ in entries],
+            [sys.intern(name) for _, name in entries],
+            super_starts,
+        )
 
     def extract_callees(
-        self, node: Node, source_bytes: bytes
+        self,
+        node: Node,
+        source_bytes: bytes,
+        file_captures: Optional[CalleeCaptures] = None,
     ) -> Tuple[List[str], bool]:
         """
         从函数/方法/类体中提取调用的符号名称
 
+        Args:
+            node: 符号节点
+            source_bytes: 源代码字节
+            file_captures: 可选，collect_callee_captures 的结果，
+                传入时不再对该节点重新执行查询和解析名称
+
         Returns:
             (callees_list, calls_super): 被调用的符号列表和是否调用了 super()
         """
-        callees = set()
-        calls_super = False
-
-        def extract_attribute_root(attr_node: Node) -> Optional[str]:
-            """
-            从 attribute 节点提取根对象名称
-
-            如 ddd.xxx.yyy -> 返回 'ddd'
-            如 self.xxx -> 返回 None (跳过 self/cls)
-            """
-            # 递归找到最左边的 identifier
-            current = attr_node
-            while current.type == "attribute":
-                obj = current.child_by_field_name("object")
-                if obj:
-                    current = obj
-                else:
-                    break
-
-            if current.type == "identifier":
-                name = self.get_node_text(current, source_bytes)
-                if name not in ("self", "cls"):
-                    return name
-            elif current.type == "call":
-                # 处理 super().xxx 这种情况
-                func = current.child_by_field_name("function")
-                if func and func.type == "identifier":
-                    return self.get_node_text(func, source_bytes)
-
-            return None
+        if file_captures is None:
+            file_captures = self.collect_callee_captures(node, source_bytes)
+        starts, names, super_starts = file_captures
+
+        # 名称按起始字节排序，落在符号范围内的是一段连续区间
+        lo = bisect_left(starts, node.start_byte)
+        hi = bisect_left(starts, node.end_byte, lo)
+        i = bisect_left(super_starts, node.start_byte)
+        calls_super = i < len(super_starts) and super_starts[i] < node.end_byte
+        return list(set(names[lo:hi])), calls_super
+
+    def _extract_attribute_root(
+        self, attr_node: Node, source_bytes: bytes
+    ) -> Optional[str]:
+        """
+        从 attribute 节点提取根对象名称
 
-        def traverse(n: Node):
-            nonlocal calls_super
+        如 ddd.xxx.yyy -> 返回 'ddd'
+        如 self.xxx -> 返回 None (跳过 self/cls)
+        """
+        k_identifier = self._K_IDENTIFIER
+
+        # 循环找到最左边的 identifier
+        current = attr_node
+        while current.kind_id == self._K_ATTRIBUTE:
+            obj = current.child_by_field_id(self._F_OBJECT)
+            if obj:
+                current = obj
+            else:
+                break
+
+        if current.kind_id == k_identifier:
+            # 先按字节比较，被跳过的 self/cls 无需解码
+            text = source_bytes[current.start_byte : current.end_byte]
+            if text not in (b"self", b"cls"):
+                return text.decode()
+        elif current.kind_id == self._K_CALL:
+            # 处理 super().xxx 这种情况
+            func = current.child_by_field_id(self._F_FUNCTION)
+            if func and func.kind_id == k_identifier:
+                return self.get_node_text(func, source_bytes)
 
-            if n.type == "call":
-                # 获取被调用的函数/方法名
-                func_node = n.child_by_field_name("function")
-                if func_node:
-                    if func_node.type == "identifier":
-                        # 直接调用: foo()
-                        func_name = self.get_node_text(func_node, source_bytes)
-                        callees.add(func_name)
-                        # 检测 super() 调用
-                        if func_name == "super":
-                            calls_super = True
-                    elif func_node.type == "attribute":
-                        # 属性调用: obj.method() 或 Class.method()
-                        root_name = extract_attribute_root(func_node)
-                        if root_name:
-                            callees.add(root_name)
-                            if root_name == "super":
-                                calls_super = True
-
-            elif n.type == "attribute":
-                # 处理属性访问: ddd.xxx 作为参数或赋值值
-                # 检查父节点，确保不是 call 的 function 部分（那部分已经处理了）
-                parent = n.parent
-                if parent and parent.type != "attribute":
-                    # 不是嵌套的 attribute，检查是否是有意义的上下文
-                    if parent.type in (
-                        "argument_list",
-                        "assignment",
-                        "expression_statement",
-                        "return_statement",
-                        "yield",
-                        "comparison_operator",
-                        "binary_operator",
-                        "boolean_operator",
-                        "conditional_expression",
-                        "tuple",
-                        "list",
-                        "dictionary",
-                        "set",
-                        "subscript",
-                    ):
-                        root_name = extract_attribute_root(n)
-                        if root_name and root_name != "super":
-                            callees.add(root_name)
-
-            elif n.type == "identifier":
-                # 检查是否是类实例化或引用
-                parent = n.parent
-                if parent and parent.type in (
-                    "argument_list",
-                    "assignment",
-                    "expression_statement",
-                ):
-                    name = self.get_node_text(n, source_bytes)
-                    # 首字母大写通常是类名
-                    if name and name[0].isupper():
-                        callees.add(name)
-
-            for child in n.children:
-                traverse(child)
-
-        traverse(node)
-        return list(callees), calls_super
+        return None
 
     def extract_base_classes(self, node: Node, source_bytes: bytes) -> List[str]:
         """
@@ -267,112 +489,228 @@ class PythonParser:
         """
         base_classes = []
 
-        # 查找 argument_list（继承列表）
-        for child in node.children:
-            if child.type == "argument_list":
-                # 遍历继承列表中的所有参数
-                for arg in child.children:
-                    if arg.type == "identifier":
-                        # 简单继承: class Foo(Bar)
-                        base_classes.append(self.get_node_text(arg, source_bytes))
-                    elif arg.type == "attribute":
-                        # 模块.类继承: class Foo(module.Bar)
-                        attr_text = self.get_node_text(arg, source_bytes)
-                        base_classes.append(attr_text)
-                    elif arg.type == "call":
-                        # 泛型或特殊继承: class Foo(Generic[T])
-                        func_node = arg.child_by_field_name("function")
-                        if func_node:
-                            base_classes.append(
-                                self.get_node_text(func_node, source_bytes)
-                            )
-
-        return base_classes
+        # 继承列表（argument_list）通过字段名直接定位
+        superclasses = node.child_by_field_id(self._F_SUPERCLASSES)
+        if superclasses is None:
+            return base_classes
+
+        # 遍历继承列表中的所有具名参数（跳过括号和逗号）
+        for arg in superclasses.named_children:
+            if arg.kind_id == self._K_IDENTIFIER:
+                # 简单继承: class Foo(Bar)
+                base_classes.append(self.get_node_text(arg, source_bytes))
+            elif arg.kind_id == self._K_ATTRIBUTE:
+                # 模块.类继承: class Foo(module.Bar)
+                attr_text = self.get_node_text(arg, source_bytes)
+                base_classes.append(attr_text)
+            elif arg.kind_id == self._K_CALL:
+                # 泛型或特殊继承: class Foo(Generic[T])
+                func_node = arg.child_by_field_id(self._F_FUNCTION)
+                if func_node:
+                    base_classes.append(self.get_node_text(func_node, source_bytes))
+
+        return list(map(sys.intern, base_classes))
 
     def find_classes(
-        self, tree: Tree, source_bytes: bytes, file_path: str
+        self,
+        tree: Tree,
+        source_bytes: bytes,
+        file_path: str,
+        imports: Optional[Dict[str, str]] = None,
     ) -> List[ParsedSymbol]:
-        """查找所有类定义"""
-        classes = []
-        imports = self.extract_imports(tree, source_bytes)
-
-        def traverse(node: Node):
-            if node.type == "class_definition":
-                name_node = node.child_by_field_name("name")
-                if name_node:
-                    name = self.get_node_text(name_node, source_bytes)
-                    content = self.get_node_text(node, source_bytes)
-                    callees, _ = self.extract_callees(node, source_bytes)
-                    base_classes = self.extract_base_classes(node, source_bytes)
-
-                    classes.append(
-                        ParsedSymbol(
-                            name=name,
-                            node_type="class",
-                            start_line=node.start_point[0] + 1,
-                            end_line=node.end_point[0] + 1,
-                            start_col=node.start_point[1],
-                            end_col=node.end_point[1],
-                            content=content,
-                            file_path=file_path,
-                            callees=callees,
-                            imports=imports,
-                            base_classes=base_classes,
-                        )
-                    )
+        """
+        查找所有类定义
 
-            for child in node.children:
-                traverse(child)
+        imports 为该文件已提取的导入信息，传入时不再重复提取，
+        文件内所有符号共享同一个字典。
+        """
+        if imports is None:
+            imports = self.extract_imports(tree, source_bytes)
 
-        traverse(tree.root_node)
-        return classes
+        file_captures = self.collect_callee_captures(tree.root_node, source_bytes)
+        captures = _query_captures(self._class_query, tree.root_node)
+        return [
+            self._class_symbol(node, source_bytes, file_path, imports, file_captures)
+            for node in captures.get("class", [])
+        ]
 
     def find_functions(
-        self, tree: Tree, source_bytes: bytes, file_path: str
+        self,
+        tree: Tree,
+        source_bytes: bytes,
+        file_path: str,
+        imports: Optional[Dict[str, str]] = None,
     ) -> List[ParsedSymbol]:
-        """查找所有函数定义（包括类内方法和模块级函数）"""
-        functions = []
-        imports = self.extract_imports(tree, source_bytes)
-
-        def traverse(node: Node, current_class: Optional[str] = None):
-            if node.type == "class_definition":
-                name_node = node.child_by_field_name("name")
-                class_name = (
-                    self.get_node_text(name_node, source_bytes) if name_node else None
-                )
-                for child in node.children:
-                    traverse(child, class_name)
-                return
+        """
+        查找所有函数定义（包括类内方法和模块级函数）
 
-            if node.type == "function_definition":
-                name_node = node.child_by_field_name("name")
-                if name_node:
-                    name = self.get_node_text(name_node, source_bytes)
-                    content = self.get_node_text(node, source_bytes)
-                    callees, calls_super = self.extract_callees(node, source_bytes)
-
-                    functions.append(
-                        ParsedSymbol(
-                            name=name,
-                            node_type="method" if current_class else "function",
-                            start_line=node.start_point[0] + 1,
-                            end_line=node.end_point[0] + 1,
-                            start_col=node.start_point[1],
-                            end_col=node.end_point[1],
-                            content=content,
-                            file_path=file_path,
-                            host_class=current_class,
-                            callees=callees,
-                            imports=imports,
-                            calls_super=calls_super,
-                        )
-                    )
+        imports 为该文件已提取的导入信息，传入时不再重复提取，
+        文件内所有符号共享同一个字典。
+        """
+        if imports is None:
+            imports = self.extract_imports(tree, source_bytes)
+
+        file_captures = self.collect_callee_captures(tree.root_node, source_bytes)
+        captures = _query_captures(self._function_query, tree.root_node)
+        return [
+            self._function_symbol(node, source_bytes, file_path, imports, file_captures)
+            for node in captures.get("function", [])
+        ]
+
+    def find_symbols(
+        self,
+        tree: Tree,
+        source_bytes: bytes,
+        file_path: str,
+        imports: Optional[Dict[str, str]] = None,
+    ) -> Tuple[List[ParsedSymbol], List[ParsedSymbol]]:
+        """
+        一次性查找所有类和函数定义
 
-            for child in node.children:
-                traverse(child, current_class)
+        导入信息、调用查询和定义查询都只执行一次，结果与分别调用
+        find_classes 和 find_functions 相同。
 
-        traverse(tree.root_node)
-        return functions
+        Returns:
+            (classes, functions)
+        """
+        if imports is None:
+            imports = self.extract_imports(tree, source_bytes)
+
+        root = tree.root_node
+        file_captures = self.collect_callee_captures(root, source_bytes)
+        captures = _query_captures(self._symbol_query, root)
+        classes = [
+            self._class_symbol(node, source_bytes, file_path, imports, file_captures)
+            for node in captures.get("class", [])
+        ]
+        function_nodes = captures.get("function", [])
+        host_classes = self._host_class_names(classes, function_nodes)
+        functions = [
+            self._build_function_symbol(
+                node, source_bytes, file_path, imports, file_captures, host_class
+            )
+            for node, host_class in zip(function_nodes, host_classes)
+        ]
+        return classes, functions
+
+    def _host_class_names(
+        self, classes: List[ParsedSymbol], function_nodes: List[Node]
+    ) -> List[Optional[str]]:
+        """
+        按字节范围为每个函数找出最近一层的所属类名
+
+        类和函数都按起始字节排序，顺序扫描一遍并用下标栈维护当前所在的
+        嵌套类，不必为每个函数沿 parent 逐层向上查找。
+
+        Returns:
+            与 function_nodes 一一对应的类名列表，模块级函数为 None
+        """
+        # 同一个类的所有方法共享同一个类名字符串
+        names = [sys.intern(c.name) for c in classes]
+        hosts: List[Optional[str]] = []
+        stack: List[int] = []
+        next_class = 0
+        for node in function_nodes:
+            start = node.start_byte
+            while next_class < len(classes) and classes[next_class].start_byte < start:
+                class_start = classes[next_class].start_byte
+                while stack and classes[stack[-1]].end_byte <= class_start:
+                    stack.pop()
+                stack.append(next_class)
+                next_class += 1
+            while stack and classes[stack[-1]].end_byte <= start:
+                stack.pop()
+            hosts.append(names[stack[-1]] if stack else None)
+        return hosts
+
+    def _class_symbol(
+        self,
+        node: Node,
+        source_bytes: bytes,
+        file_path: str,
+        imports: Dict[str, str],
+        file_captures: Optional[CalleeCaptures] = None,
+    ) -> ParsedSymbol:
+        """由 class_definition 节点构造 ParsedSymbol"""
+        name_node = node.child_by_field_id(self._F_NAME)
+        callees, _ = self.extract_callees(node, source_bytes, file_captures)
+        return ParsedSymbol(
+            name=self.get_node_text(name_node, source_bytes),
+            node_type="class",
+            start_line=node.start_point[0] + 1,
+            end_line=node.end_point[0] + 1,
+            start_col=node.start_point[1],
+            end_col=node.end_point[1],
+            content=None,
+            file_path=file_path,
+            callees=callees,
+            imports=imports,
+            base_classes=self.extract_base_classes(node, source_bytes),
+            start_byte=node.start_byte,
+            end_byte=node.end_byte,
+            source=source_bytes,
+        )
+
+    def _function_symbol(
+        self,
+        node: Node,
+        source_bytes: bytes,
+        file_path: str,
+        imports: Dict[str, str],
+        file_captures: Optional[CalleeCaptures] = None,
+    ) -> ParsedSymbol:
+        """由 function_definition 节点构造 ParsedSymbol"""
+        return self._build_function_symbol(
+            node,
+            source_bytes,
+            file_path,
+            imports,
+            file_captures,
+            self._enclosing_class_name(node, source_bytes),
+        )
+
+    def _build_function_symbol(
+        self,
+        node: Node,
+        source_bytes: bytes,
+        file_path: str,
+        imports: Dict[str, str],
+        file_captures: Optional[CalleeCaptures],
+        current_class: Optional[str],
+    ) -> ParsedSymbol:
+        """由 function_definition 节点和已知的所属类名构造 ParsedSymbol"""
+        name_node = node.child_by_field_id(self._F_NAME)
+        callees, calls_super = self.extract_callees(node, source_bytes, file_captures)
+        return ParsedSymbol(
+            name=self.get_node_text(name_node, source_bytes),
+            node_type="method" if current_class else "function",
+            start_line=node.start_point[0] + 1,
+            end_line=node.end_point[0] + 1,
+            start_col=node.start_point[1],
+            end_col=node.end_point[1],
+            content=None,
+            file_path=file_path,
+            host_class=current_class,
+            callees=callees,
+            imports=imports,
+            calls_super=calls_super,
+            start_byte=node.start_byte,
+            end_byte=node.end_byte,
+            source=source_bytes,
+        )
+
+    def _enclosing_class_name(self, node: Node, source_bytes: bytes) -> Optional[str]:
+        """返回包含该节点的最近一层类定义的类名"""
+        parent = node.parent
+        while parent is not None:
+            if parent.kind_id == self._K_CLASS_DEF:
+                name_node = parent.child_by_field_id(self._F_NAME)
+                if name_node is None:
+                    return None
+                # 同一个类的所有方法共享同一个类名字符串
+                return sys.intern(self.get_node_text(name_node, source_bytes))
+            parent = parent.parent
+        return None
 
     def find_symbol_by_name(
         self,
@@ -382,18 +720,36 @@ class PythonParser:
         symbol_name: str,
         symbol_type: Optional[str] = None,  # "class", "function", or None for any
     ) -> Optional[ParsedSymbol]:
-        """根据名称查找符号"""
-        if symbol_type in (None, "class"):
-            classes = self.find_classes(tree, source_bytes, file_path)
-            for cls in classes:
-                if cls.name == symbol_name:
-                    return cls
+        """
+        根据名称查找符号
 
+        名称没有出现在源代码中时直接返回，不执行查询；否则只执行一次查询
+        （不限类型时使用同时捕获类和函数的查询），先找类再找函数，
+        只比较定义节点的名称字节，仅为命中的节点构造 ParsedSymbol。
+        """
+        target = symbol_name.encode("utf-8")
+        if not target or source_bytes.find(target) == -1:
+            return None
+
+        searches = []
+        if symbol_type in (None, "class"):
+            searches.append(("class", self._class_symbol))
         if symbol_type in (None, "function"):
-            functions = self.find_functions(tree, source_bytes, file_path)
-            for func in functions:
-                if func.name == symbol_name:
-                    return func
+            searches.append(("function", self._function_symbol))
+        if symbol_type is None:
+            query = self._symbol_query
+        elif symbol_type == "class":
+            query = self._class_query
+        else:
+            query = self._function_query
+
+        captures = _query_captures(query, tree.root_node) if searches else {}
+        for capture_name, build_symbol in searches:
+            for node in captures.get(capture_name, []):
+                name_node = node.child_by_field_id(self._F_NAME)
+                if source_bytes[name_node.start_byte : name_node.end_byte] == target:
+                    imports = self.extract_imports(tree, source_bytes)
+                    return build_symbol(node, source_bytes, file_path, imports)
 
         return None
 
@@ -414,12 +770,171 @@ def _parsed_symbol_from_dict(data: Dict[str, Any]) -> ParsedSymbol:
         imports=data.get("imports", {}),
         base_classes=data.get("base_classes", []),
         calls_super=data.get("calls_super", False),
+        start_byte=data.get("start_byte", 0),
+        end_byte=data.get("end_byte", 0),
+    )
+
+
+def _parsed_symbol_to_dict(
+    symbol: ParsedSymbol, with_content: bool = True
+) -> Dict[str, Any]:
+    """
+    将 ParsedSymbol 对象转换为字典
+
+    直接引用字段值，不像 dataclasses.asdict 那样深拷贝 callees/imports 等容器。
+    with_content 为 False 时 content 记为 None，不触发源代码解码。
+    """
+    return {
+        "name": symbol.name,
+        "node_type": symbol.node_type,
+        "start_line": symbol.start_line,
+        "end_line": symbol.end_line,
+        "start_col": symbol.start_col,
+        "end_col": symbol.end_col,
+        "content": symbol.content if with_content else None,
+        "file_path": symbol.file_path,
+        "host_class": symbol.host_class,
+        "callees": symbol.callees,
+        "imports": symbol.imports,
+        "base_classes": symbol.base_classes,
+        "calls_super": symbol.calls_super,
+        "start_byte": symbol.start_byte,
+        "end_byte": symbol.end_byte,
+    }
+
+
+def _parsed_symbol_to_index_dict(symbol: ParsedSymbol) -> Dict[str, Any]:
+    """
+    将 ParsedSymbol 对象转换为写入索引的字典
+
+    源代码已保存在文件缓存中，索引只记录字节范围，不重复存储 content。
+    """
+    return _parsed_symbol_to_dict(symbol, with_content=False)
+
+
+# 需要解析的文件数不少于该值时才启用多进程，小项目启动进程池得不偿失
+_PARALLEL_MIN_FILES = 64
+
+# 多进程解析时每个工作进程对应的排队文件数，限制同时在途的解析结果
+_PARALLEL_QUEUE_PER_WORKER = 4
+
+# 工作进程中的解析器（由进程池 initializer 创建）
+_worker_parser: Optional[PythonParser] = None
+
+
+def _init_parse_worker():
+    """进程池工作进程初始化：每个进程创建一个解析器"""
+    global _worker_parser
+    _worker_parser = PythonParser()
+
+
+def _parse_file_worker(file_path: str) -> Tuple[float, bytes, List[Dict[str, Any]]]:
+    """
+    在工作进程中解析单个文件
+
+    Tree 对象无法跨进程传递，只返回可序列化的结果。
+
+    Returns:
+        (mtime, source_bytes, 符号数据字典列表)
+    """
+    mtime = os.stat(file_path).st_mtime
+    source_bytes = _read_source_bytes(file_path)
+    tree = _worker_parser.parser.parse(source_bytes)
+    classes, functions = _worker_parser.find_symbols(tree, source_bytes, file_path)
+    symbols = [_parsed_symbol_to_index_dict(s) for s in classes + functions]
+    return mtime, source_bytes, symbols
+
+
+# 线程池中每个线程各自的解析器（Parser 有状态，不能在线程间共享）
+_thread_state = threading.local()
+
+
+def _parse_file_in_thread(file_path: str) -> Tuple[float, Tree, bytes]:
+    """
+    在线程池中读取并解析单个文件
+
+    tree-sitter 解析字节串时释放 GIL，多个文件的读取和解析可以并行；
+    提取符号和写入缓存仍由主线程按文件顺序完成。
+
+    Returns:
+        (mtime, Tree, source_bytes)
+    """
+    parser = getattr(_thread_state, "parser", None)
+    if parser is None:
+        parser = _thread_state.parser = PythonParser()
+    mtime = os.stat(file_path).st_mtime
+    source_bytes = _read_source_bytes(file_path)
+    return mtime, parser.parser.parse(source_bytes), source_bytes
+
+
+def _common_prefix_length(old: bytes, new: bytes) -> int:
+    """计算两段字节串的公共前缀长度（二分查找，比较在 C 层完成）"""
+    lo, hi = 0, min(len(old), len(new))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if old[lo:mid] == new[lo:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _common_suffix_length(old: bytes, new: bytes, limit: int) -> int:
+    """计算两段字节串的公共后缀长度，最多 limit 字节"""
+    old_len, new_len = len(old), len(new)
+    lo, hi = 0, limit
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if old[old_len - mid : old_len - lo] == new[new_len - mid : new_len - lo]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _byte_point(source: bytes, offset: int) -> Tuple[int, int]:
+    """将字节偏移转换为 tree-sitter 的 (行, 列) 坐标"""
+    row = source.count(b"\n", 0, offset)
+    column = offset - (source.rfind(b"\n", 0, offset) + 1)
+    return row, column
+
+
+def _edit_tree(old_tree: Tree, old_bytes: bytes, new_bytes: bytes) -> None:
+    """
+    根据新旧源代码的差异区间编辑旧 Tree，使其可用于增量解析
+
+    差异区间由公共前缀和公共后缀确定。
+    """
+    prefix = _common_prefix_length(old_bytes, new_bytes)
+    suffix = _common_suffix_length(
+        old_bytes, new_bytes, min(len(old_bytes), len(new_bytes)) - prefix
+    )
+    old_end = len(old_bytes) - suffix
+    new_end = len(new_bytes) - suffix
+    old_tree.edit(
+        start_byte=prefix,
+        old_end_byte=old_end,
+        new_end_byte=new_end,
+        start_point=_byte_point(old_bytes, prefix),
+        old_end_point=_byte_point(old_bytes, old_end),
+        new_end_point=_byte_point(new_bytes, new_end),
     )
 
 
-def _parsed_symbol_to_dict(symbol: ParsedSymbol) -> Dict[str, Any]:
-    """将 ParsedSymbol 对象转换为字典"""
-    return asdict(symbol)
+# 构建索引时跳过的常见非源码目录
+_SKIP_DIRS = frozenset(
+    {
+        "__pycache__",
+        ".git",
+        ".venv",
+        "venv",
+        "node_modules",
+        ".tox",
+        "build",
+        "dist",
+        ".eggs",
+    }
+)
 
 
 class ProjectParser:
@@ -430,6 +945,7 @@ class ProjectParser:
         project_root: str,
         cache_dir: Optional[str] = None,
         db_path: Optional[str] = None,
+        max_workers: Optional[int] = None,
     ):
         """
         初始化项目解析器
@@ -438,82 +954,100 @@ class ProjectParser:
             project_root: 项目根目录
             cache_dir: 可选，缓存目录路径
             db_path: 可选，SQLite 数据库文件完整路径（如果指定则忽略 cache_dir）
+            max_workers: 可选，构建索引时的并行解析数，默认为 CPU 核数，
+                为 1 时不并行；文件较少时使用线程，较多时使用进程
         """
         self.project_root = Path(project_root).resolve()
+        self.max_workers = max_workers
         self.parser = PythonParser()
         # 使用 SQLite 缓存
         self._cache = SymbolCache(project_root, cache_dir=cache_dir, db_path=db_path)
         # 内存中的 Tree 缓存（Tree 对象无法序列化，需要保持在内存中）
-        self._tree_cache: Dict[str, Tuple[float, Tree]] = {}
-
-    def _get_python_files(self) -> List[Path]:
-        """获取项目中所有 Python 文件"""
-        python_files = []
-        for root, dirs, files in os.walk(self.project_root):
-            # 跳过常见的非源码目录
-            dirs[:] = [
-                d
-                for d in dirs
-                if d
-                not in (
-                    "__pycache__",
-                    ".git",
-                    ".venv",
-                    "venv",
-                    "node_modules",
-                    ".tox",
-                    "build",
-                    "dist",
-                    ".eggs",
-                )
-            ]
-            for file in files:
-                if file.endswith(".py"):
-                    python_files.append(Path(root) / file)
-        return python_files
+        # 同时保存源代码，文件修改后可基于旧 Tree 增量解析
+        # {文件路径: (mtime, Tree, 源代码字节)}，mtime 为 None 表示已失效、
+        # 仅作为增量解析基础的 Tree
+        self._tree_cache: Dict[str, Tuple[Optional[float], Tree, bytes]] = {}
+        # 索引已确认建立后，查询时不再访问 SQLite 检查索引状态
+        self._index_ready = False
+        # 按符号类型分组的符号概要：{symbol_type: [(name, file_path, line, host_class)]}
+        # 索引内容变化时清空
+        self._outline_cache: Dict[
+            Optional[str], List[Tuple[str, str, int, Optional[str]]]
+        ] = {}
+
+    def _get_python_files(self) -> Iterator[str]:
+        """
+        逐个产出项目中所有 Python 文件的路径字符串
 
-    def _parse_file_cached(self, file_path: Path) -> Optional[Tuple[Tree, bytes]]:
+        使用 os.scandir 手动遍历，直接利用 DirEntry 缓存的类型信息，
+        文件顺序与 os.walk 自顶向下遍历一致。直接产出 DirEntry.path，
+        不为每个文件构造 Path 对象；以生成器方式产出，调用方可以
+        边遍历边解析，无需等待整个目录树遍历完成。
+        """
+        stack = [str(self.project_root)]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as it:
+                    entries = list(it)
+            except OSError:
+                continue
+
+            subdirs = []
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if is_dir:
+                    # 跳过常见的非源码目录，不跟随符号链接目录
+                    if entry.name not in _SKIP_DIRS and not entry.is_symlink():
+                        subdirs.append(entry.path)
+                elif entry.name.endswith(".py"):
+                    yield entry.path
+            stack.extend(reversed(subdirs))
+
+    def _parse_file_cached(
+        self, file_path: Union[str, Path]
+    ) -> Optional[Tuple[Tree, bytes]]:
         """带缓存的文件解析"""
         file_str = str(file_path)
 
-        if not file_path.exists():
+        # 一次 stat 同时判断文件是否存在并取得 mtime
+        try:
+            mtime = os.stat(file_str).st_mtime
+        except OSError:
             return None
 
-        mtime = file_path.stat().st_mtime
-
         # 首先检查内存中的 Tree 缓存
-        if file_str in self._tree_cache:
-            cached_mtime, tree = self._tree_cache[file_str]
-            if cached_mtime == mtime:
-                # 从 SQLite 获取源代码
-                cache_data = self._cache.get_file_cache(file_str)
-                if cache_data:
-                    _, _, source_code = cache_data
-                    return tree, bytes(source_code, "utf-8")
-
-        # 检查 SQLite 缓存
-        if self._cache.is_file_cache_valid(file_str, mtime):
-            cache_data = self._cache.get_file_cache(file_str)
-            if cache_data:
-                _, _, source_code = cache_data
-                source_bytes = bytes(source_code, "utf-8")
-                # 重新解析以获得 Tree 对象（Tree 无法序列化）
+        cached = self._tree_cache.get(file_str)
+        if cached is not None and cached[0] == mtime:
+            return cached[1], cached[2]
+
+        # 检查 SQLite 缓存：mtime 未变时直接用缓存的源代码重建 Tree，
+        # 不再读取文件（一次查询同时校验 mtime 并取出源代码）
+        if cached is None:
+            source_bytes = self._cache.get_source_bytes(file_str, mtime)
+            if source_bytes is not None:
                 tree = self.parser.parser.parse(source_bytes)
-                self._tree_cache[file_str] = (mtime, tree)
+                self._tree_cache[file_str] = (mtime, tree, source_bytes)
                 _get_logger().debug(f"从 SQLite 缓存加载: {file_path}")
                 return tree, source_bytes
 
         # 需要重新解析文件
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                source_code = f.read()
-            source_bytes = bytes(source_code, "utf-8")
-            tree = self.parser.parser.parse(source_bytes)
+            source_bytes = _read_source_bytes(file_path)
+            tree = None
+            if cached is not None:
+                # 先移除旧条目，解析失败时缓存中不会留下与源代码不一致的 Tree
+                self._tree_cache.pop(file_str, None)
+                tree = self._reparse_incremental(file_path, cached, source_bytes)
+            if tree is None:
+                tree = self.parser.parser.parse(source_bytes)
 
             # 保存到 SQLite 缓存
-            self._cache.set_file_cache(file_str, mtime, source_code)
+            self._cache.set_file_cache(file_str, mtime, source_bytes)
             # 保存 Tree 到内存缓存
-            self._tree_cache[file_str] = (mtime, tree)
+            self._tree_cache[file_str] = (mtime, tree, source_bytes)
 
             _get_logger().debug(f"解析并缓存文件: {file_path}")
             return tree, source_bytes
@@ -521,56 +1055,254 @@ class ProjectParser:
             _get_logger().error(f"解析文件失败 {file_path}: {e}")
             return None
 
+    def _reparse_incremental(
+        self,
+        file_path: Union[str, Path],
+        cached: Tuple[Optional[float], Tree, bytes],
+        source_bytes: bytes,
+    ) -> Optional[Tree]:
+        """
+        基于旧 Tree 增量解析修改后的文件，未变化的区域直接复用
+
+        在旧 Tree 的副本上应用编辑，其他仍持有旧 Tree 的调用方不受影响。
+        失败时返回 None，由调用方回退到完整解析。
+        """
+        _, old_tree, old_bytes = cached
+        try:
+            old_tree = old_tree.copy()
+            _edit_tree(old_tree, old_bytes, source_bytes)
+            tree = self.parser.parser.parse(source_bytes, old_tree)
+        except Exception as e:
+            _get_logger().debug(f"增量解析失败，回退到完整解析 {file_path}: {e}")
+            return None
+        _get_logger().debug(f"增量解析文件: {file_path}")
+        return tree
+
     def build_index(self, force: bool = False):
         """构建符号索引"""
-        if not force and self._cache.is_indexed():
-            _get_logger().debug("使用已有 SQLite 索引")
-            return
+        if not force:
+            if self._index_ready:
+                return
+            if self._cache.is_indexed():
+                _get_logger().debug("使用已有 SQLite 索引")
+                self._refresh_index()
+                self._index_ready = True
+                return
 
         _get_logger().info(f"开始构建符号索引，项目路径: {self.project_root}")
 
-        # 清空现有符号索引
-        self._cache.clear_symbols()
+        file_count = 0
+
+        def count_files() -> Iterator[str]:
+            nonlocal file_count
+            for file_path in self._get_python_files():
+                file_count += 1
+                yield file_path
+
+        # 以生成器方式边遍历、边解析、边写入；清空旧索引、导入和标记索引状态
+        # 在同一个事务中完成，只提交一次
+        self._outline_cache.clear()
+        self._cache.bulk_initial_load(
+            self._iter_file_symbols(count_files()), replace=True
+        )
+        self._index_ready = True
+        class_count, func_count = self._cache.get_symbol_count()
+        _get_logger().info(
+            f"索引构建完成: {file_count} 个 Python 文件, "
+            f"{class_count} 个类, {func_count} 个函数"
+        )
+
+    def refresh_index(self) -> Tuple[int, int]:
+        """
+        增量更新符号索引：只重新索引新增或修改的文件，移除已删除的文件
+
+        尚未建立索引时完整构建。
 
-        python_files = self._get_python_files()
-        _get_logger().info(f"发现 {len(python_files)} 个 Python 文件")
+        Returns:
+            (重新索引的文件数, 移除的文件数)
+        """
+        if not self._cache.is_indexed():
+            self.build_index(force=True)
+            return 0, 0
+        result = self._refresh_index()
+        self._index_ready = True
+        return result
+
+    def _refresh_index(self) -> Tuple[int, int]:
+        """
+        校验已有的 SQLite 索引，只重新索引发生变化的文件
 
-        class_count = 0
-        func_count = 0
-        batch_symbols: List[Dict[str, Any]] = []
-        batch_size = 100  # 批量写入的大小
+        按 mtime 与文件缓存对比：变化或新增的文件重新解析，
+        已删除文件的符号、导入和缓存一并移除，其余文件沿用已有索引。
 
-        for file_path in python_files:
-            result = self._parse_file_cached(file_path)
-            if not result:
+        Returns:
+            (重新索引的文件数, 移除的文件数)
+        """
+        file_mtimes: Dict[str, float] = {}
+        for file_path in self._get_python_files():
+            try:
+                file_mtimes[file_path] = os.stat(file_path).st_mtime
+            except OSError:
                 continue
 
-            tree, source_bytes = result
-            file_str = str(file_path)
+        changed, cached_only = self._cache.find_stale_files(file_mtimes)
+        removed = [p for p in cached_only if not os.path.exists(p)]
+        if not changed and not removed:
+            return 0, 0
+
+        _get_logger().info(
+            f"增量更新索引: {len(changed)} 个文件变化, {len(removed)} 个文件已删除"
+        )
+        self._outline_cache.clear()
+        with self._cache.bulk_write():
+            self._cache.remove_symbols_by_files(changed + removed)
+            for file_path in removed:
+                self._cache.remove_file_cache(file_path)
+            self._cache.add_symbols_batch(self._iter_file_symbols(changed))
+        for file_path in removed:
+            self._tree_cache.pop(file_path, None)
+        return len(changed), len(removed)
+
+    def _iter_file_symbols(
+        self, python_files: Iterable[str]
+    ) -> Generator[Dict[str, Any], None, None]:
+        """
+        解析文件，逐个产出符号数据字典
+
+        python_files 可以是边遍历边产出的生成器。已有有效缓存的文件在主进程中
+        解析；其余文件较多时交给进程池并行解析，较少时交给线程池，
+        结果仍按文件顺序产出，保证符号写入顺序稳定。
+        """
+        files = iter(python_files)
+        # 只预读到足以判断是否值得启动进程池为止，其余文件继续流式处理
+        head: List[str] = []
+        pending: List[str] = []
+        for file_path in files:
+            head.append(file_path)
+            if not self._has_cached_source(file_path):
+                pending.append(file_path)
+                if len(pending) >= _PARALLEL_MIN_FILES:
+                    break
+
+        workers = min(self.max_workers or os.cpu_count() or 1, len(pending))
+        if workers <= 1:
+            for file_path in chain(head, files):
+                yield from self._iter_single_file_symbols(file_path)
+            return
+        if len(pending) < _PARALLEL_MIN_FILES:
+            # 遍历已经结束，全部文件都在 head 中
+            yield from self._iter_file_symbols_threaded(head, pending, workers)
+            return
+
+        _get_logger().info(f"使用 {workers} 个进程并行解析文件")
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_parse_worker,
+        ) as executor:
+            # 按文件顺序排队，队列长度有上限：遍历、解析与写入交替进行，
+            # 不必一次提交全部文件
+            queue: Deque[Tuple[str, Optional[Future]]] = deque()
+            broken = False
+            for file_path in chain(head, files):
+                future = None
+                if not broken and not self._has_cached_source(file_path):
+                    try:
+                        future = executor.submit(_parse_file_worker, file_path)
+                    except BrokenProcessPool:
+                        # 工作进程异常退出后进程池不再接受任务：已排队的文件
+                        # 由 _iter_worker_result 回退处理，其余文件改在主进程中解析
+                        _get_logger().warning(
+                            "进程池不可用，剩余文件改为在主进程中解析"
+                        )
+                        broken = True
+                queue.append((file_path, future))
+                if len(queue) >= workers * _PARALLEL_QUEUE_PER_WORKER:
+                    yield from self._iter_worker_result(*queue.popleft())
+            while queue:
+                yield from self._iter_worker_result(*queue.popleft())
+
+    def _iter_worker_result(
+        self, file_path: str, future: Optional[Future]
+    ) -> Generator[Dict[str, Any], None, None]:
+        """产出工作进程解析结果中的符号；没有提交给进程池的文件在主进程中解析"""
+        if future is None:
+            yield from self._iter_single_file_symbols(file_path)
+            return
+
+        try:
+            mtime, source_bytes, symbols = future.result()
+            self._cache.set_file_cache(file_path, mtime, source_bytes)
+        except BrokenProcessPool:
+            # 进程池不可用时回退到主进程解析
+            yield from self._iter_single_file_symbols(file_path)
+            return
+        except Exception as e:
+            _get_logger().error(f"解析文件失败 {file_path}: {e}")
+            return
+        yield from symbols
 
-            # 索引类
-            classes = self.parser.find_classes(tree, source_bytes, file_str)
-            for cls in classes:
-                batch_symbols.append(_parsed_symbol_to_dict(cls))
-                class_count += 1
+    def _iter_file_symbols_threaded(
+        self, python_files: List[str], pending: List[str], workers: int
+    ) -> Generator[Dict[str, Any], None, None]:
+        """
+        文件较少、不值得启动进程池时，用线程池并行读取和解析文件
 
-            # 索引函数
-            functions = self.parser.find_functions(tree, source_bytes, file_str)
-            for func in functions:
-                batch_symbols.append(_parsed_symbol_to_dict(func))
-                func_count += 1
+        Tree 可以在线程间传递，主线程直接在其上提取符号并写入缓存，
+        结果按文件顺序产出。
+        """
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures: Dict[str, Future] = {
+                file_path: executor.submit(_parse_file_in_thread, file_path)
+                for file_path in pending
+            }
+            for file_path in python_files:
+                future = futures.get(file_path)
+                if future is None:
+                    yield from self._iter_single_file_symbols(file_path)
+                    continue
+
+                try:
+                    mtime, tree, source_bytes = future.result()
+                    self._cache.set_file_cache(file_path, mtime, source_bytes)
+                except Exception as e:
+                    _get_logger().error(f"解析文件失败 {file_path}: {e}")
+                    continue
+                self._tree_cache[file_path] = (mtime, tree, source_bytes)
+                yield from self._extract_file_symbols(tree, source_bytes, file_path)
+
+    def _has_cached_source(self, file_path: str) -> bool:
+        """文件是否已在内存或 SQLite 中缓存（无需交给工作进程）"""
+        if file_path in self._tree_cache:
+            return True
+        try:
+            mtime = os.stat(file_path).st_mtime
+        except OSError:
+            return True
+        return self._cache.is_file_cache_valid(file_path, mtime)
+
+    def _iter_single_file_symbols(
+        self, file_path: Union[str, Path]
+    ) -> Generator[Dict[str, Any], None, None]:
+        """在主进程中解析单个文件，逐个产出符号数据字典"""
+        result = self._parse_file_cached(file_path)
+        if not result:
+            return
 
-            # 批量写入
-            if len(batch_symbols) >= batch_size:
-                self._cache.add_symbols_batch(batch_symbols)
-                batch_symbols = []
+        tree, source_bytes = result
+        yield from self._extract_file_symbols(tree, source_bytes, str(file_path))
 
-        # 写入剩余的符号
-        if batch_symbols:
-            self._cache.add_symbols_batch(batch_symbols)
+    def _extract_file_symbols(
+        self, tree: Tree, source_bytes: bytes, file_str: str
+    ) -> Generator[Dict[str, Any], None, None]:
+        """从已解析的 Tree 中提取符号，逐个产出符号数据字典"""
+        classes, functions = self.parser.find_symbols(tree, source_bytes, file_str)
 
-        self._cache.set_indexed(True)
-        _get_logger().info(f"索引构建完成: {class_count} 个类, {func_count} 个函数")
+        # 先索引类，再索引函数
+        for symbol in classes:
+            yield _parsed_symbol_to_index_dict(symbol)
+        for symbol in functions:
+            yield _parsed_symbol_to_index_dict(symbol)
 
     def find_symbol(
         self,
@@ -589,7 +1321,9 @@ class ProjectParser:
         self.build_index()
 
         # 从 SQLite 缓存查询
-        results = self._cache.find_symbols_by_name(name, symbol_type, file_hint)
+        results = self._cache.find_symbols_by_name(
+            name, symbol_type, file_hint, limit=1
+        )
 
         if not results:
             return None
@@ -609,12 +1343,12 @@ class ProjectParser:
         """获取文件中的所有类和函数"""
         path = Path(file_path)
 
-        # 检查文件是否存在
-        if not path.exists():
+        # 检查文件是否存在（一次 stat 同时取得 mtime）
+        try:
+            mtime = path.stat().st_mtime
+        except OSError:
             return [], []
 
-        mtime = path.stat().st_mtime
-
         # 如果文件缓存有效，优先从 SQLite 获取
         if self._cache.is_file_cache_valid(str(path), mtime):
             symbols = self._cache.find_symbols_by_file(str(path))
@@ -637,36 +1371,95 @@ class ProjectParser:
             return [], []
 
         tree, source_bytes = result
-        classes = self.parser.find_classes(tree, source_bytes, file_path)
-        functions = self.parser.find_functions(tree, source_bytes, file_path)
-
-        # 更新 SQLite 缓存中的符号
-        self._cache.remove_symbols_by_file(file_path)
-        symbols_to_cache = [_parsed_symbol_to_dict(s) for s in classes + functions]
-        if symbols_to_cache:
+        classes, functions = self.parser.find_symbols(tree, source_bytes, file_path)
+
+        # 更新 SQLite 缓存中的符号（删除与写入在同一事务中完成）
+        symbols_to_cache = [
+            _parsed_symbol_to_index_dict(s) for s in classes + functions
+        ]
+        self._outline_cache.clear()
+        with self._cache.bulk_write():
+            self._cache.remove_symbols_by_file(file_path)
             self._cache.add_symbols_batch(symbols_to_cache)
 
         return classes, functions
 
+    def find_symbol_in_file(self, name: str, file_path: str) -> Optional[ParsedSymbol]:
+        """
+        在指定文件中查找符号（类优先于函数）
+
+        文件缓存有效且文件已有索引时，直接按名称和文件查询 SQLite，
+        不再加载并转换文件中的全部符号；否则回退到 get_file_symbols。
+        """
+        path = Path(file_path)
+        try:
+            mtime = path.stat().st_mtime
+        except OSError:
+            return None
+
+        file_str = str(path)
+        if self._cache.is_file_cache_valid(file_str, mtime):
+            data = self._cache.find_symbol_in_file(name, file_str)
+            if data is not None:
+                return _parsed_symbol_from_dict(data)
+            if self._cache.has_symbols_in_file(file_str):
+                return None
+
+        classes, functions = self.get_file_symbols(file_path)
+        return next((s for s in classes + functions if s.name == name), None)
+
     def invalidate_file(self, file_path: str):
         """
         使文件缓存失效
 
         当文件被修改时调用此方法。
         """
-        self._cache.remove_file_cache(file_path)
-        self._cache.remove_symbols_by_file(file_path)
-        # 清除内存中的 Tree 缓存
-        if file_path in self._tree_cache:
-            del self._tree_cache[file_path]
+        self._outline_cache.clear()
+        with self._cache.bulk_write():
+            self._cache.remove_file_cache(file_path)
+            self._cache.remove_symbols_by_file(file_path)
+        # 内存中的 Tree 不直接丢弃：将 mtime 置空使其不再被当作有效缓存，
+        # 但保留旧 Tree 和源代码，下次解析时作为增量解析的基础
+        cached = self._tree_cache.get(file_path)
+        if cached is not None:
+            self._tree_cache[file_path] = (None, cached[1], cached[2])
         _get_logger().debug(f"已使文件缓存失效: {file_path}")
 
     def clear_cache(self):
         """清空所有缓存"""
         self._cache.clear_all()
         self._tree_cache.clear()
+        self._outline_cache.clear()
+        self._index_ready = False
         _get_logger().info("已清空所有缓存")
 
+    def close(self):
+        """释放内存中的缓存并关闭 SQLite 连接（之后再次使用时会重新打开连接）"""
+        self._tree_cache.clear()
+        self._outline_cache.clear()
+        self._cache.close()
+
+    def get_symbol_outline(
+        self, symbol_type: Optional[str] = None
+    ) -> List[Tuple[str, str, int, Optional[str]]]:
+        """
+        获取项目中所有符号的概要，不构造 ParsedSymbol
+
+        Args:
+            symbol_type: 可选，"class" 或 "function"
+
+        结果按类型缓存在内存中，索引未变化时重复调用不再查询 SQLite。
+
+        Returns:
+            (name, file_path, start_line, host_class) 列表
+        """
+        self.build_index()
+        outline = self._outline_cache.get(symbol_type)
+        if outline is None:
+            outline = self._cache.get_symbol_outline(symbol_type)
+            self._outline_cache[symbol_type] = outline
+        return list(outline)
+
     def get_all_symbols(self, symbol_type: Optional[str] = None) -> List[ParsedSymbol]:
         """
         获取项目中的所有符号
@@ -678,5 +1471,7 @@ class ProjectParser:
             ParsedSymbol 列表
         """
         self.build_index()
-        results = self._cache.get_all_symbols(symbol_type)
-        return [_parsed_symbol_from_dict(r) for r in results]
+        return [
+            _parsed_symbol_from_dict(r)
+            for r in self._cache.iter_all_symbols(symbol_type)
+        ]
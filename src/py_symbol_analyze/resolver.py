@@ -5,9 +5,13 @@
 """
 
 import os
+import re
 import sys
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, Generator, List, Optional, Tuple, Union
 
 import jedi
 
@@ -40,6 +44,136 @@ def _get_logger():
     return get_logger("py_symbol_analyze.resolver")
 
 
+# 解析依赖时跳过的内置类型和常见名称
+_SKIPPED_CALLEES = frozenset(
+    {
+        "str",
+        "int",
+        "float",
+        "bool",
+        "list",
+        "dict",
+        "set",
+        "tuple",
+        "None",
+        "True",
+        "False",
+        "print",
+        "len",
+        "range",
+        "enumerate",
+        "zip",
+        "map",
+        "filter",
+        "super",
+        "type",
+        "isinstance",
+        "hasattr",
+        "getattr",
+        "setattr",
+        "Exception",
+        "ValueError",
+        "TypeError",
+        "KeyError",
+        "IndexError",
+        "AttributeError",
+        "RuntimeError",
+    }
+)
+
+# 解析 super() 依赖时跳过的常见内置基类
+_SKIPPED_BASE_CLASSES = frozenset({"object", "ABC", "Generic", "Protocol"})
+
+
+def _line_starts(source_code: str) -> List[int]:
+    """计算每一行起始位置的字符偏移"""
+    return [0] + [m.end() for m in re.finditer("\n", source_code)]
+
+
+# 复用的 jedi Script 数量上限（每个 Script 持有整段源代码的解析结果），
+# 源代码位置表的缓存数量与之相同
+_JEDI_SCRIPT_CACHE_SIZE = 16
+
+# jedi / parso 的解析器缓存和 jedi.settings 是进程级共享状态，不是线程安全的；
+# 所有 jedi 调用都在这把锁内执行，解析和 SQLite 查询仍可在多个线程中并行
+_JEDI_LOCK = threading.Lock()
+
+# 缓存的分析结果数量上限
+_ANALYSIS_CACHE_SIZE = 256
+
+AnalysisResult = Union[ClassAnalysisResult, FunctionAnalysisResult]
+# 分析结果缓存的键：(类型, 名称, 文件提示, 所属类)
+AnalysisKey = Tuple[str, str, Optional[str], Optional[str]]
+# 分析结果涉及的文件及其 mtime
+FileStamps = Tuple[Tuple[str, Optional[float]], ...]
+AnalysisEntry = Tuple[FileStamps, AnalysisResult]
+# 源代码位置表缓存的值：(源代码, 行起始偏移, 标识符位置)
+SourcePositions = Tuple[str, List[int], Dict[str, List[Tuple[int, int]]]]
+
+
+def _file_mtime(file_path: str) -> Optional[float]:
+    """返回文件的 mtime，文件不存在时返回 None"""
+    try:
+        return os.stat(file_path).st_mtime
+    except OSError:
+        return None
+
+
+# 标识符（及其他由单词字符组成的片段）
+_WORD_PATTERN = re.compile(r"\w+")
+
+
+def _identifier_positions(
+    source_code: str, line_starts: List[int]
+) -> Dict[str, List[Tuple[int, int]]]:
+    """
+    一次扫描源代码，记录每个标识符出现的位置 (行号（从 1 开始）, 列号)
+
+    每个标识符每行只记录第一处。同一符号的所有 callee 共用这一次扫描
+    （结果由 DependencyResolver 按文件缓存），之后定位每个 callee
+    只需一次字典查找，不再各自扫描整段源代码。
+    """
+    positions: Dict[str, List[Tuple[int, int]]] = {}
+    for match in _WORD_PATTERN.finditer(source_code):
+        start = match.start()
+        line = bisect_right(line_starts, start) - 1
+        found = positions.setdefault(match.group(), [])
+        if not found or found[-1][0] != line + 1:
+            found.append((line + 1, start - line_starts[line]))
+    return positions
+
+
+def _iter_symbol_positions(
+    symbol_name: str,
+    source_code: str,
+    line_starts: Optional[List[int]] = None,
+    identifier_positions: Optional[Dict[str, List[Tuple[int, int]]]] = None,
+) -> Generator[Tuple[int, int], None, None]:
+    """
+    按出现顺序产出符号在源代码中的位置 (行号（从 1 开始）, 列号)
+
+    只匹配完整的标识符（不会在 FooBar 中匹配 Foo），同一行只产出第一处。
+    简单标识符从 _identifier_positions 的结果中直接查找；
+    带点号的名称（如 module.Base）用正则单独扫描。
+    未传入已计算的位置表时现场计算。
+    """
+    if line_starts is None:
+        line_starts = _line_starts(source_code)
+    if _WORD_PATTERN.fullmatch(symbol_name):
+        if identifier_positions is None:
+            identifier_positions = _identifier_positions(source_code, line_starts)
+        yield from identifier_positions.get(symbol_name, ())
+        return
+
+    pattern = re.compile(r"(?<!\w)" + re.escape(symbol_name) + r"(?!\w)")
+    last_line = -1
+    for match in pattern.finditer(source_code):
+        line = bisect_right(line_starts, match.start()) - 1
+        if line != last_line:
+            last_line = line
+            yield line + 1, match.start() - line_starts[line]
+
+
 class DependencyResolver:
     """依赖解析器"""
 
@@ -53,10 +187,24 @@ class DependencyResolver:
         """
         self.project_root = Path(project_root).resolve()
         self.project_parser = ProjectParser(project_root, cache_dir=cache_dir)
+        # 导入路径解析结果缓存：{(导入路径, 相对导入的当前目录或 None): 文件路径}
+        # 同一导入在项目中大量重复出现，缓存后不再重复检查文件系统
+        self._import_path_cache: Dict[Tuple[str, Optional[str]], Optional[str]] = {}
+        # jedi Project 只创建一次，所有 Script 共用
+        self._jedi_project = jedi.Project(path=str(self.project_root))
+        # 最近使用的 jedi Script：{文件路径: (源代码, Script)}，按使用顺序排列
+        # 同一符号的多个 callee 在同一段源代码上解析，复用 Script 避免重复解析
+        self._jedi_scripts: "OrderedDict[str, Tuple[str, jedi.Script]]" = OrderedDict()
+        # 最近使用的源代码位置表：{文件路径: (源代码, 行起始偏移, 标识符位置)}
+        # 与 jedi Script 一样每个文件只保留最后一段源代码，随分析器一起释放
+        self._source_positions: "OrderedDict[str, SourcePositions]" = OrderedDict()
+        # 分析结果缓存：{分析键: (涉及文件的 mtime, 结果)}，按使用顺序排列
+        # 符号所在文件和依赖文件的 mtime 都未变化时直接复用结果
+        self._analysis_cache: "OrderedDict[AnalysisKey, AnalysisEntry]" = OrderedDict()
         # 添加项目路径到 sys.path 以便 jedi 能正确解析
         if str(self.project_root) not in sys.path:
             sys.path.insert(0, str(self.project_root))
-        _get_logger().debug(f"初始化依赖解析器，项目路径: {self.project_root}")
+        _get_logger().debug("初始化依赖解析器，项目路径: %s", self.project_root)
 
     def _is_valid_source_file(self, file_path: str) -> bool:
         """
@@ -81,7 +229,7 @@ class DependencyResolver:
 
         # 过滤 .pyi 文件
         if path.suffix == ".pyi":
-            _get_logger().debug(f"过滤 .pyi 文件: {file_path}")
+            _get_logger().debug("过滤 .pyi 文件: %s", file_path)
             return False
 
         # 过滤非 .py 文件
@@ -96,7 +244,7 @@ class DependencyResolver:
         try:
             path.resolve().relative_to(self.project_root)
         except ValueError:
-            _get_logger().debug(f"过滤项目外文件: {file_path}")
+            _get_logger().debug("过滤项目外文件: %s", file_path)
             return False
 
         # 过滤常见的缓存/虚拟环境目录
@@ -113,7 +261,7 @@ class DependencyResolver:
         ]
         for pattern in excluded_patterns:
             if pattern in path_str:
-                _get_logger().debug(f"过滤缓存/环境目录文件: {file_path}")
+                _get_logger().debug("过滤缓存/环境目录文件: %s", file_path)
                 return False
 
         return True
@@ -124,23 +272,43 @@ class DependencyResolver:
         """
         解析导入路径，返回实际文件路径
 
+        结果按 (导入路径, 当前目录) 缓存；绝对导入只与项目根目录有关，
+        不区分当前文件，同一导入在不同文件中共享缓存。
+
         Args:
             import_path: 如 "jiuwen.common.store.obs"
             current_file: 当前文件路径，用于解析相对导入
         """
+        current_dir = (
+            str(Path(current_file).parent) if import_path.startswith(".") else None
+        )
+        key = (import_path, current_dir)
+        try:
+            return self._import_path_cache[key]
+        except KeyError:
+            pass
+
+        file_path = self._find_import_file(import_path, current_dir)
+        self._import_path_cache[key] = file_path
+        return file_path
+
+    def _find_import_file(
+        self, import_path: str, current_dir: Optional[str]
+    ) -> Optional[str]:
+        """
+        在文件系统中查找导入路径对应的文件
+
+        Args:
+            import_path: 导入路径
+            current_dir: 相对导入时为当前文件所在目录，绝对导入时为 None
+        """
         # 处理相对导入
-        if import_path.startswith("."):
-            current_dir = Path(current_file).parent
+        if current_dir is not None:
             # 计算相对层级
-            level = 0
-            for char in import_path:
-                if char == ".":
-                    level += 1
-                else:
-                    break
+            level = len(import_path) - len(import_path.lstrip("."))
 
             # 向上移动目录
-            base_dir = current_dir
+            base_dir = Path(current_dir)
             for _ in range(level - 1):
                 base_dir = base_dir.parent
 
@@ -177,6 +345,91 @@ class DependencyResolver:
 
         return None
 
+    def clear_import_cache(self):
+        """
+        清空导入路径解析缓存、复用的 jedi Script、源代码位置表和分析结果缓存
+
+        文件增删或重建索引后调用。
+        """
+        self._import_path_cache.clear()
+        self._jedi_scripts.clear()
+        self._source_positions.clear()
+        self._analysis_cache.clear()
+
+    def _cached_analysis(
+        self,
+        key: AnalysisKey,
+        analyze: Callable[[], Optional[AnalysisResult]],
+    ) -> Optional[AnalysisResult]:
+        """
+        带缓存地执行一次分析
+
+        结果记录符号所在文件及所有依赖文件的 mtime，再次查询时这些文件
+        都未变化则返回缓存结果的副本；最多保留 _ANALYSIS_CACHE_SIZE 个结果。
+        """
+        entry = self._analysis_cache.get(key)
+        if entry is not None:
+            stamps, result = entry
+            if all(_file_mtime(path) == mtime for path, mtime in stamps):
+                self._analysis_cache.move_to_end(key)
+                _get_logger().debug("使用缓存的分析结果: %s", key[1])
+                return result.model_copy(deep=True)
+            del self._analysis_cache[key]
+
+        result = analyze()
+        if result is not None:
+            paths = dict.fromkeys([result.file_path, *result.depends_path])
+            stamps = tuple((path, _file_mtime(path)) for path in paths)
+            self._analysis_cache[key] = (stamps, result.model_copy(deep=True))
+            if len(self._analysis_cache) > _ANALYSIS_CACHE_SIZE:
+                self._analysis_cache.popitem(last=False)
+        return result
+
+    def _get_jedi_script(self, source_code: str, file_path: str) -> jedi.Script:
+        """
+        获取源代码对应的 jedi Script
+
+        创建 Script 会解析整段源代码，是 jedi 解析中开销最大的部分；
+        最近使用过的源代码直接复用已有的 Script，最多保留
+        _JEDI_SCRIPT_CACHE_SIZE 个文件。
+
+        jedi 按路径缓存模块，为同一路径创建新的 Script 后，该路径上旧的
+        Script 不再能正确解析，因此每个文件路径只保留最后创建的一个。
+        """
+        cached = self._jedi_scripts.get(file_path)
+        if cached is not None and cached[0] == source_code:
+            self._jedi_scripts.move_to_end(file_path)
+            return cached[1]
+
+        script = jedi.Script(source_code, path=file_path, project=self._jedi_project)
+        self._jedi_scripts[file_path] = (source_code, script)
+        self._jedi_scripts.move_to_end(file_path)
+        if len(self._jedi_scripts) > _JEDI_SCRIPT_CACHE_SIZE:
+            self._jedi_scripts.popitem(last=False)
+        return script
+
+    def _get_source_positions(
+        self, source_code: str, file_path: str
+    ) -> Tuple[List[int], Dict[str, List[Tuple[int, int]]]]:
+        """
+        获取源代码的行起始偏移和标识符位置
+
+        同一符号的多个 callee 依次在同一段源代码中定位，按文件路径缓存，
+        源代码不变时只计算一次。
+        """
+        cached = self._source_positions.get(file_path)
+        if cached is not None and cached[0] == source_code:
+            self._source_positions.move_to_end(file_path)
+            return cached[1], cached[2]
+
+        line_starts = _line_starts(source_code)
+        positions = _identifier_positions(source_code, line_starts)
+        self._source_positions[file_path] = (source_code, line_starts, positions)
+        self._source_positions.move_to_end(file_path)
+        if len(self._source_positions) > _JEDI_SCRIPT_CACHE_SIZE:
+            self._source_positions.popitem(last=False)
+        return line_starts, positions
+
     def _use_jedi_to_resolve(
         self,
         symbol_name: str,
@@ -192,19 +445,19 @@ class DependencyResolver:
             List of (name, file_path) tuples
         """
         results = []
-        try:
-            script = jedi.Script(
-                source_code,
-                path=file_path,
-                project=jedi.Project(path=str(self.project_root)),
-            )
+        with _JEDI_LOCK:
+            try:
+                script = self._get_jedi_script(source_code, file_path)
+                line_starts, positions = self._get_source_positions(
+                    source_code, file_path
+                )
 
-            # 在源代码中查找符号的使用位置
-            for i, line_content in enumerate(source_code.split("\n"), 1):
-                col = line_content.find(symbol_name)
-                if col >= 0:
+                # 在源代码中查找符号的使用位置（每行只尝试第一处）
+                for line, col in _iter_symbol_positions(
+                    symbol_name, source_code, line_starts, positions
+                ):
                     try:
-                        definitions = script.goto(i, col)
+                        definitions = script.goto(line, col)
                         for d in definitions:
                             if d.module_path:
                                 module_path_str = str(d.module_path)
@@ -217,8 +470,8 @@ class DependencyResolver:
                     if results:
                         break
 
-        except Exception:
-            pass
+            except Exception:
+                pass
 
         return results
 
@@ -229,7 +482,9 @@ class DependencyResolver:
         遍历符号的 callees，尝试找到每个被调用符号的定义。
         如果是方法且调用了 super()，还会解析父类的依赖。
         """
-        _get_logger().debug(f"解析符号依赖: {symbol.name}, callees: {symbol.callees}")
+        _get_logger().debug(
+            "解析符号依赖: %s, callees: %s", symbol.name, symbol.callees
+        )
         dependencies = []
         seen_symbols = set()
 
@@ -241,45 +496,10 @@ class DependencyResolver:
                     seen_symbols.add(dep.name)
                     dependencies.append(dep)
 
+        # callees 在解析时已去重，只需跳过已作为父类依赖加入的名称
         for callee_name in symbol.callees:
-            if callee_name in seen_symbols:
-                continue
-            seen_symbols.add(callee_name)
-
             # 跳过内置类型和常见名称
-            if callee_name in (
-                "str",
-                "int",
-                "float",
-                "bool",
-                "list",
-                "dict",
-                "set",
-                "tuple",
-                "None",
-                "True",
-                "False",
-                "print",
-                "len",
-                "range",
-                "enumerate",
-                "zip",
-                "map",
-                "filter",
-                "super",
-                "type",
-                "isinstance",
-                "hasattr",
-                "getattr",
-                "setattr",
-                "Exception",
-                "ValueError",
-                "TypeError",
-                "KeyError",
-                "IndexError",
-                "AttributeError",
-                "RuntimeError",
-            ):
+            if callee_name in seen_symbols or callee_name in _SKIPPED_CALLEES:
                 continue
 
             dep = self._resolve_single_dependency(callee_name, symbol)
@@ -313,7 +533,9 @@ class DependencyResolver:
         )
         if not host_class_symbol:
             _get_logger().debug(
-                f"未找到方法 {method_symbol.name} 的所属类 {method_symbol.host_class}"
+                "未找到方法 %s 的所属类 %s",
+                method_symbol.name,
+                method_symbol.host_class,
             )
             return dependencies
 
@@ -323,11 +545,11 @@ class DependencyResolver:
             simple_name = base_class_name.split(".")[-1]
 
             # 跳过常见的内置基类
-            if simple_name in ("object", "ABC", "Generic", "Protocol"):
+            if simple_name in _SKIPPED_BASE_CLASSES:
                 continue
 
             _get_logger().debug(
-                f"解析父类依赖: {base_class_name} (来自 {method_symbol.host_class})"
+                "解析父类依赖: %s (来自 %s)", base_class_name, method_symbol.host_class
             )
 
             # 尝试解析父类
@@ -370,7 +592,7 @@ class DependencyResolver:
 
             # 导入路径解析失败，尝试使用导入路径信息进行更精确的全局查找
             _get_logger().debug(
-                f"导入路径 {import_path} 直接解析失败，尝试带路径提示的全局查找"
+                "导入路径 %s 直接解析失败，尝试带路径提示的全局查找", import_path
             )
             # 将导入路径转换为文件路径提示（如 a.b.c.DBUtil -> a/b/c）
             # 使用正斜杠以便跨平台匹配（路径比较时会统一格式）
@@ -464,64 +686,76 @@ class DependencyResolver:
     def _find_symbol_in_file(
         self, symbol_name: str, file_path: str
     ) -> Optional[ParsedSymbol]:
-        """在指定文件中查找符号"""
-        classes, functions = self.project_parser.get_file_symbols(file_path)
+        """在指定文件中查找符号（先查找类，再查找函数）"""
+        return self.project_parser.find_symbol_in_file(symbol_name, file_path)
 
-        # 先查找类
-        for cls in classes:
-            if cls.name == symbol_name:
-                return cls
+    def _build_depends(
+        self, dependencies: List[Dependency]
+    ) -> Tuple[List[str], List[str]]:
+        """
+        构建分析结果中的依赖内容和依赖路径
 
-        # 再查找函数
-        for func in functions:
-            if func.name == symbol_name:
-                return func
+        depends 和 depends_path 一一对应，不去重。依赖是方法时返回其所属类的
+        完整内容；同一个类的多个方法只查找一次所属类。
+        """
+        depends = []
+        depends_path = []
+        host_contents: Dict[Tuple[str, str], Optional[str]] = {}
 
-        return None
+        for dep in dependencies:
+            if not (dep.content and dep.file_path):
+                continue
+            content = dep.content
+            if dep.host_class:
+                key = (dep.file_path, dep.host_class)
+                if key not in host_contents:
+                    host_class_symbol = self._find_symbol_in_file(
+                        dep.host_class, dep.file_path
+                    )
+                    host_contents[key] = (
+                        host_class_symbol.content if host_class_symbol else None
+                    )
+                content = host_contents[key] or content
+            depends.append(content)
+            depends_path.append(dep.file_path)
+
+        return depends, depends_path
 
     def analyze_class(
         self, class_name: str, file_path: Optional[str] = None
     ) -> Optional[ClassAnalysisResult]:
         """
-        分析类及其依赖
+        分析类及其依赖（相关文件未变化时复用上次的结果）
 
         Args:
             class_name: 类名
             file_path: 可选，指定文件路径
         """
-        _get_logger().info(f"分析类: {class_name}, 文件提示: {file_path}")
+        return self._cached_analysis(
+            ("class", class_name, file_path, None),
+            lambda: self._analyze_class(class_name, file_path),
+        )
+
+    def _analyze_class(
+        self, class_name: str, file_path: Optional[str]
+    ) -> Optional[ClassAnalysisResult]:
+        """分析类及其依赖（不使用缓存）"""
+        _get_logger().info("分析类: %s, 文件提示: %s", class_name, file_path)
         # 查找类定义
         symbol = self.project_parser.find_symbol(
             class_name, symbol_type="class", file_hint=file_path
         )
         if not symbol:
-            _get_logger().warning(f"未找到类: {class_name}")
+            _get_logger().warning("未找到类: %s", class_name)
             return None
-        _get_logger().debug(f"找到类定义位置: {symbol.file_path}:{symbol.start_line}")
+        _get_logger().debug(
+            "找到类定义位置: %s:%s", symbol.file_path, symbol.start_line
+        )
 
         # 解析依赖
         dependencies = self.resolve_dependencies(symbol)
 
-        # 构建结果（depends 和 depends_path 一一对应，不去重）
-        depends = []
-        depends_path = []
-
-        for dep in dependencies:
-            if dep.content and dep.file_path:
-                # 如果依赖是方法，获取其所属类的完整内容
-                if dep.host_class:
-                    host_class_symbol = self._find_symbol_in_file(
-                        dep.host_class, dep.file_path
-                    )
-                    if host_class_symbol:
-                        depends.append(host_class_symbol.content)
-                        depends_path.append(dep.file_path)
-                    else:
-                        depends.append(dep.content)
-                        depends_path.append(dep.file_path)
-                else:
-                    depends.append(dep.content)
-                    depends_path.append(dep.file_path)
+        depends, depends_path = self._build_depends(dependencies)
 
         return ClassAnalysisResult(
             class_content=symbol.content,
@@ -537,15 +771,56 @@ class DependencyResolver:
         host_class: Optional[str] = None,
     ) -> Optional[FunctionAnalysisResult]:
         """
-        分析函数及其依赖
+        分析函数及其依赖（相关文件未变化时复用上次的结果）
 
         Args:
             function_name: 函数名
             file_path: 可选，指定文件路径
             host_class: 可选，如果是类方法，指定类名
         """
+        return self._cached_analysis(
+            ("func", function_name, file_path, host_class),
+            lambda: self._analyze_function(function_name, file_path, host_class),
+        )
+
+    def resolve_many(
+        self, queries: List[Tuple[str, str, Optional[str]]]
+    ) -> List[Optional[Union[ClassAnalysisResult, FunctionAnalysisResult]]]:
+        """
+        批量分析多个符号
+
+        索引只检查一次，各查询之间共享导入路径缓存、jedi Script 和分析结果缓存。
+
+        Args:
+            queries: (符号名, 类型, 所属类) 列表，类型为 "class" 或 "func"，
+                所属类只对函数有效
+
+        Returns:
+            与 queries 一一对应的分析结果，未找到的符号为 None
+        """
+        self.project_parser.build_index()
+        results: List[Optional[Union[ClassAnalysisResult, FunctionAnalysisResult]]] = []
+        for name, kind, host_class in queries:
+            if kind == "class":
+                results.append(self.analyze_class(name))
+            elif kind == "func":
+                results.append(self.analyze_function(name, host_class=host_class))
+            else:
+                raise ValueError(f"Unknown symbol kind: {kind}")
+        return results
+
+    def _analyze_function(
+        self,
+        function_name: str,
+        file_path: Optional[str],
+        host_class: Optional[str],
+    ) -> Optional[FunctionAnalysisResult]:
+        """分析函数及其依赖（不使用缓存）"""
         _get_logger().info(
-            f"分析函数: {function_name}, 文件提示: {file_path}, 所属类: {host_class}"
+            "分析函数: %s, 文件提示: %s, 所属类: %s",
+            function_name,
+            file_path,
+            host_class,
         )
         # 查找函数定义
         candidates = self.project_parser.find_all_symbols(function_name)
@@ -562,35 +837,18 @@ class DependencyResolver:
             ]
 
         if not candidates:
-            _get_logger().warning(f"未找到函数: {function_name}")
+            _get_logger().warning("未找到函数: %s", function_name)
             return None
 
         symbol = candidates[0]
-        _get_logger().debug(f"找到函数定义位置: {symbol.file_path}:{symbol.start_line}")
+        _get_logger().debug(
+            "找到函数定义位置: %s:%s", symbol.file_path, symbol.start_line
+        )
 
         # 解析依赖
         dependencies = self.resolve_dependencies(symbol)
 
-        # 构建结果（depends 和 depends_path 一一对应，不去重）
-        depends = []
-        depends_path = []
-
-        for dep in dependencies:
-            if dep.content and dep.file_path:
-                # 如果依赖是方法，获取其所属类的完整内容
-                if dep.host_class:
-                    host_class_symbol = self._find_symbol_in_file(
-                        dep.host_class, dep.file_path
-                    )
-                    if host_class_symbol:
-                        depends.append(host_class_symbol.content)
-                        depends_path.append(dep.file_path)
-                    else:
-                        depends.append(dep.content)
-                        depends_path.append(dep.file_path)
-                else:
-                    depends.append(dep.content)
-                    depends_path.append(dep.file_path)
+        depends, depends_path = self._build_depends(dependencies)
 
         return FunctionAnalysisResult(
             function_content=symbol.content,
@@ -617,7 +875,7 @@ class SymbolAnalyzer:
         self.project_root = project_root
         self.cache_dir = cache_dir
         self.resolver = DependencyResolver(project_root, cache_dir=cache_dir)
-        _get_logger().info(f"符号分析器初始化完成，项目路径: {project_root}")
+        _get_logger().info("符号分析器初始化完成，项目路径: %s", project_root)
 
     def query_class(
         self, class_name: str, file_path: Optional[str] = None
@@ -661,16 +919,36 @@ class SymbolAnalyzer:
 
     def rebuild_index(self):
         """重建符号索引"""
+        self.resolver.clear_import_cache()
         self.resolver.project_parser.build_index(force=True)
 
+    def refresh_index(self) -> Tuple[int, int]:
+        """
+        增量更新符号索引，只重新索引新增、修改或删除的文件
+
+        Returns:
+            (重新索引的文件数, 移除的文件数)
+        """
+        result = self.resolver.project_parser.refresh_index()
+        if any(result):
+            self.resolver.clear_import_cache()
+        return result
+
     def clear_cache(self):
         """清空所有缓存（包括 SQLite 缓存）"""
+        self.resolver.clear_import_cache()
         self.resolver.project_parser.clear_cache()
 
+    def close(self):
+        """释放分析器持有的内存缓存和 SQLite 连接"""
+        self.resolver.clear_import_cache()
+        self.resolver.project_parser.close()
+
     def invalidate_file(self, file_path: str):
         """
         使指定文件的缓存失效
 
         当文件被修改时调用此方法。
         """
+        self.resolver.clear_import_cache()
         self.resolver.project_parser.invalidate_file(file_path)
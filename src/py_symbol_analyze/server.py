@@ -8,8 +8,15 @@ MCP Server 主入口
 """
 
 import argparse
+import asyncio
+import functools
 import json
-from typing import Optional
+import os
+import threading
+import weakref
+from collections import OrderedDict
+from json.encoder import encode_basestring
+from typing import Any, Awaitable, Callable, Optional, TypeVar
 
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
@@ -24,12 +31,37 @@ from .cache import set_cache_dir
 from .logger import get_logger, set_log_dir
 from .resolver import SymbolAnalyzer
 
+try:
+    # 可选依赖：orjson 在 C 层完成序列化，比标准库 json 快得多
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
 # 默认配置
 DEFAULT_HOST = "127.0.0.1"
 DEFAULT_PORT = 8000
+# 同时保留的项目分析器数量
+DEFAULT_MAX_PROJECTS = 4
+
+# 各项目的分析器实例：{项目根目录的真实路径: 分析器}，按使用顺序排列
+_analyzers: "OrderedDict[str, SymbolAnalyzer]" = OrderedDict()
+_analyzers_lock = threading.Lock()
+_max_projects = DEFAULT_MAX_PROJECTS
+# 每个分析器一把锁：分析器内部的缓存和 SQLite 连接不是线程安全的，
+# 同一项目的请求在工作线程中依次执行；不同项目的解析和索引查询可以并行，
+# jedi 的进程级共享状态由 resolver 模块中的全局锁串行保护
+_analyzer_locks: "weakref.WeakKeyDictionary[SymbolAnalyzer, threading.Lock]" = (
+    weakref.WeakKeyDictionary()
+)
+# 同时在工作线程中执行的分析任务数上限
+_MAX_CONCURRENT_ANALYSES = os.cpu_count() or 1
+# 每个事件循环各自的信号量：asyncio.Semaphore 绑定首次使用它的事件循环，
+# 在事件循环中首次需要时创建，同一进程中多次 asyncio.run 互不影响
+_analysis_semaphores: "weakref.WeakKeyDictionary[Any, asyncio.Semaphore]" = (
+    weakref.WeakKeyDictionary()
+)
 
-# 全局分析器实例
-_analyzer: Optional[SymbolAnalyzer] = None
+T = TypeVar("T")
 # 全局缓存目录
 _cache_dir: Optional[str] = None
 
@@ -39,6 +71,41 @@ def _get_logger():
     return get_logger("py_symbol_analyze.server")
 
 
+def _dumps(obj) -> str:
+    """
+    将工具结果序列化为紧凑、保留非 ASCII 字符的 JSON 字符串
+
+    工具结果由程序读取，不做缩进，减少传输的字节数。
+    """
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def _json_text(value: Any) -> str:
+    """将文本转义为可以直接放入 JSON 字符串字面量中的内容（不含引号）"""
+    return encode_basestring(str(value))[1:-1]
+
+
+# 固定格式的错误和状态返回值，与 _dumps 的输出格式一致；
+# 导入时生成一次，调用时只需填入转义后的动态部分
+_MISSING_PARAM_JSON = (
+    f'{{"error":"Missing required parameter: %s","code":{INVALID_PARAMS}}}'
+)
+_INTERNAL_ERROR_JSON = f'{{"error":"%s","code":{INTERNAL_ERROR}}}'
+_CLASS_NOT_FOUND_JSON = (
+    '{"error":"Class \'%s\' not found in project",'
+    '"suggestion":"Please check the class name or try rebuilding the index '
+    'with rebuild_index tool"}'
+)
+_FUNCTION_NOT_FOUND_JSON = (
+    '{"error":"Function \'%s\' not found in project",'
+    '"suggestion":"Please check the function name or try rebuilding the index '
+    'with rebuild_index tool"}'
+)
+_INDEX_REBUILT_JSON = '{"status":"success","message":"Index rebuilt for project: %s"}'
+
+
 def set_global_cache_dir(cache_dir: Optional[str]) -> str:
     """
     设置全局缓存目录
@@ -54,26 +121,109 @@ def set_global_cache_dir(cache_dir: Optional[str]) -> str:
     return _cache_dir
 
 
+def set_max_projects(max_projects: int):
+    """
+    设置同时保留分析器的项目数量
+
+    Args:
+        max_projects: 项目数量，至少为 1
+    """
+    global _max_projects
+    evicted = []
+    with _analyzers_lock:
+        _max_projects = max(1, max_projects)
+        while len(_analyzers) > _max_projects:
+            evicted.append(_analyzers.popitem(last=False))
+    for project_root, analyzer in evicted:
+        _close_analyzer(project_root, analyzer)
+
+
+def _close_analyzer(project_root: str, analyzer: SymbolAnalyzer):
+    """
+    关闭被淘汰的分析器
+
+    在该分析器的锁内关闭，不会打断仍在使用它的请求。调用方可能在事件循环中，
+    锁被占用时交给后台线程等待请求结束后再关闭；之后仍持有该分析器的请求
+    会重新打开 SQLite 连接，不会出错。
+    """
+    _get_logger().info("释放最久未使用的分析器，项目路径: %s", project_root)
+    lock = _analyzer_locks[analyzer]
+    if lock.acquire(blocking=False):
+        try:
+            analyzer.close()
+        finally:
+            lock.release()
+        return
+
+    def close_when_idle():
+        with lock:
+            analyzer.close()
+
+    threading.Thread(target=close_when_idle, daemon=True).start()
+
+
 def get_analyzer(project_root: str) -> SymbolAnalyzer:
-    """获取或创建分析器实例"""
-    global _analyzer, _cache_dir
-    if _analyzer is None or _analyzer.project_root != project_root:
-        _get_logger().info(f"创建新的分析器实例，项目路径: {project_root}")
-        _analyzer = SymbolAnalyzer(project_root, cache_dir=_cache_dir)
-    return _analyzer
+    """
+    获取或创建分析器实例
+
+    最近使用的 _max_projects 个项目各自保留一个分析器，在多个项目之间
+    交替查询时不必重新创建分析器和加载索引；超出数量时淘汰最久未使用的。
+    """
+    key = os.path.realpath(project_root)
+    with _analyzers_lock:
+        analyzer = _analyzers.get(key)
+        if analyzer is not None:
+            _analyzers.move_to_end(key)
+            return analyzer
+
+        _get_logger().info("创建新的分析器实例，项目路径: %s", project_root)
+        analyzer = SymbolAnalyzer(project_root, cache_dir=_cache_dir)
+        _analyzers[key] = analyzer
+        _analyzer_locks[analyzer] = threading.Lock()
+        evicted = None
+        if len(_analyzers) > _max_projects:
+            evicted = _analyzers.popitem(last=False)
+
+    # 在全局锁外关闭，不阻塞其他项目获取分析器
+    if evicted is not None:
+        _close_analyzer(*evicted)
+    return analyzer
+
+
+async def _run_analysis(
+    analyzer: SymbolAnalyzer, func: Callable[..., T], *args: Any
+) -> T:
+    """
+    在工作线程中执行分析器的同步操作
+
+    解析和索引是 CPU 密集的同步操作，放到工作线程中执行可以避免阻塞
+    事件循环上的其他连接；异常会在 await 处重新抛出。
+    """
+    lock = _analyzer_locks[analyzer]
+
+    def run() -> T:
+        with lock:
+            return func(*args)
+
+    loop = asyncio.get_running_loop()
+    semaphore = _analysis_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(_MAX_CONCURRENT_ANALYSES)
+        _analysis_semaphores[loop] = semaphore
+
+    async with semaphore:
+        return await asyncio.to_thread(run)
 
 
 # 创建 MCP Server
 server = Server("py-symbol-analyze")
 
 
-@server.list_tools()
-async def list_tools() -> list[Tool]:
-    """列出所有可用的工具"""
-    return [
-        Tool(
-            name="query_class",
-            description="""查询 Python 类的内容和依赖关系。
+# 工具定义在导入时构建一次，每次 list_tools 请求直接返回
+_TOOLS: list[Tool] = [
+    Tool(
+        name="query_class",
+        description="""查询 Python 类的内容和依赖关系。
 
 返回类的完整源代码内容，以及该类所依赖的其他类或函数的内容。
 这对于理解一个类的完整上下文非常有用。
@@ -89,25 +239,25 @@ async def list_tools() -> list[Tool]:
 - file_path: 类所在的文件路径
 - depends: 依赖的类或函数的源代码列表
 - depends_path: 依赖所在的文件路径列表""",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "project_root": {
-                        "type": "string",
-                        "description": "Python 项目的根目录路径",
-                    },
-                    "class_name": {"type": "string", "description": "要查询的类名"},
-                    "file_path": {
-                        "type": "string",
-                        "description": "(可选) 类所在的文件路径，用于精确定位",
-                    },
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "project_root": {
+                    "type": "string",
+                    "description": "Python 项目的根目录路径",
+                },
+                "class_name": {"type": "string", "description": "要查询的类名"},
+                "file_path": {
+                    "type": "string",
+                    "description": "(可选) 类所在的文件路径，用于精确定位",
                 },
-                "required": ["project_root", "class_name"],
             },
-        ),
-        Tool(
-            name="query_function",
-            description="""查询 Python 函数的内容和依赖关系。
+            "required": ["project_root", "class_name"],
+        },
+    ),
+    Tool(
+        name="query_function",
+        description="""查询 Python 函数的内容和依赖关系。
 
 返回函数的完整源代码内容，以及该函数所依赖的其他类或函数的内容。
 支持查询模块级函数和类内方法。
@@ -125,51 +275,57 @@ async def list_tools() -> list[Tool]:
 - file_path: 函数所在的文件路径
 - depends: 依赖的类或函数的源代码列表
 - depends_path: 依赖所在的文件路径列表""",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "project_root": {
-                        "type": "string",
-                        "description": "Python 项目的根目录路径",
-                    },
-                    "function_name": {
-                        "type": "string",
-                        "description": "要查询的函数名",
-                    },
-                    "file_path": {
-                        "type": "string",
-                        "description": "(可选) 函数所在的文件路径，用于精确定位",
-                    },
-                    "host_class": {
-                        "type": "string",
-                        "description": "(可选) 如果是类方法，指定所属的类名",
-                    },
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "project_root": {
+                    "type": "string",
+                    "description": "Python 项目的根目录路径",
+                },
+                "function_name": {
+                    "type": "string",
+                    "description": "要查询的函数名",
+                },
+                "file_path": {
+                    "type": "string",
+                    "description": "(可选) 函数所在的文件路径，用于精确定位",
+                },
+                "host_class": {
+                    "type": "string",
+                    "description": "(可选) 如果是类方法，指定所属的类名",
                 },
-                "required": ["project_root", "function_name"],
             },
-        ),
-        Tool(
-            name="rebuild_index",
-            description="""重建项目的符号索引。
+            "required": ["project_root", "function_name"],
+        },
+    ),
+    Tool(
+        name="rebuild_index",
+        description="""重建项目的符号索引。
 
 当项目文件发生变化后，可以调用此工具重新扫描并建立符号索引。
+默认只重新索引新增、修改或删除的文件；指定 full 时完整重建。
 
 参数:
-- project_root: Python 项目的根目录路径""",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "project_root": {
-                        "type": "string",
-                        "description": "Python 项目的根目录路径",
-                    }
+- project_root: Python 项目的根目录路径
+- full: (可选) 是否丢弃已有索引完整重建，默认 false""",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "project_root": {
+                    "type": "string",
+                    "description": "Python 项目的根目录路径",
+                },
+                "full": {
+                    "type": "boolean",
+                    "description": "(可选) 是否丢弃已有索引完整重建，默认 false",
                 },
-                "required": ["project_root"],
             },
-        ),
-        Tool(
-            name="list_symbols",
-            description="""列出项目或文件中的所有类和函数。
+            "required": ["project_root"],
+        },
+    ),
+    Tool(
+        name="list_symbols",
+        description="""列出项目或文件中的所有类和函数。
 
 可以用于浏览项目结构，了解有哪些可查询的符号。
 
@@ -180,67 +336,56 @@ async def list_tools() -> list[Tool]:
 返回:
 - classes: 类名列表
 - functions: 函数名列表""",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "project_root": {
-                        "type": "string",
-                        "description": "Python 项目的根目录路径",
-                    },
-                    "file_path": {
-                        "type": "string",
-                        "description": "(可选) 只列出该文件中的符号",
-                    },
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "project_root": {
+                    "type": "string",
+                    "description": "Python 项目的根目录路径",
+                },
+                "file_path": {
+                    "type": "string",
+                    "description": "(可选) 只列出该文件中的符号",
                 },
-                "required": ["project_root"],
             },
-        ),
-    ]
+            "required": ["project_root"],
+        },
+    ),
+]
+
+
+@server.list_tools()
+async def list_tools() -> list[Tool]:
+    """列出所有可用的工具"""
+    return _TOOLS
 
 
 @server.call_tool()
 async def call_tool(name: str, arguments: dict) -> list[TextContent]:
     """处理工具调用"""
-    _get_logger().info(f"收到工具调用请求: {name}, 参数: {arguments}")
+    _get_logger().info("收到工具调用请求: %s, 参数: %s", name, arguments)
     try:
-        if name == "query_class":
-            result = await handle_query_class(arguments)
-        elif name == "query_function":
-            result = await handle_query_function(arguments)
-        elif name == "rebuild_index":
-            result = await handle_rebuild_index(arguments)
-        elif name == "list_symbols":
-            result = await handle_list_symbols(arguments)
-        else:
+        handler = _HANDLERS.get(name)
+        if handler is None:
             raise ValueError(f"Unknown tool: {name}")
-        _get_logger().info(f"工具 {name} 执行成功")
+        result = await handler(arguments)
+        _get_logger().info("工具 %s 执行成功", name)
         return result
 
     except KeyError as e:
-        _get_logger().error(f"Missing required parameter: {e}")
+        _get_logger().error("Missing required parameter: %s", e)
         return [
             TextContent(
                 type="text",
-                text=json.dumps(
-                    {
-                        "error": f"Missing required parameter: {e}",
-                        "code": INVALID_PARAMS,
-                    },
-                    ensure_ascii=False,
-                    indent=2,
-                ),
+                text=_MISSING_PARAM_JSON % _json_text(e),
             )
         ]
     except Exception as e:
-        _get_logger().error(f"Error executing tool {name}: {e}", exc_info=True)
+        _get_logger().error("Error executing tool %s: %s", name, e, exc_info=True)
         return [
             TextContent(
                 type="text",
-                text=json.dumps(
-                    {"error": str(e), "code": INTERNAL_ERROR},
-                    ensure_ascii=False,
-                    indent=2,
-                ),
+                text=_INTERNAL_ERROR_JSON % _json_text(e),
             )
         ]
 
@@ -252,26 +397,17 @@ async def handle_query_class(arguments: dict) -> list[TextContent]:
     file_path = arguments.get("file_path")
 
     analyzer = get_analyzer(project_root)
-    result = analyzer.query_class(class_name, file_path)
+    result = await _run_analysis(analyzer, analyzer.query_class, class_name, file_path)
 
     if result is None:
         return [
             TextContent(
                 type="text",
-                text=json.dumps(
-                    {
-                        "error": f"Class '{class_name}' not found in project",
-                        "suggestion": "Please check the class name or try rebuilding the index with rebuild_index tool",
-                    },
-                    ensure_ascii=False,
-                    indent=2,
-                ),
+                text=_CLASS_NOT_FOUND_JSON % _json_text(class_name),
             )
         ]
 
-    return [
-        TextContent(type="text", text=json.dumps(result, ensure_ascii=False, indent=2))
-    ]
+    return [TextContent(type="text", text=_dumps(result))]
 
 
 async def handle_query_function(arguments: dict) -> list[TextContent]:
@@ -282,46 +418,36 @@ async def handle_query_function(arguments: dict) -> list[TextContent]:
     host_class = arguments.get("host_class")
 
     analyzer = get_analyzer(project_root)
-    result = analyzer.query_function(function_name, file_path, host_class)
+    result = await _run_analysis(
+        analyzer, analyzer.query_function, function_name, file_path, host_class
+    )
 
     if result is None:
         return [
             TextContent(
                 type="text",
-                text=json.dumps(
-                    {
-                        "error": f"Function '{function_name}' not found in project",
-                        "suggestion": "Please check the function name or try rebuilding the index with rebuild_index tool",
-                    },
-                    ensure_ascii=False,
-                    indent=2,
-                ),
+                text=_FUNCTION_NOT_FOUND_JSON % _json_text(function_name),
             )
         ]
 
-    return [
-        TextContent(type="text", text=json.dumps(result, ensure_ascii=False, indent=2))
-    ]
+    return [TextContent(type="text", text=_dumps(result))]
 
 
 async def handle_rebuild_index(arguments: dict) -> list[TextContent]:
     """处理重建索引的请求"""
     project_root = arguments["project_root"]
+    full = bool(arguments.get("full", False))
 
     analyzer = get_analyzer(project_root)
-    analyzer.rebuild_index()
+    if full:
+        await _run_analysis(analyzer, analyzer.rebuild_index)
+    else:
+        await _run_analysis(analyzer, analyzer.refresh_index)
 
     return [
         TextContent(
             type="text",
-            text=json.dumps(
-                {
-                    "status": "success",
-                    "message": f"Index rebuilt for project: {project_root}",
-                },
-                ensure_ascii=False,
-                indent=2,
-            ),
+            text=_INDEX_REBUILT_JSON % _json_text(project_root),
         )
     ]
 
@@ -332,7 +458,26 @@ async def handle_list_symbols(arguments: dict) -> list[TextContent]:
     file_path = arguments.get("file_path")
 
     analyzer = get_analyzer(project_root)
+    result = await _run_analysis(
+        analyzer, _collect_symbols, analyzer, project_root, file_path
+    )
+
+    return [TextContent(type="text", text=_dumps(result))]
+
+
+# 工具名到处理函数的分发表，新增工具时在此注册
+_HANDLERS: dict[str, Callable[[dict], Awaitable[list[TextContent]]]] = {
+    "query_class": handle_query_class,
+    "query_function": handle_query_function,
+    "rebuild_index": handle_rebuild_index,
+    "list_symbols": handle_list_symbols,
+}
 
+
+def _collect_symbols(
+    analyzer: SymbolAnalyzer, project_root: str, file_path: Optional[str]
+) -> dict:
+    """收集项目或指定文件中的类和函数（同步执行）"""
     if file_path:
         # 列出指定文件的符号
         classes, functions = analyzer.resolver.project_parser.get_file_symbols(
@@ -348,21 +493,15 @@ async def handle_list_symbols(arguments: dict) -> list[TextContent]:
         }
     else:
         # 列出整个项目的符号
-        class_symbols = analyzer.resolver.project_parser.get_all_symbols("class")
-        func_symbols = analyzer.resolver.project_parser.get_all_symbols("function")
-
+        # 只读取概要列，不为每个符号构造 ParsedSymbol
+        project_parser = analyzer.resolver.project_parser
         classes = [
-            {"name": s.name, "file_path": s.file_path, "line": s.start_line}
-            for s in class_symbols
+            {"name": name, "file_path": path, "line": line}
+            for name, path, line, _ in project_parser.get_symbol_outline("class")
         ]
         functions = [
-            {
-                "name": s.name,
-                "file_path": s.file_path,
-                "line": s.start_line,
-                "host_class": s.host_class,
-            }
-            for s in func_symbols
+            {"name": name, "file_path": path, "line": line, "host_class": host}
+            for name, path, line, host in project_parser.get_symbol_outline("function")
         ]
 
         result = {
@@ -371,9 +510,7 @@ async def handle_list_symbols(arguments: dict) -> list[TextContent]:
             "functions": functions,
         }
 
-    return [
-        TextContent(type="text", text=json.dumps(result, ensure_ascii=False, indent=2))
-    ]
+    return result
 
 
 async def run_stdio_server():
@@ -387,8 +524,14 @@ async def run_stdio_server():
     _get_logger().info("MCP Server 已关闭")
 
 
+@functools.cache
 def create_starlette_app():
-    """创建 Starlette 应用，用于 HTTP 传输"""
+    """
+    创建 Starlette 应用，用于 HTTP 传输
+
+    应用在进程内只构建一次，重复调用返回同一个实例（共享同一个 SSE 传输）。
+    依赖在函数内导入，stdio 模式不需要加载 Starlette。
+    """
     from mcp.server.sse import SseServerTransport
     from starlette.applications import Starlette
     from starlette.middleware import Middleware
@@ -401,7 +544,7 @@ def create_starlette_app():
 
     async def handle_sse(request):
         """处理 SSE 连接"""
-        _get_logger().info(f"收到 SSE 连接请求: {request.client}")
+        _get_logger().info("收到 SSE 连接请求: %s", request.client)
         async with sse.connect_sse(
             request.scope, request.receive, request._send
         ) as streams:
@@ -483,19 +626,19 @@ def run_http_server(
     import uvicorn
 
     _get_logger().info("正在启动 Python Symbol Analyzer MCP Server (SSE 模式)...")
-    _get_logger().info(f"监听地址: http://{host}:{port}")
-    _get_logger().info(f"SSE 端点: http://{host}:{port}/sse")
-    _get_logger().info(f"消息端点: http://{host}:{port}/messages")
-    _get_logger().info(f"健康检查: http://{host}:{port}/health")
+    _get_logger().info("监听地址: http://%s:%s", host, port)
+    _get_logger().info("SSE 端点: http://%s:%s/sse", host, port)
+    _get_logger().info("消息端点: http://%s:%s/messages", host, port)
+    _get_logger().info("健康检查: http://%s:%s/health", host, port)
 
     app = create_starlette_app()
-    uvicorn.run(app, host=host, port=port, log_level="info")
+    # "auto" 在已安装 uvloop / httptools（speedups 可选依赖）时使用它们，
+    # 否则回退到 asyncio 与 h11
+    uvicorn.run(app, host=host, port=port, log_level="info", loop="auto", http="auto")
 
 
 def main():
     """主入口点"""
-    import asyncio
-
     parser = argparse.ArgumentParser(
         description="Python Symbol Analyzer MCP Server",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -558,15 +701,25 @@ def main():
         help="符号缓存存储目录 (默认: 当前目录下的 cache 文件夹)",
     )
 
+    parser.add_argument(
+        "--max-projects",
+        "-m",
+        type=int,
+        default=DEFAULT_MAX_PROJECTS,
+        help=f"同时保留分析器的项目数量 (默认: {DEFAULT_MAX_PROJECTS})",
+    )
+
     args = parser.parse_args()
 
     # 设置日志目录（必须在获取 logger 之前）
     log_dir = set_log_dir(args.log_dir)
-    _get_logger().info(f"日志目录: {log_dir}")
+    _get_logger().info("日志目录: %s", log_dir)
 
     # 设置缓存目录
     cache_dir = set_global_cache_dir(args.cache_dir)
-    _get_logger().info(f"缓存目录: {cache_dir}")
+    _get_logger().info("缓存目录: %s", cache_dir)
+
+    set_max_projects(args.max_projects)
 
     if args.transport == "stdio":
         asyncio.run(run_stdio_server())
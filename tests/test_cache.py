@@ -0,0 +1,411 @@
+"""
+测试 SQLite 缓存
+"""
+
+import sqlite3
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from py_symbol_analyze.cache import SymbolCache
+
+
+def make_symbol(name: str, file_path: str = "main.py", **kwargs):
+    """构造测试用的符号字典"""
+    data = {
+        "name": name,
+        "node_type": "class",
+        "start_line": 1,
+        "end_line": 2,
+        "start_col": 0,
+        "end_col": 10,
+        "content": f"class {name}:\n    pass",
+        "file_path": file_path,
+        "host_class": None,
+        "callees": [],
+        "imports": {},
+        "base_classes": [],
+        "calls_super": False,
+    }
+    data.update(kwargs)
+    return data
+
+
+@pytest.fixture
+def cache():
+    """创建使用临时数据库的缓存"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        symbol_cache = SymbolCache(tmpdir, db_path=str(Path(tmpdir) / "test.db"))
+        yield symbol_cache
+        symbol_cache.close()
+
+
+class TestSymbolCache:
+    """测试 SymbolCache"""
+
+    def test_add_and_find_symbol(self, cache):
+        """测试添加并查找符号"""
+        cache.add_symbol(make_symbol("Foo", callees=["Bar"]))
+
+        results = cache.find_symbols_by_name("Foo")
+        assert len(results) == 1
+        assert results[0]["callees"] == ["Bar"]
+
+    def test_find_symbols_by_name_file_hint(self, cache):
+        """测试文件提示优先排序及数量限制"""
+        cache.add_symbols_batch(
+            [
+                make_symbol("Foo", file_path="pkg/a.py"),
+                make_symbol("Foo", file_path="pkg/b.py"),
+                make_symbol("Foo", file_path="pkg/c.py", node_type="function"),
+            ]
+        )
+
+        results = cache.find_symbols_by_name("Foo", file_hint="pkg/b.py")
+        assert [r["file_path"] for r in results] == [
+            "pkg/b.py",
+            "pkg/a.py",
+            "pkg/c.py",
+        ]
+
+        results = cache.find_symbols_by_name(
+            "Foo", symbol_type="class", file_hint="b.py", limit=1
+        )
+        assert [r["file_path"] for r in results] == ["pkg/b.py"]
+
+        results = cache.find_symbols_by_name("Foo", symbol_type="function")
+        assert [r["file_path"] for r in results] == ["pkg/c.py"]
+
+    def test_find_symbol_in_file(self, cache):
+        """测试在指定文件中查找符号，类优先于函数"""
+        cache.add_symbols_batch(
+            [
+                make_symbol("Foo", node_type="function", start_line=1),
+                make_symbol("Foo", start_line=5),
+                make_symbol("Foo", file_path="other.py"),
+            ]
+        )
+
+        symbol = cache.find_symbol_in_file("Foo", "main.py")
+        assert (symbol["node_type"], symbol["start_line"]) == ("class", 5)
+        assert cache.find_symbol_in_file("Bar", "main.py") is None
+        assert cache.has_symbols_in_file("other.py")
+        assert not cache.has_symbols_in_file("missing.py")
+
+    def test_iter_all_symbols(self, cache):
+        """测试流式读取符号"""
+        cache.add_symbols_batch(
+            [make_symbol(f"Cls{i}", start_line=i) for i in range(1500)]
+            + [make_symbol("func", node_type="function", file_path="other.py")]
+        )
+
+        assert sum(1 for _ in cache.iter_all_symbols("class")) == 1500
+        assert [s["name"] for s in cache.iter_all_symbols("function")] == ["func"]
+        assert [s["name"] for s in cache.iter_symbols_by_file("other.py")] == ["func"]
+
+    def test_symbols_by_files(self, cache):
+        """测试按多个文件批量查询和删除符号"""
+        cache.add_symbols_batch(
+            [make_symbol(f"Cls{i}", file_path=f"mod{i}.py") for i in range(600)]
+        )
+
+        results = cache.find_symbols_by_files(["mod1.py", "mod2.py", "missing.py"])
+        assert sorted(r["name"] for r in results) == ["Cls1", "Cls2"]
+
+        # 超过内联参数上限时使用临时表
+        many = [f"mod{i}.py" for i in range(550)]
+        assert len(cache.find_symbols_by_files(many)) == 550
+
+        cache.remove_symbols_by_files(many)
+        assert cache.get_symbol_count() == (50, 0)
+
+        cache.remove_symbols_by_files(["mod599.py"])
+        assert cache.get_symbol_count() == (49, 0)
+        assert cache.find_symbols_by_files([]) == []
+
+    def test_symbol_positions_roundtrip(self, cache):
+        """测试打包存储的位置信息"""
+        cache.add_symbol(
+            make_symbol(
+                "Foo", start_line=120000, end_line=130000, start_col=4, end_col=900
+            )
+        )
+
+        symbol = cache.find_symbols_by_name("Foo")[0]
+        assert symbol["start_line"] == 120000
+        assert symbol["end_line"] == 130000
+        assert symbol["start_col"] == 4
+        assert symbol["end_col"] == 900
+
+    def test_content_from_file_cache(self, cache):
+        """测试未存储 content 的符号从文件缓存中按字节范围切出源代码"""
+        source = "# 注释\nclass Foo:\n    pass\n"
+        start = len("# 注释\n".encode("utf-8"))
+        cache.set_file_cache("main.py", 1.0, source)
+        cache.add_symbol(
+            make_symbol(
+                "Foo", content=None, start_byte=start, end_byte=len(source.encode())
+            )
+        )
+
+        symbol = cache.find_symbols_by_name("Foo")[0]
+        assert symbol["content"] == "class Foo:\n    pass\n"
+        assert [s["content"] for s in cache.iter_all_symbols()] == [symbol["content"]]
+        with cache._get_connection() as conn:
+            assert (
+                conn.execute("SELECT content FROM symbol_index").fetchone()[0] is None
+            )
+
+    def test_imports_stored_per_file(self, cache):
+        """测试导入信息按文件存储一份，同一文件的符号共享"""
+        imports = {"Bar": "pkg.Bar"}
+        cache.add_symbols_batch(
+            [
+                make_symbol("Foo", imports=imports),
+                make_symbol("func", node_type="function", imports=imports),
+                make_symbol("Other", file_path="other.py"),
+            ]
+        )
+
+        symbols = cache.find_symbols_by_file("main.py")
+        assert [s["imports"] for s in symbols] == [imports, imports]
+        assert symbols[0]["imports"] is symbols[1]["imports"]
+        assert cache.find_symbols_by_name("Other")[0]["imports"] == {}
+        with cache._get_connection() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM file_imports").fetchone()[0] == 2
+
+        cache.remove_symbols_by_file("main.py")
+        with cache._get_connection() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM file_imports").fetchone()[0] == 1
+
+    def test_add_symbol_upsert(self, cache):
+        """测试重复添加同一符号时原地更新"""
+        cache.add_symbol(make_symbol("Foo", content="old"))
+        with cache._get_connection() as conn:
+            old_id = conn.execute("SELECT id FROM symbol_index").fetchone()[0]
+
+        cache.add_symbol(make_symbol("Foo", content="new", callees=["Bar"]))
+
+        results = cache.find_symbols_by_name("Foo")
+        assert len(results) == 1
+        assert results[0]["content"] == "new"
+        assert results[0]["callees"] == ["Bar"]
+        with cache._get_connection() as conn:
+            assert conn.execute("SELECT id FROM symbol_index").fetchone()[0] == old_id
+
+    def test_add_symbols_batch_deduplicates(self, cache):
+        """测试批量添加时去除重复符号，保留最后一个"""
+        cache.add_symbols_batch(
+            [
+                make_symbol("Foo", content="first"),
+                make_symbol("Foo", content="second"),
+                make_symbol("Foo", start_line=10),
+            ]
+        )
+
+        results = cache.find_symbols_by_name("Foo")
+        assert [r["content"] for r in results] == ["second", "class Foo:\n    pass"]
+
+    def test_bulk_write_commits(self, cache):
+        """测试批量写入在事务结束后提交"""
+        with cache.bulk_write():
+            cache.add_symbols_batch([make_symbol("Foo"), make_symbol("Bar")])
+            cache.set_indexed(True)
+
+        assert cache.get_symbol_count() == (2, 0)
+        assert cache.is_indexed()
+
+    def test_bulk_write_rollback(self, cache):
+        """测试批量写入出错时回滚"""
+        cache.add_symbol(make_symbol("Foo"))
+
+        with pytest.raises(RuntimeError):
+            with cache.bulk_write():
+                cache.remove_symbols_by_file("main.py")
+                cache.add_symbol(make_symbol("Bar"))
+                raise RuntimeError("boom")
+
+        names = [s["name"] for s in cache.get_all_symbols()]
+        assert names == ["Foo"]
+
+    def test_bulk_initial_load(self, cache):
+        """测试首次批量导入"""
+        symbols = (make_symbol(f"Cls{i}", start_line=i) for i in range(25))
+        assert cache.bulk_initial_load(symbols, chunk_size=10) == 25
+
+        assert cache.get_symbol_count() == (25, 0)
+        assert len(cache.find_symbols_by_name("Cls7")) == 1
+        with cache._get_connection() as conn:
+            mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+            indexes = {
+                row[0]
+                for row in conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'index'"
+                )
+            }
+        assert mode == "wal"
+        assert {name for name, _ in SymbolCache._SYMBOL_INDEXES} <= indexes
+
+    def test_bulk_initial_load_interrupted(self, cache):
+        """测试导入中途进程退出时保留之前的索引，数据库文件完好"""
+        cache.add_symbol(make_symbol("Old"))
+        cache.set_indexed(True)
+        cache.set_file_cache("main.py", 1.0, "x = 1\n")
+        cache.close()
+
+        script = (
+            "import os, sys\n"
+            "sys.path.insert(0, sys.argv[1])\n"
+            "from py_symbol_analyze.cache import SymbolCache\n"
+            "cache = SymbolCache(sys.argv[2], db_path=sys.argv[3])\n"
+            # 缩小页缓存，使未提交的修改在进程退出前就写入数据库文件
+            "with cache._get_connection() as conn:\n"
+            "    conn.execute('PRAGMA cache_size=10')\n"
+            "def symbols():\n"
+            "    for i in range(50000):\n"
+            "        if i == 40000:\n"
+            "            os._exit(1)\n"
+            "        yield {'name': f'New{i}', 'node_type': 'class',\n"
+            "               'start_line': i, 'end_line': i, 'start_col': 0,\n"
+            "               'end_col': 1, 'content': 'x' * 200,\n"
+            "               'file_path': f'f{i % 100}.py'}\n"
+            "cache.bulk_initial_load(symbols(), chunk_size=1000, replace=True)\n"
+        )
+        src_path = str(Path(__file__).parent.parent / "src")
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                script,
+                src_path,
+                str(cache.project_root),
+                str(cache.db_path),
+            ]
+        )
+        assert result.returncode == 1
+
+        reopened = SymbolCache(str(cache.project_root), db_path=str(cache.db_path))
+        try:
+            with reopened._get_connection() as conn:
+                assert conn.execute("PRAGMA integrity_check").fetchone()[0] == "ok"
+            assert [s["name"] for s in reopened.get_all_symbols()] == ["Old"]
+            assert reopened.is_indexed()
+            assert reopened.is_file_cache_valid("main.py", 1.0)
+        finally:
+            reopened.close()
+
+    def test_bulk_initial_load_with_other_connection(self, cache):
+        """测试其他连接打开同一数据库时仍能批量导入"""
+        cache.add_symbol(make_symbol("Old"))
+        other = sqlite3.connect(str(cache.db_path))
+        try:
+            other.execute("SELECT COUNT(*) FROM symbol_index").fetchone()
+            assert cache.bulk_initial_load([make_symbol("New")], replace=True) == 1
+        finally:
+            other.close()
+        assert [s["name"] for s in cache.get_all_symbols()] == ["New"]
+
+    def test_bulk_initial_load_replace(self, cache):
+        """测试完整重建索引：清空旧符号并标记索引状态，失败时保留旧索引"""
+        cache.add_symbol(make_symbol("Old"))
+
+        def failing_symbols():
+            yield make_symbol("New")
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            cache.bulk_initial_load(failing_symbols(), replace=True)
+        assert [s["name"] for s in cache.get_all_symbols()] == ["Old"]
+        assert not cache.is_indexed()
+
+        assert cache.bulk_initial_load([make_symbol("New")], replace=True) == 1
+        assert [s["name"] for s in cache.get_all_symbols()] == ["New"]
+        assert cache.is_indexed()
+
+    def test_file_cache_touch_only_updates_mtime(self, cache):
+        """测试内容未变时只更新 mtime"""
+        cache.set_file_cache("main.py", 1.0, "x = 1\n")
+        assert cache.is_file_cache_valid("main.py", 1.0)
+
+        cache.set_file_cache("main.py", 2.0, "x = 1\n")
+        assert cache.get_file_mtime("main.py") == 2.0
+        assert not cache.is_file_cache_valid("main.py", 1.0)
+
+        cache.set_file_cache("main.py", 3.0, "x = 2\n")
+        assert cache.get_file_cache("main.py")[2] == "x = 2\n"
+
+    def test_get_source_bytes(self, cache):
+        """测试按 mtime 校验后取出缓存的源代码字节串"""
+        cache.set_file_cache("main.py", 1.0, "# 注释\nx = 1\n")
+
+        assert cache.get_source_bytes("main.py") == "# 注释\nx = 1\n".encode()
+        assert cache.get_source_bytes("main.py", 1.0) == "# 注释\nx = 1\n".encode()
+        assert cache.get_source_bytes("main.py", 2.0) is None
+        assert cache.get_source_bytes("missing.py") is None
+
+    def test_find_stale_files(self, cache):
+        """测试按 mtime 找出变化、新增和仅存在于缓存中的文件"""
+        cache.set_file_cache("a.py", 1.0, "a = 1\n")
+        cache.set_file_cache("b.py", 1.0, "b = 1\n")
+        cache.set_file_cache("gone.py", 1.0, "c = 1\n")
+
+        changed, cached_only = cache.find_stale_files(
+            {"a.py": 1.0, "b.py": 2.0, "new.py": 1.0}
+        )
+        assert changed == ["b.py", "new.py"]
+        assert cached_only == ["gone.py"]
+
+    def test_get_file_mtime_missing(self, cache):
+        """测试未缓存的文件"""
+        assert cache.get_file_mtime("missing.py") is None
+        assert not cache.is_file_cache_valid("missing.py", 1.0)
+
+    def test_migrate_legacy_json_columns(self):
+        """测试旧版 JSON 文本字段迁移"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = str(Path(tmpdir) / "legacy.db")
+            conn = sqlite3.connect(db_path)
+            conn.execute("""
+                CREATE TABLE symbol_index (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name TEXT NOT NULL,
+                    node_type TEXT NOT NULL,
+                    start_line INTEGER NOT NULL,
+                    end_line INTEGER NOT NULL,
+                    start_col INTEGER NOT NULL,
+                    end_col INTEGER NOT NULL,
+                    content TEXT NOT NULL,
+                    file_path TEXT NOT NULL,
+                    host_class TEXT,
+                    callees TEXT,
+                    imports TEXT,
+                    UNIQUE(name, file_path, start_line, node_type)
+                )
+            """)
+            conn.execute(
+                "INSERT INTO symbol_index (name, node_type, start_line, end_line, "
+                "start_col, end_col, content, file_path, callees, imports) "
+                "VALUES ('Foo', 'class', 1, 2, 0, 10, 'class Foo: pass', "
+                "'main.py', '[\"Bar\"]', '{\"Bar\": \"pkg.Bar\"}')"
+            )
+            conn.commit()
+            conn.close()
+
+            cache = SymbolCache(tmpdir, db_path=db_path)
+            try:
+                symbol = cache.find_symbols_by_name("Foo")[0]
+                assert (symbol["start_line"], symbol["start_col"]) == (1, 0)
+                assert (symbol["end_line"], symbol["end_col"]) == (2, 10)
+                assert symbol["callees"] == ["Bar"]
+                assert symbol["imports"] == {"Bar": "pkg.Bar"}
+                assert symbol["base_classes"] == []
+                assert symbol["calls_super"] is False
+            finally:
+                cache.close()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -2,12 +2,18 @@
 测试 Python 解析器
 """
 
+import os
+import sys
 import tempfile
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
+from types import SimpleNamespace
 
 import pytest
 
-from py_symbol_analyze.parser import ProjectParser, PythonParser
+from py_symbol_analyze import parser as parser_module
+from py_symbol_analyze.parser import ParsedSymbol, ProjectParser, PythonParser
 
 # 测试用的示例代码
 SAMPLE_CODE = '''
@@ -90,6 +96,30 @@ class TestPythonParser:
         assert tree is not None
         assert tree.root_node is not None
 
+    def test_shared_language_and_queries(self, parser):
+        """测试多个解析器共享语言对象和预编译查询，Parser 各自独立"""
+        other = PythonParser()
+        assert other.language is parser.language
+        assert other._callee_query is parser._callee_query
+        assert other.parser is not parser.parser
+
+    def test_parse_file(self, parser):
+        """测试解析文件（包括通过 mmap 读取的大文件和 CRLF 换行）"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            small_file = Path(tmpdir) / "small.py"
+            small_file.write_bytes(b"x = 1\r\n")
+            large_file = Path(tmpdir) / "large.py"
+            large_file.write_text(SAMPLE_CODE * 10)
+
+            small_tree = parser.parse_file(str(small_file))
+            assert small_tree.root_node.text == b"x = 1\n"
+
+            large_tree = parser.parse_file(str(large_file))
+            assert not large_tree.root_node.has_error
+            source_bytes = large_tree.root_node.text
+            classes = parser.find_classes(large_tree, source_bytes, str(large_file))
+            assert len(classes) == 20
+
     def test_extract_imports(self, parser):
         """测试提取导入"""
         tree = parser.parse_source(SAMPLE_CODE)
@@ -126,6 +156,54 @@ class TestPythonParser:
         assert "transform" in func_names
         assert "do_something" in func_names
 
+    def test_find_symbols(self, parser):
+        """测试一次查找类和函数，结果与分别查找一致"""
+        tree = parser.parse_source(SAMPLE_CODE)
+        source_bytes = SAMPLE_CODE.encode("utf-8")
+
+        classes, functions = parser.find_symbols(tree, source_bytes, "test.py")
+        expected_classes = parser.find_classes(tree, source_bytes, "test.py")
+        expected_functions = parser.find_functions(tree, source_bytes, "test.py")
+        assert classes == expected_classes
+        assert functions == expected_functions
+        assert classes[0].imports is functions[0].imports
+
+    def test_find_symbols_nested_host_class(self, parser):
+        """测试嵌套类和函数的所属类与逐个向上查找的结果一致"""
+        code = (
+            "def top():\n"
+            "    class Local:\n"
+            "        def m(self):\n"
+            "            def inner():\n"
+            "                pass\n"
+            "\n"
+            "class Outer:\n"
+            "    class Inner:\n"
+            "        def a(self):\n"
+            "            pass\n"
+            "    def b(self):\n"
+            "        pass\n"
+            "\n"
+            "def tail():\n"
+            "    pass\n"
+        )
+        tree = parser.parse_source(code)
+        source_bytes = code.encode("utf-8")
+
+        _, functions = parser.find_symbols(tree, source_bytes, "test.py")
+        expected = parser.find_functions(tree, source_bytes, "test.py")
+        assert [(f.name, f.host_class) for f in functions] == [
+            (f.name, f.host_class) for f in expected
+        ]
+        assert [f.host_class for f in functions] == [
+            None,
+            "Local",
+            "Local",
+            "Inner",
+            "Outer",
+            None,
+        ]
+
     def test_extract_callees(self, parser):
         """测试提取被调用的符号"""
         tree = parser.parse_source(SAMPLE_CODE)
@@ -136,6 +214,41 @@ class TestPythonParser:
         process_func = next(f for f in functions if f.name == "process")
         assert "helper_func" in process_func.callees
 
+    def test_extract_callees_references(self, parser):
+        """测试作为参数或赋值值的类引用及属性访问"""
+        code = (
+            "def f(self):\n    x = Ärger\n    y = lower\n    g(Zeta, self.a, mod.b)\n"
+        )
+        tree = parser.parse_source(code)
+        func = parser.find_functions(tree, code.encode("utf-8"), "test.py")[0]
+
+        assert sorted(func.callees) == ["Zeta", "g", "mod", "Ärger"]
+
+    def test_extract_callees_file_captures(self, parser):
+        """测试使用整个文件的调用名称与单独对符号查询的结果一致"""
+        code = SAMPLE_CODE + (
+            "\n\nclass Child(MyClass):\n"
+            "    def process(self, data):\n"
+            "        return super().process(Wrapper(data))\n"
+        )
+        tree = parser.parse_source(code)
+        source_bytes = code.encode("utf-8")
+        file_captures = parser.collect_callee_captures(tree.root_node, source_bytes)
+
+        classes, functions = parser.find_symbols(tree, source_bytes, "test.py")
+        for symbol in classes + functions:
+            node = tree.root_node.descendant_for_byte_range(
+                symbol.start_byte, symbol.end_byte
+            )
+            callees, calls_super = parser.extract_callees(node, source_bytes)
+            assert sorted(callees) == sorted(symbol.callees)
+            assert parser.extract_callees(node, source_bytes, file_captures) == (
+                symbol.callees,
+                calls_super,
+            )
+        assert [f.host_class for f in functions if f.calls_super] == ["Child"]
+        assert "Wrapper" in next(c for c in classes if c.name == "Child").callees
+
     def test_class_with_callees(self, parser):
         """测试类的调用分析"""
         tree = parser.parse_source(SAMPLE_CODE)
@@ -146,6 +259,142 @@ class TestPythonParser:
         # MyClass 内部使用了 HelperClass
         assert "HelperClass" in my_class.callees
 
+    def test_interned_strings(self, parser):
+        """测试导入、调用和类名字符串被驻留"""
+        tree = parser.parse_source(SAMPLE_CODE)
+        source_bytes = bytes(SAMPLE_CODE, "utf-8")
+        functions = parser.find_functions(tree, source_bytes, "test.py")
+
+        init_func = next(f for f in functions if f.name == "__init__")
+        process_func = next(f for f in functions if f.name == "process")
+        assert init_func.host_class is process_func.host_class
+        helper = next(c for c in process_func.callees if c == "helper_func")
+        assert helper is sys.intern("helper_func")
+        key = next(k for k in process_func.imports if k == "helper_func")
+        assert key is helper
+
+    def test_symbol_to_dict_roundtrip(self, parser):
+        """测试 ParsedSymbol 与字典互相转换"""
+        tree = parser.parse_source(SAMPLE_CODE)
+        source_bytes = bytes(SAMPLE_CODE, "utf-8")
+        symbol = parser.find_classes(tree, source_bytes, "test.py")[0]
+
+        assert not hasattr(symbol, "__dict__")
+        data = parser_module._parsed_symbol_to_dict(symbol)
+        assert data["callees"] is symbol.callees
+        assert parser_module._parsed_symbol_from_dict(data) == symbol
+
+    def test_symbol_constructor(self):
+        """测试通过公开的构造参数创建 ParsedSymbol"""
+        symbol = ParsedSymbol(
+            name="Foo",
+            node_type="class",
+            start_line=1,
+            end_line=2,
+            start_col=0,
+            end_col=8,
+            content="class Foo:\n    pass",
+            file_path="test.py",
+        )
+        assert symbol.content == "class Foo:\n    pass"
+        assert symbol.callees == [] and symbol.imports == {}
+
+        # 按位置传参与关键字传参等价
+        assert ParsedSymbol("Foo", "class", 1, 2, 0, 8, symbol.content, "test.py") == (
+            symbol
+        )
+
+        # 只给出 source 时按字节范围延迟解码
+        source = "# 注释\nclass Foo:\n    pass\n".encode("utf-8")
+        start = source.index(b"class")
+        lazy = ParsedSymbol(
+            "Foo",
+            "class",
+            2,
+            3,
+            0,
+            8,
+            None,
+            "test.py",
+            start_byte=start,
+            end_byte=len(source) - 1,
+            source=source,
+        )
+        assert lazy.content == symbol.content
+        data = parser_module._parsed_symbol_to_dict(lazy)
+        assert parser_module._parsed_symbol_from_dict(data).content == symbol.content
+
+    def test_symbol_content_lazy(self, parser):
+        """测试符号内容在首次访问时才从源代码解码"""
+        code = "# 注释\nclass Foo:\n    pass\n"
+        source_bytes = code.encode("utf-8")
+        tree = parser.parse_source(code)
+        symbol = parser.find_classes(tree, source_bytes, "test.py")[0]
+
+        # 写入索引时不解码 content
+        index_data = parser_module._parsed_symbol_to_index_dict(symbol)
+        assert index_data["content"] is None
+        assert (index_data["start_byte"], index_data["end_byte"]) == (
+            symbol.start_byte,
+            symbol.end_byte,
+        )
+
+        # 按字节范围从源代码中解码，多字节字符之后的偏移也正确，结果只解码一次
+        assert symbol.content == "class Foo:\n    pass"
+        assert symbol.content is symbol.content
+
+    def test_find_symbol_by_name(self, parser):
+        """测试在单个文件中按名称查找符号"""
+        tree = parser.parse_source(SAMPLE_CODE)
+        source_bytes = bytes(SAMPLE_CODE, "utf-8")
+        functions = parser.find_functions(tree, source_bytes, "test.py")
+
+        process = parser.find_symbol_by_name(tree, source_bytes, "test.py", "process")
+        assert process == next(f for f in functions if f.name == "process")
+
+        helper = parser.find_symbol_by_name(
+            tree, source_bytes, "test.py", "HelperClass", "class"
+        )
+        assert helper.node_type == "class"
+        assert "from typing import List" not in helper.content
+        assert helper.imports["helper_func"] == ".utils.helper_func"
+
+        assert (
+            parser.find_symbol_by_name(
+                tree, source_bytes, "test.py", "HelperClass", "function"
+            )
+            is None
+        )
+        assert parser.find_symbol_by_name(tree, source_bytes, "test.py", "x") is None
+
+    def test_find_symbol_by_name_absent(self, parser, monkeypatch):
+        """测试名称没有出现在源代码中时不执行查询"""
+        tree = parser.parse_source(SAMPLE_CODE)
+        source_bytes = SAMPLE_CODE.encode("utf-8")
+
+        def fail_query(query, node):
+            raise AssertionError("不应执行查询")
+
+        monkeypatch.setattr(parser_module, "_query_captures", fail_query)
+        assert (
+            parser.find_symbol_by_name(tree, source_bytes, "test.py", "Missing") is None
+        )
+
+    def test_shared_imports(self, parser):
+        """测试传入已提取的导入信息时所有符号共享同一个字典"""
+        tree = parser.parse_source(SAMPLE_CODE)
+        source_bytes = bytes(SAMPLE_CODE, "utf-8")
+        imports = parser.extract_imports(tree, source_bytes)
+
+        classes = parser.find_classes(tree, source_bytes, "test.py", imports)
+        functions = parser.find_functions(tree, source_bytes, "test.py", imports)
+
+        assert all(s.imports is imports for s in classes + functions)
+        assert (
+            functions[0].imports
+            == parser.find_functions(tree, source_bytes, "test.py")[0].imports
+        )
+
 
 class TestProjectParser:
     """测试 ProjectParser"""
@@ -162,6 +411,187 @@ class TestProjectParser:
         assert parser.find_symbol("helper_func") is not None
         assert parser.find_symbol("BaseClass") is not None
 
+    def test_build_index_parallel(self, temp_project, monkeypatch):
+        """测试多进程构建索引与单进程结果一致"""
+        # 至少需要 2 个待解析文件才会启动多个工作进程
+        monkeypatch.setattr(parser_module, "_PARALLEL_MIN_FILES", 2)
+        monkeypatch.setattr(parser_module, "_PARALLEL_QUEUE_PER_WORKER", 1)
+
+        results = []
+        for max_workers in (1, 2):
+            with tempfile.TemporaryDirectory() as cache_dir:
+                parser = ProjectParser(
+                    temp_project,
+                    db_path=str(Path(cache_dir) / "index.db"),
+                    max_workers=max_workers,
+                )
+                parser.build_index()
+                results.append(
+                    [
+                        (
+                            s.name,
+                            s.node_type,
+                            s.file_path,
+                            s.start_line,
+                            sorted(s.callees),
+                        )
+                        for s in parser.get_all_symbols()
+                    ]
+                )
+                assert (
+                    parser._cache.get_file_cache(str(Path(temp_project) / "main.py"))[2]
+                    == SAMPLE_CODE
+                )
+                parser._cache.close()
+
+        assert results[0] == results[1]
+        assert len(results[0]) == 10
+
+    def test_build_index_parallel_broken_pool(self, temp_project, monkeypatch):
+        """测试遍历中途进程池崩溃时回退到主进程解析，索引仍然完整"""
+        for i in range(5):
+            (Path(temp_project) / f"extra{i}.py").write_text(
+                f"class Extra{i}:\n    def run(self):\n        pass\n"
+            )
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            parser = ProjectParser(
+                temp_project, db_path=str(Path(cache_dir) / "index.db"), max_workers=1
+            )
+            parser.build_index()
+            expected = sorted((s.name, s.file_path) for s in parser.get_all_symbols())
+            parser._cache.close()
+
+        executors = []
+
+        class BrokenAfterFirstExecutor:
+            """第一个任务正常完成，第二个任务时工作进程退出，之后拒绝提交"""
+
+            def __init__(self, *args, **kwargs):
+                self.submitted = 0
+                executors.append(self)
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc_info):
+                return False
+
+            def submit(self, fn, *args):
+                self.submitted += 1
+                if self.submitted > 2:
+                    raise BrokenProcessPool("worker died")
+                future = Future()
+                if self.submitted == 1:
+                    future.set_result(fn(*args))
+                else:
+                    future.set_exception(BrokenProcessPool("worker died"))
+                return future
+
+        monkeypatch.setattr(parser_module, "_PARALLEL_MIN_FILES", 2)
+        monkeypatch.setattr(parser_module, "_PARALLEL_QUEUE_PER_WORKER", 1)
+        monkeypatch.setattr(
+            parser_module, "ProcessPoolExecutor", BrokenAfterFirstExecutor
+        )
+        monkeypatch.setattr(
+            parser_module, "_worker_parser", PythonParser(), raising=False
+        )
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            parser = ProjectParser(
+                temp_project, db_path=str(Path(cache_dir) / "index.db"), max_workers=2
+            )
+            parser.build_index()
+            symbols = sorted((s.name, s.file_path) for s in parser.get_all_symbols())
+            assert parser._cache.is_indexed()
+            parser._cache.close()
+
+        assert executors and executors[0].submitted == 3
+        assert symbols == expected
+        assert len(symbols) == 20
+
+    def test_get_python_files_streams(self, temp_project):
+        """测试 Python 文件以生成器方式逐个产出"""
+        parser = ProjectParser(temp_project)
+        files = parser._get_python_files()
+        assert not isinstance(files, list)
+        assert next(files).endswith(".py")
+        assert sorted(Path(p).name for p in parser._get_python_files()) == [
+            "base.py",
+            "main.py",
+            "utils.py",
+        ]
+
+    def test_build_index_threaded(self, temp_project, tmp_path):
+        """测试文件较少时用线程池构建索引，结果与单线程一致"""
+        results = []
+        for max_workers in (1, 2):
+            parser = ProjectParser(
+                temp_project,
+                db_path=str(tmp_path / f"index{max_workers}.db"),
+                max_workers=max_workers,
+            )
+            parser.build_index()
+            results.append(
+                [
+                    (s.name, s.node_type, s.file_path, s.start_line, s.callees)
+                    for s in parser.get_all_symbols()
+                ]
+            )
+            assert str(Path(temp_project) / "main.py") in parser._tree_cache
+            parser._cache.close()
+
+        assert results[0] == results[1]
+        assert len(results[0]) == 10
+
+    def test_build_index_checks_state_once(self, temp_project, monkeypatch):
+        """测试索引建立后查询不再重复检查 SQLite 中的索引状态"""
+        parser = ProjectParser(temp_project)
+        parser.build_index(force=True)
+
+        calls = []
+        original = parser._cache.is_indexed
+        monkeypatch.setattr(
+            parser._cache, "is_indexed", lambda: calls.append(1) or original()
+        )
+        assert parser.find_symbol("MyClass") is not None
+        assert parser.find_all_symbols("HelperClass")
+        assert calls == []
+
+        parser.clear_cache()
+        assert parser.find_symbol("MyClass") is not None
+        assert calls == [1]
+
+    def test_warm_start_reindexes_changed_files(self, temp_project, tmp_path):
+        """测试沿用已有索引时只重新索引变化、新增和删除的文件"""
+        db_path = str(tmp_path / "index.db")
+        root = Path(temp_project)
+        parser = ProjectParser(temp_project, db_path=db_path, max_workers=1)
+        parser.build_index()
+        parser._cache.close()
+
+        utils_file = root / "utils.py"
+        mtime = utils_file.stat().st_mtime
+        utils_file.write_text("def renamed_helper():\n    pass\n")
+        os.utime(utils_file, (mtime + 1, mtime + 1))
+        (root / "extra.py").write_text("class ExtraClass:\n    pass\n")
+        (root / "base.py").unlink()
+
+        parsed = []
+        parser = ProjectParser(temp_project, db_path=db_path, max_workers=1)
+        original = parser._parse_file_cached
+        parser._parse_file_cached = lambda p: parsed.append(Path(p).name) or original(p)
+        parser.build_index()
+
+        assert sorted(parsed) == ["extra.py", "utils.py"]
+        assert parser.find_symbol("renamed_helper") is not None
+        assert parser.find_symbol("ExtraClass") is not None
+        assert parser.find_symbol("helper_func") is None
+        assert parser.find_symbol("BaseClass") is None
+        assert parser.find_symbol("MyClass") is not None
+        assert parser._cache.get_file_mtime(str(root / "base.py")) is None
+        parser._cache.close()
+
     def test_find_symbol(self, temp_project):
         """测试查找符号"""
         parser = ProjectParser(temp_project)
@@ -175,6 +605,62 @@ class TestProjectParser:
         assert func is not None
         assert func.name == "standalone_function"
 
+        # 索引中的 content 按字节范围从文件缓存中切出
+        assert my_class.content.startswith("class MyClass(BaseClass):")
+        assert my_class.content.endswith("return str(value)")
+
+    def test_find_symbol_in_file(self, temp_project, monkeypatch):
+        """测试在指定文件中查找符号，文件已索引时不加载全部符号"""
+        parser = ProjectParser(temp_project)
+        parser.build_index()
+        main_file = str(Path(temp_project) / "main.py")
+
+        monkeypatch.setattr(
+            parser,
+            "get_file_symbols",
+            lambda file_path: pytest.fail("不应加载文件中的全部符号"),
+        )
+        symbol = parser.find_symbol_in_file("HelperClass", main_file)
+        assert symbol.node_type == "class"
+        assert symbol.content.startswith("class HelperClass:")
+        assert parser.find_symbol_in_file("process", main_file).host_class == (
+            "MyClass"
+        )
+        assert parser.find_symbol_in_file("missing", main_file) is None
+        assert parser.find_symbol_in_file("x", "missing.py") is None
+
+    def test_get_symbol_outline(self, temp_project):
+        """测试符号概要与完整符号的名称、路径、行号和所属类一致"""
+        parser = ProjectParser(temp_project)
+        for symbol_type in ("class", "function", None):
+            expected = [
+                (s.name, s.file_path, s.start_line, s.host_class)
+                for s in parser.get_all_symbols(symbol_type)
+            ]
+            assert parser.get_symbol_outline(symbol_type) == expected
+            assert expected
+
+    def test_symbol_outline_cached(self, temp_project, monkeypatch):
+        """测试符号概要在索引未变化时不重复查询，文件失效后重新查询"""
+        parser = ProjectParser(temp_project)
+        calls = []
+        original = parser._cache.get_symbol_outline
+        monkeypatch.setattr(
+            parser._cache,
+            "get_symbol_outline",
+            lambda symbol_type=None: calls.append(symbol_type) or original(symbol_type),
+        )
+
+        first = parser.get_symbol_outline("class")
+        first.clear()
+        assert parser.get_symbol_outline("class")
+        assert calls == ["class"]
+
+        parser.invalidate_file(str(Path(temp_project) / "base.py"))
+        names = [name for name, _, _, _ in parser.get_symbol_outline("class")]
+        assert "BaseClass" not in names
+        assert calls == ["class", "class"]
+
     def test_get_file_symbols(self, temp_project):
         """测试获取文件符号"""
         parser = ProjectParser(temp_project)
@@ -187,6 +673,89 @@ class TestProjectParser:
             len(functions) == 5
         )  # __init__, process, transform, do_something, standalone_function
 
+    def test_tree_from_sqlite_cache(self, temp_project, tmp_path, monkeypatch):
+        """测试新进程中 mtime 未变的文件直接用 SQLite 中的源代码重建 Tree"""
+        db_path = str(tmp_path / "index.db")
+        main_file = Path(temp_project) / "main.py"
+        parser = ProjectParser(temp_project, db_path=db_path)
+        parser._parse_file_cached(main_file)
+        parser._cache.close()
+
+        def fail_read(file_path):
+            raise AssertionError(f"不应读取文件: {file_path}")
+
+        monkeypatch.setattr(parser_module, "_read_source_bytes", fail_read)
+        parser = ProjectParser(temp_project, db_path=db_path)
+        tree, source_bytes = parser._parse_file_cached(main_file)
+        assert source_bytes == SAMPLE_CODE.encode("utf-8")
+        assert tree.root_node.type == "module"
+        parser._cache.close()
+
+    def test_incremental_reparse(self, temp_project):
+        """测试文件修改后基于旧 Tree 增量解析"""
+        parser = ProjectParser(temp_project)
+        main_file = Path(temp_project) / "main.py"
+
+        old_tree, old_bytes = parser._parse_file_cached(main_file)
+        old_root = str(old_tree.root_node)
+        mtime = main_file.stat().st_mtime
+
+        new_code = SAMPLE_CODE.replace("return x * 2", "return x * 3 + helper()")
+        main_file.write_text(new_code)
+        os.utime(main_file, (mtime + 1, mtime + 1))
+
+        tree, source_bytes = parser._parse_file_cached(main_file)
+        assert tree is not old_tree
+        assert source_bytes == new_code.encode("utf-8")
+        # 编辑只作用于副本，旧 Tree 仍与旧源代码一致
+        assert old_tree.root_node.end_byte == len(old_bytes)
+        assert str(old_tree.root_node) == old_root
+        full_tree = parser.parser.parser.parse(source_bytes)
+        assert str(tree.root_node) == str(full_tree.root_node)
+
+        classes, functions = parser.get_file_symbols(str(main_file))
+        assert len(classes) == 2
+        assert len(functions) == 5
+
+    def test_invalidate_file_keeps_tree_for_reparse(self, temp_project, monkeypatch):
+        """测试使文件失效后保留旧 Tree，下次解析走增量解析"""
+        parser = ProjectParser(temp_project)
+        main_file = Path(temp_project) / "main.py"
+        parser._parse_file_cached(main_file)
+
+        parser.invalidate_file(str(main_file))
+        assert parser._tree_cache[str(main_file)][0] is None
+
+        calls = []
+        original = parser._reparse_incremental
+        monkeypatch.setattr(
+            parser,
+            "_reparse_incremental",
+            lambda *args: calls.append(args[0]) or original(*args),
+        )
+        new_code = SAMPLE_CODE.replace("return x * 2", "return x * 4")
+        main_file.write_text(new_code)
+
+        tree, source_bytes = parser._parse_file_cached(main_file)
+        assert calls == [main_file]
+        assert source_bytes == new_code.encode("utf-8")
+        full_tree = parser.parser.parser.parse(source_bytes)
+        assert str(tree.root_node) == str(full_tree.root_node)
+
+    def test_failed_reparse_drops_tree(self, temp_project, monkeypatch):
+        """测试重新解析失败时不保留旧 Tree"""
+        parser = ProjectParser(temp_project)
+        main_file = Path(temp_project) / "main.py"
+        parser._parse_file_cached(main_file)
+        parser.invalidate_file(str(main_file))
+
+        def fail_parse(*args):
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(parser.parser, "parser", SimpleNamespace(parse=fail_parse))
+        assert parser._parse_file_cached(main_file) is None
+        assert str(main_file) not in parser._tree_cache
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -2,12 +2,20 @@
 测试依赖解析器
 """
 
+import os
+import re
 import tempfile
 from pathlib import Path
 
 import pytest
 
-from py_symbol_analyze.resolver import DependencyResolver, SymbolAnalyzer
+from py_symbol_analyze import resolver as resolver_module
+from py_symbol_analyze.models import Dependency
+from py_symbol_analyze.resolver import (
+    DependencyResolver,
+    SymbolAnalyzer,
+    _iter_symbol_positions,
+)
 
 # 测试用的示例项目结构
 MAIN_CODE = '''
@@ -67,24 +75,72 @@ class CustomError(Exception):
 '''
 
 
-@pytest.fixture
+# 示例项目的文件名到源代码的映射，导入时编码一次，写入文件时直接使用字节
+PROJECT_FILES = {
+    "main.py": MAIN_CODE.encode("utf-8"),
+    "utils.py": UTILS_CODE.encode("utf-8"),
+    "exceptions.py": EXCEPTIONS_CODE.encode("utf-8"),
+}
+
+# MainClass 应解析出的依赖名称
+EXPECTED_MAINCLASS_DEPS = frozenset({"HelperClass", "helper_func"})
+
+_DEFINITION_NAME_RE = re.compile(r"^\s*(?:async\s+)?(?:def|class)\s+(\w+)", re.M)
+
+
+def _dep_names(depends: list) -> set:
+    """从依赖源代码中提取定义的类名或函数名"""
+    names = set()
+    for content in depends:
+        match = _DEFINITION_NAME_RE.search(content)
+        if match:
+            names.add(match.group(1))
+    return names
+
+
+def _write_project(tmpdir: str):
+    """写入示例项目文件"""
+    for name, source in PROJECT_FILES.items():
+        fd = os.open(os.path.join(tmpdir, name), os.O_WRONLY | os.O_CREAT | os.O_TRUNC)
+        try:
+            os.write(fd, source)
+        finally:
+            os.close(fd)
+
+
+@pytest.fixture(scope="module")
 def temp_project():
-    """创建临时测试项目"""
+    """创建临时测试项目（模块内共享，测试不得修改其中的文件）"""
     with tempfile.TemporaryDirectory() as tmpdir:
-        # 创建项目文件
-        (Path(tmpdir) / "main.py").write_text(MAIN_CODE)
-        (Path(tmpdir) / "utils.py").write_text(UTILS_CODE)
-        (Path(tmpdir) / "exceptions.py").write_text(EXCEPTIONS_CODE)
+        _write_project(tmpdir)
+        yield tmpdir
 
+
+@pytest.fixture(scope="module")
+def resolver(temp_project):
+    """模块内共享、已建好索引的依赖解析器（只读查询使用）"""
+    return DependencyResolver(temp_project)
+
+
+@pytest.fixture(scope="module")
+def analyzer(temp_project):
+    """模块内共享、已建好索引的符号分析器（只读查询使用）"""
+    return SymbolAnalyzer(temp_project)
+
+
+@pytest.fixture
+def mutable_project():
+    """创建每个测试独立的临时项目，供需要修改文件的测试使用"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        _write_project(tmpdir)
         yield tmpdir
 
 
 class TestDependencyResolver:
     """测试依赖解析器"""
 
-    def test_analyze_class(self, temp_project):
+    def test_analyze_class(self, resolver):
         """测试分析类"""
-        resolver = DependencyResolver(temp_project)
         result = resolver.analyze_class("MainClass")
 
         assert result is not None
@@ -93,9 +149,13 @@ class TestDependencyResolver:
         assert len(result.depends) > 0
         assert len(result.depends_path) > 0
 
-    def test_analyze_function(self, temp_project):
+        # 同一条 from import 导入的多个名称都应解析为依赖，且不包含类自身
+        dep_names = _dep_names(result.depends)
+        assert EXPECTED_MAINCLASS_DEPS <= dep_names
+        assert "MainClass" not in dep_names
+
+    def test_analyze_function(self, resolver):
         """测试分析函数"""
-        resolver = DependencyResolver(temp_project)
         result = resolver.analyze_function("main")
 
         assert result is not None
@@ -103,9 +163,8 @@ class TestDependencyResolver:
         assert "def main" in result.function_content
         assert result.host_class is None
 
-    def test_analyze_method(self, temp_project):
+    def test_analyze_method(self, resolver):
         """测试分析类方法"""
-        resolver = DependencyResolver(temp_project)
         result = resolver.analyze_function("process", host_class="MainClass")
 
         assert result is not None
@@ -113,13 +172,174 @@ class TestDependencyResolver:
         assert result.host_class == "MainClass"
         assert "def process" in result.function_content
 
+    def test_resolve_many(self, resolver):
+        """测试批量分析多个符号，结果与查询一一对应"""
+        results = resolver.resolve_many(
+            [
+                ("MainClass", "class", None),
+                ("main", "func", None),
+                ("process", "func", "MainClass"),
+                ("NonExistentClass", "class", None),
+            ]
+        )
+
+        assert [r.node_type if r else None for r in results] == [
+            "class",
+            "func",
+            "func",
+            None,
+        ]
+        assert "class MainClass" in results[0].class_content
+        assert "def main" in results[1].function_content
+        assert results[2].host_class == "MainClass"
+
+        with pytest.raises(ValueError):
+            resolver.resolve_many([("main", "module", None)])
+
+    def test_analysis_result_cached(self, mutable_project, monkeypatch):
+        """测试相关文件未变化时复用分析结果，依赖文件修改后重新分析"""
+        resolver = DependencyResolver(mutable_project)
+        calls = []
+        original = resolver.resolve_dependencies
+        monkeypatch.setattr(
+            resolver,
+            "resolve_dependencies",
+            lambda symbol: calls.append(symbol.name) or original(symbol),
+        )
+
+        first = resolver.analyze_class("MainClass")
+        first.depends.clear()
+        second = resolver.analyze_class("MainClass")
+        assert calls == ["MainClass"]
+        assert second.depends
+
+        dep_file = Path(second.depends_path[0])
+        mtime = dep_file.stat().st_mtime
+        os.utime(dep_file, (mtime + 1, mtime + 1))
+        resolver.analyze_class("MainClass")
+        assert calls == ["MainClass", "MainClass"]
+
+        resolver.clear_import_cache()
+        resolver.analyze_class("MainClass")
+        assert len(calls) == 3
+
+    def test_build_depends_host_class_once(self, temp_project, monkeypatch):
+        """测试同一个类的多个方法依赖只查找一次所属类，结果仍一一对应"""
+        resolver = DependencyResolver(temp_project)
+        utils_path = str(Path(temp_project) / "utils.py")
+        methods = [
+            Dependency(
+                name=name,
+                file_path=utils_path,
+                content=f"def {name}(self): pass",
+                host_class="HelperClass",
+            )
+            for name in ("transform", "other")
+        ]
+
+        calls = []
+        original = resolver._find_symbol_in_file
+        monkeypatch.setattr(
+            resolver,
+            "_find_symbol_in_file",
+            lambda name, path: calls.append(name) or original(name, path),
+        )
+        depends, depends_path = resolver._build_depends(methods)
+
+        assert calls == ["HelperClass"]
+        assert len(depends) == 2
+        assert depends[0] == depends[1]
+        assert "class HelperClass" in depends[0]
+        assert depends_path == [utils_path, utils_path]
+
+    def test_resolve_import_path_cached(self, temp_project, monkeypatch):
+        """测试导入路径解析结果被缓存，绝对导入在不同文件间共享"""
+        resolver = DependencyResolver(temp_project)
+        main_file = str(Path(temp_project) / "main.py")
+        utils_file = str(Path(temp_project) / "utils.py")
+
+        assert resolver._resolve_import_path("utils.helper_func", main_file) == (
+            utils_file
+        )
+        assert resolver._resolve_import_path(".utils", main_file) == utils_file
+
+        monkeypatch.setattr(
+            resolver,
+            "_find_import_file",
+            lambda *args: pytest.fail("不应重复检查文件系统"),
+        )
+        assert resolver._resolve_import_path("utils.helper_func", utils_file) == (
+            utils_file
+        )
+        assert resolver._resolve_import_path(".utils", main_file) == utils_file
+
+        resolver.clear_import_cache()
+        assert resolver._import_path_cache == {}
+
+    def test_iter_symbol_positions(self):
+        """测试定位符号位置：只匹配完整标识符，每行只取第一处"""
+        source = "x = FooBar()\ny = Foo(Foo)\n\n    z = mod.Foo\nÄFoo = 1\n"
+        assert list(_iter_symbol_positions("Foo", source)) == [(2, 4), (4, 12)]
+        assert list(_iter_symbol_positions("mod.Foo", source)) == [(4, 8)]
+        assert list(_iter_symbol_positions("Missing", source)) == []
+        # 简单标识符共用同一次扫描的结果
+        line_starts = resolver_module._line_starts(source)
+        positions = resolver_module._identifier_positions(source, line_starts)
+        assert positions["Foo"] == [(2, 4), (4, 12)]
+        assert positions["FooBar"] == [(1, 4)]
+        assert list(_iter_symbol_positions("Foo", source, line_starts, positions)) == [
+            (2, 4),
+            (4, 12),
+        ]
+
+    def test_source_positions_cached(self, temp_project):
+        """测试源代码位置表按文件缓存在解析器实例上，清空缓存时释放"""
+        resolver = DependencyResolver(temp_project)
+        main_file = str(Path(temp_project) / "main.py")
+
+        line_starts, positions = resolver._get_source_positions(MAIN_CODE, main_file)
+        assert resolver._get_source_positions(MAIN_CODE, main_file)[1] is positions
+        # 同一文件的源代码变化时重新计算
+        assert resolver._get_source_positions("x\n", main_file)[1] is not positions
+        assert len(resolver._source_positions) == 1
+
+        resolver.clear_import_cache()
+        assert not resolver._source_positions
+
+    def test_jedi_script_reused(self, temp_project, monkeypatch):
+        """测试同一段源代码解析多个 callee 时只创建一次 jedi Script"""
+        resolver = DependencyResolver(temp_project)
+        main_file = str(Path(temp_project) / "main.py")
+
+        created = []
+        original = resolver_module.jedi.Script
+        monkeypatch.setattr(
+            resolver_module.jedi,
+            "Script",
+            lambda *args, **kwargs: created.append(1) or original(*args, **kwargs),
+        )
+        assert resolver._use_jedi_to_resolve("helper_func", MAIN_CODE, main_file)
+        assert resolver._use_jedi_to_resolve("HelperClass", MAIN_CODE, main_file)
+        assert len(created) == 1
+
+        # 其他文件的 Script 不影响已有的 Script
+        utils_file = str(Path(temp_project) / "utils.py")
+        resolver._use_jedi_to_resolve("helper_func", UTILS_CODE, utils_file)
+        assert len(created) == 2
+        assert resolver._use_jedi_to_resolve("HelperClass", MAIN_CODE, main_file)
+        assert len(created) == 2
+
+        # 同一文件的源代码变化时重新创建，并且之后仍能正确解析
+        resolver._use_jedi_to_resolve("main", "main()\n", main_file)
+        assert resolver._use_jedi_to_resolve("helper_func", MAIN_CODE, main_file)
+        assert len(created) == 4
+
 
 class TestSymbolAnalyzer:
     """测试符号分析器"""
 
-    def test_query_class(self, temp_project):
+    def test_query_class(self, analyzer):
         """测试查询类"""
-        analyzer = SymbolAnalyzer(temp_project)
         result = analyzer.query_class("MainClass")
 
         assert result is not None
@@ -128,18 +348,16 @@ class TestSymbolAnalyzer:
         assert "depends" in result
         assert "depends_path" in result
 
-    def test_query_function(self, temp_project):
+    def test_query_function(self, analyzer):
         """测试查询函数"""
-        analyzer = SymbolAnalyzer(temp_project)
         result = analyzer.query_function("main")
 
         assert result is not None
         assert result["node_type"] == "func"
         assert "function_content" in result
 
-    def test_query_nonexistent(self, temp_project):
+    def test_query_nonexistent(self, analyzer):
         """测试查询不存在的符号"""
-        analyzer = SymbolAnalyzer(temp_project)
 
         result = analyzer.query_class("NonExistentClass")
         assert result is None
@@ -147,6 +365,25 @@ class TestSymbolAnalyzer:
         result = analyzer.query_function("nonexistent_function")
         assert result is None
 
+    @pytest.mark.parametrize(
+        "kind,name,host",
+        [
+            ("class", "MainClass", None),
+            ("func", "main", None),
+            ("func", "process", "MainClass"),
+        ],
+    )
+    def test_depends_correspondence(self, analyzer, kind, name, host):
+        """测试 depends 与 depends_path 一一对应"""
+        if kind == "class":
+            result = analyzer.query_class(name)
+        else:
+            result = analyzer.query_function(name, host_class=host)
+
+        assert result is not None
+        assert len(result["depends"]) == len(result["depends_path"])
+        assert all(os.path.isfile(path) for path in result["depends_path"])
+
     def test_rebuild_index(self, temp_project):
         """测试重建索引"""
         analyzer = SymbolAnalyzer(temp_project)
@@ -154,14 +391,44 @@ class TestSymbolAnalyzer:
         # 首次查询
         result1 = analyzer.query_class("MainClass")
         assert result1 is not None
+        assert analyzer.query_class("MainClass") == result1
+        assert len(analyzer.resolver._analysis_cache) == 1
 
-        # 重建索引
+        # 重建索引，同时丢弃已缓存的分析结果
         analyzer.rebuild_index()
+        assert not analyzer.resolver._analysis_cache
 
         # 再次查询
         result2 = analyzer.query_class("MainClass")
         assert result2 is not None
 
+    def test_close(self, temp_project):
+        """测试关闭分析器释放缓存和连接，之后仍可继续查询"""
+        analyzer = SymbolAnalyzer(temp_project)
+        assert analyzer.query_class("MainClass") is not None
+
+        analyzer.close()
+        assert not analyzer.resolver._analysis_cache
+        assert analyzer.resolver.project_parser._cache._conn is None
+
+        assert analyzer.query_class("MainClass") is not None
+
+    def test_refresh_index(self, mutable_project):
+        """测试增量更新索引只重新索引变化的文件"""
+        analyzer = SymbolAnalyzer(mutable_project)
+        assert analyzer.query_class("MainClass") is not None
+        assert analyzer.refresh_index() == (0, 0)
+
+        utils_file = Path(mutable_project) / "utils.py"
+        mtime = utils_file.stat().st_mtime
+        utils_file.write_text(UTILS_CODE + "\n\nclass AddedClass:\n    pass\n")
+        os.utime(utils_file, (mtime + 1, mtime + 1))
+        (Path(mutable_project) / "exceptions.py").unlink()
+
+        assert analyzer.refresh_index() == (1, 1)
+        assert analyzer.query_class("AddedClass") is not None
+        assert analyzer.query_class("CustomError") is None
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])